@@ -1,44 +1,186 @@
-def crc16(data: bytes) -> bytes:  
-    """  
-    计算 CRC-16 (Modbus) 校验码  
-    :param data: 输入数据字节流  
-    :return: CRC 校验码（2字节）  
-    """    
-    crc = 0xFFFF  
-    for byte in data:  
-        crc ^= byte  
-        for _ in range(8):  
-            if crc & 0x0001:  
-                crc = (crc >> 1) ^ 0xA001  
-            else:  
-                crc >>= 1  
-    # 返回 CRC 的低字节和高字节  
-    return bytes([crc & 0xFF, (crc >> 8) & 0xFF])  
-  
-  
-def hex_string_to_bytes(hex_string: str) -> bytes:  
-    """  
-    将十六进制字符串（每个数字用空格隔开）转换为字节流  
-    :param hex_string: 十六进制字符串，例如 "01 06 00 06 00 0A"    :return: 字节流  
-    """    # 去除空格并按每两个字符分组  
-    hex_values = hex_string.replace(" ", "")  
-    # 将每两个字符转换为一个字节  
-    return bytes.fromhex(hex_values)  
-  
-  
-if __name__ == "__main__":  
-    # 示例输入：十六进制字符串，每个数字用空格隔开  
-    hex_input = input()  
-  
-    # 将字符串转换为字节流  
-    data_frame = hex_string_to_bytes(hex_input)  
-  
-    # 计算 CRC 校验码  
-    crc = crc16(data_frame)  
-  
-    # 组合完整帧  
-    complete_frame = data_frame + crc  
-  
-    print("原始数据帧（十六进制）:", data_frame.hex())  
-    print("CRC 校验码（十六进制）:", crc.hex())  
-    print("完整数据帧（十六进制）:", complete_frame.hex())
\ No newline at end of file
+import os
+import sys
+import time
+from typing import Iterable, List
+
+
+def _make_table():
+    """
+    预先计算 256 项查找表：每项为单个字节按位计算 8 次的结果
+    """
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            if crc & 0x0001:
+                crc = (crc >> 1) ^ 0xA001
+            else:
+                crc >>= 1
+        table.append(crc)
+    return tuple(table)
+
+
+# 与 光机电/src/serial_unit/crc16.py 的 CRC16_TABLE 相同（两边各自独立运行，不互相导入），
+# 由 check_shared_table 核对（光机电/tests/test_crc16.py 自动运行）
+CRC16_TABLE = _make_table()
+CRC16_INIT = 0xFFFF
+
+
+def crc16_update(crc: int, data: bytes) -> int:
+    """
+    增量计算 CRC-16 (Modbus)，可对分段到达的数据流逐段调用
+    :param crc: 上一段的结果，首段传入 CRC16_INIT
+    :param data: 本段数据字节流
+    :return: 更新后的 CRC 值（整数）
+    """
+    table = CRC16_TABLE
+    for byte in data:
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+    return crc
+
+
+def crc16_value(data: bytes) -> int:
+    """
+    计算 CRC-16 (Modbus)
+    :param data: 输入数据字节流
+    :return: CRC 值（整数，发送时低字节在前）
+    """
+    return crc16_update(CRC16_INIT, data)
+
+
+def crc16(data: bytes) -> bytes:
+    """
+    计算 CRC-16 (Modbus) 校验码
+    :param data: 输入数据字节流
+    :return: CRC 校验码（2字节）
+    """
+    crc = crc16_update(CRC16_INIT, data)
+    # 返回 CRC 的低字节和高字节
+    return bytes((crc & 0xFF, crc >> 8))
+
+
+def append_crc(data: bytes) -> bytes:
+    """
+    在数据帧末尾附加 CRC 校验码
+    :param data: 不含校验码的数据帧
+    :return: 完整数据帧
+    """
+    return bytes(data) + crc16(data)
+
+
+def verify_frame(frame: bytes) -> bool:
+    """
+    校验一个完整数据帧（末尾 2 字节为 CRC，低字节在前）
+    对包含自身 CRC 的完整帧再计算一次 CRC，结果为 0 即校验通过
+    :param frame: 接收到的数据帧
+    :return: 校验是否通过
+    """
+    return len(frame) >= 3 and crc16_update(CRC16_INIT, frame) == 0
+
+
+def verify_frames(frames: Iterable[bytes]) -> List[bool]:
+    """
+    批量校验多个接收到的数据帧
+    :param frames: 数据帧序列
+    :return: 每个数据帧的校验结果
+    """
+    return [verify_frame(frame) for frame in frames]
+
+
+def crc16_bitwise(data: bytes) -> bytes:
+    """
+    逐位计算的 CRC-16 (Modbus)（原实现，作为基准测试的参照）
+    :param data: 输入数据字节流
+    :return: CRC 校验码（2字节）
+    """
+    crc = 0xFFFF
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            if crc & 0x0001:
+                crc = (crc >> 1) ^ 0xA001
+            else:
+                crc >>= 1
+    # 返回 CRC 的低字节和高字节
+    return bytes([crc & 0xFF, (crc >> 8) & 0xFF])
+
+
+def hex_string_to_bytes(hex_string: str) -> bytes:
+    """
+    将十六进制字符串（每个数字用空格隔开）转换为字节流
+    :param hex_string: 十六进制字符串，例如 "01 06 00 06 00 0A"
+    :return: 字节流
+    """
+    # 去除空格并按每两个字符分组
+    hex_values = hex_string.replace(" ", "")
+    # 将每两个字符转换为一个字节
+    return bytes.fromhex(hex_values)
+
+
+def check_shared_table():
+    """
+    核对本文件与 光机电/src/serial_unit/crc16.py 的查找表是否一致
+    :return: 一致返回 True；找不到该文件时返回 None
+    """
+    import importlib.util
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        os.pardir, "光机电", "src", "serial_unit", "crc16.py")
+    if not os.path.exists(path):
+        return None
+    spec = importlib.util.spec_from_file_location("serial_unit_crc16", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.CRC16_TABLE == CRC16_TABLE
+
+
+def benchmark(frame_len: int = 8, count: int = 20000):
+    """
+    比较查表法与逐位计算的速度（帧长默认为 Modbus 写单个寄存器指令的 8 字节）
+    """
+    frames = [os.urandom(frame_len) for _ in range(count)]
+    for frame in frames[:100]:
+        assert crc16(frame) == crc16_bitwise(frame)
+
+    start = time.perf_counter()
+    for frame in frames:
+        crc16_bitwise(frame)
+    t_bitwise = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for frame in frames:
+        crc16(frame)
+    t_table = time.perf_counter() - start
+
+    received = [append_crc(frame) for frame in frames]
+    start = time.perf_counter()
+    assert all(verify_frames(received))
+    t_verify = time.perf_counter() - start
+
+    print(f"{count} 帧 x {frame_len} 字节：逐位 {t_bitwise / count * 1e6:.2f} us/帧，"
+          f"查表 {t_table / count * 1e6:.2f} us/帧（{t_bitwise / t_table:.1f}x），"
+          f"批量校验 {t_verify / count * 1e6:.2f} us/帧")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        # 基准测试：python CRC.py bench
+        assert check_shared_table() is not False, "与 serial_unit/crc16.py 的查找表不一致"
+        for n in (8, 64, 256):
+            benchmark(n)
+        sys.exit(0)
+
+    # 示例输入：十六进制字符串，每个数字用空格隔开
+    hex_input = input()
+
+    # 将字符串转换为字节流
+    data_frame = hex_string_to_bytes(hex_input)
+
+    # 计算 CRC 校验码
+    crc = crc16(data_frame)
+
+    # 组合完整帧
+    complete_frame = data_frame + crc
+
+    print("原始数据帧（十六进制）:", data_frame.hex())
+    print("CRC 校验码（十六进制）:", crc.hex())
+    print("完整数据帧（十六进制）:", complete_frame.hex())
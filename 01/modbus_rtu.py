@@ -0,0 +1,150 @@
+import struct
+from collections import OrderedDict
+
+from CRC import CRC16_INIT, crc16_update
+
+# 功能码
+FUNC_READ_COILS = 0x01
+FUNC_WRITE_SINGLE_COIL = 0x05
+FUNC_WRITE_SINGLE_REGISTER = 0x06
+FUNC_WRITE_MULTIPLE_COILS = 0x0F
+
+COIL_ON = 0xFF00
+COIL_OFF = 0x0000
+
+_HEAD = struct.Struct('>BBHH')  # 地址、功能码、寄存器/线圈地址、数据/数量
+_CRC = struct.Struct('<H')      # CRC 低字节在前
+_EXCEPTION_REPLY_LEN = 5        # 异常响应：地址、功能码|0x80、异常码、CRC
+_MAX_WRITE_COILS = 0x07B0       # 写多个线圈的最大数量
+
+
+def _check_range(name, value, low, high):
+    """
+    检查字段取值范围，超出时抛出 ValueError（而不是在打包时被截断）
+    """
+    if not low <= value <= high:
+        raise ValueError(f"{name} 超出范围 [0x{low:X}, 0x{high:X}]: {value!r}")
+
+
+class ModbusError(Exception):
+    """
+    Modbus 通信错误（无响应、校验失败或设备返回异常码）
+    """
+
+
+class ModbusRTUClient:
+    def __init__(self, ser, cache_size=32):
+        """
+        Modbus RTU 客户端：用 struct 直接构建数据帧，常用帧缓存复用，响应按功能码和 CRC 校验
+        :param ser: 已打开的串口（pyserial.Serial）
+        :param cache_size: 帧缓存容量（最近最少使用的帧被淘汰）
+        """
+        self.ser = ser
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._tx = bytearray(256)  # 构建帧用的缓冲区
+
+    def _frame(self, addr, func, field1, field2, payload=b''):
+        """
+        取得数据帧：缓存中已有时直接返回，否则构建并放入缓存
+        """
+        key = (addr, func, field1, field2, payload)
+        frame = self._cache.get(key)
+        if frame is not None:
+            self._cache.move_to_end(key)
+            return frame
+
+        buf = self._tx
+        _HEAD.pack_into(buf, 0, addr, func, field1, field2)
+        n = _HEAD.size
+        if payload:
+            buf[n] = len(payload)
+            buf[n + 1:n + 1 + len(payload)] = payload
+            n += 1 + len(payload)
+        _CRC.pack_into(buf, n, crc16_update(CRC16_INIT, memoryview(buf)[:n]))
+        frame = bytes(buf[:n + _CRC.size])
+
+        self._cache[key] = frame
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return frame
+
+    def frame_write_register(self, addr, reg_addr, value):
+        """
+        写单个寄存器（功能码 0x06）的数据帧
+        """
+        _check_range("设备地址", addr, 0, 0xFF)
+        _check_range("寄存器地址", reg_addr, 0, 0xFFFF)
+        _check_range("寄存器值", value, 0, 0xFFFF)
+        return self._frame(addr, FUNC_WRITE_SINGLE_REGISTER, reg_addr, value)
+
+    def frame_write_coil(self, addr, coil_addr, on):
+        """
+        写单个线圈（功能码 0x05）的数据帧
+        """
+        _check_range("设备地址", addr, 0, 0xFF)
+        _check_range("线圈地址", coil_addr, 0, 0xFFFF)
+        return self._frame(addr, FUNC_WRITE_SINGLE_COIL, coil_addr, COIL_ON if on else COIL_OFF)
+
+    def frame_write_coils(self, addr, start_addr, count, states):
+        """
+        写多个线圈（功能码 0x0F）的数据帧
+        :param states: 线圈状态字节（bytes，每位对应一个线圈，低位在前）
+        """
+        _check_range("设备地址", addr, 0, 0xFF)
+        _check_range("起始线圈地址", start_addr, 0, 0xFFFF)
+        _check_range("线圈数量", count, 1, _MAX_WRITE_COILS)
+        states = bytes(states)
+        if len(states) != (count + 7) // 8:
+            raise ValueError(f"线圈状态字节数应为 {(count + 7) // 8}: {len(states)}")
+        return self._frame(addr, FUNC_WRITE_MULTIPLE_COILS, start_addr, count, states)
+
+    def send(self, frame, expected_len=8):
+        """
+        发送数据帧并读取、校验响应
+        :param frame: 完整数据帧
+        :param expected_len: 正常响应的字节数（写寄存器/线圈的响应均为 8 字节）
+        :return: 响应（bytes）
+
+        读取为阻塞读取：收到 expected_len 字节即返回，不必固定等待；
+        响应缺失或不完整（包括 5 字节的异常响应）时要等满串口超时（ser.timeout）才返回。
+        """
+        self.ser.write(frame)
+        reply = self.ser.read(expected_len)
+        self.validate_reply(reply, frame[0], frame[1])
+        return reply
+
+    @staticmethod
+    def validate_reply(reply, addr, func):
+        """
+        校验响应：长度、CRC、设备地址与功能码；设备返回异常码时抛出 ModbusError
+        """
+        n = len(reply)
+        if n == 0:
+            raise ModbusError("未接收到响应数据")
+        if n < _EXCEPTION_REPLY_LEN or crc16_update(CRC16_INIT, reply) != 0:
+            raise ModbusError(f"响应校验失败: {bytes(reply).hex(' ').upper()}")
+        if reply[0] != addr:
+            raise ModbusError(f"响应地址不符: {reply[0]:02X}")
+        if reply[1] == func | 0x80:
+            raise ModbusError(f"设备返回异常码: {reply[2]:02X}")
+        if reply[1] != func:
+            raise ModbusError(f"响应功能码不符: {reply[1]:02X}")
+
+    def write_register(self, addr, reg_addr, value):
+        """
+        写单个寄存器
+        """
+        return self.send(self.frame_write_register(addr, reg_addr, value))
+
+    def write_coil(self, addr, coil_addr, on):
+        """
+        写单个线圈
+        """
+        return self.send(self.frame_write_coil(addr, coil_addr, on))
+
+    def write_coils(self, addr, start_addr, count, states):
+        """
+        写多个线圈
+        """
+        return self.send(self.frame_write_coils(addr, start_addr, count, states))
@@ -1,20 +1,26 @@
 import serial
 import time
 from 注射泵控制 import SyringePumpController
+from CRC import verify_frame
+from modbus_rtu import ModbusRTUClient, ModbusError, FUNC_WRITE_SINGLE_REGISTER
 
 import time
 
 
 
-def send_hex_command(port, baudrate, hex_command):
+def send_write_register(port, baudrate, addr, reg_addr, value):
     """
-    通过串口发送 16 进制指令，并接收返回的响应。
+    通过串口发送写单个寄存器指令（功能码 0x06），并接收返回的响应。
+    指令帧由 ModbusRTUClient 按字段构建并计算 CRC，不再手写十六进制指令。
 
     参数:
         port (str): 串口号，例如 '/dev/ttyUSB0' 或 'COM3'。
         baudrate (int): 波特率，例如 9600。
-        hex_command (str): 16 进制指令字符串，例如 "FF 05 00 00 FF 00 99 E4"。
+        addr (int): 设备地址，例如 0x0A。
+        reg_addr (int): 寄存器地址，例如 0x0001（反转）。
+        value (int): 写入的值，例如 0x0001。
     """
+    ser = None
     try:
         # 初始化串口
         ser = serial.Serial(
@@ -29,14 +35,12 @@ def send_hex_command(port, baudrate, hex_command):
         if ser.is_open:
             print(f"串口 {port} 已打开")
 
-        # 将 16 进制指令转换为字节流
-        command_bytes = bytes.fromhex(hex_command.replace(" ", ""))
-        print(command_bytes)
-    
+        # 构建指令帧（自动附加 CRC）
+        command_bytes = ModbusRTUClient(ser).frame_write_register(addr, reg_addr, value)
 
         # 发送指令
         ser.write(command_bytes)
-        print(f"发送指令: {hex_command}")
+        print(f"发送指令: {command_bytes.hex(' ').upper()}")
 
         # 等待设备响应
         time.sleep(0.1)  # 根据设备响应时间调整
@@ -45,13 +49,15 @@ def send_hex_command(port, baudrate, hex_command):
         # 打印响应
         if response:
             print(f"接收响应: {response.hex().upper()}")
+            if not verify_frame(response):
+                print("响应 CRC 校验失败")
         else:
             print("未接收到响应数据")
 
     except Exception as e:
         print(f"串口通信失败: {e}")
     finally:
-        if ser.is_open:
+        if ser is not None and ser.is_open:
             ser.close()
             print(f"串口 {port} 已关闭")
 
@@ -72,53 +78,32 @@ class SyringePumpController:
             stopbits=1,
             timeout=timeout
         )
+        self.client = ModbusRTUClient(self.ser)
     
-    def _send_command(self, hex_str):
-        """
-        发送十六进制指令并返回响应
-        :param hex_str: 十六进制字符串（如 "01 06 00 00 00 01 48 0A"）
-        :return: 设备返回的响应数据
-        """
-        data = bytes.fromhex(hex_str.replace(" ", ""))
-        self.ser.write(data)
-        print(f'发送：{data}')
-        return self.ser.read_all()
-    
-    def _calculate_crc(self, data_hex):
+    def _send_command(self, frame):
         """
-        计算CRC校验码
-        :param data_hex: 十六进制字符串（如 "01 06 00 00 00 01"）
-        :return: CRC校验码（2字节）
+        发送指令帧，按功能码和 CRC 校验响应
+        :param frame: 完整指令帧（bytes）
+        :return: 设备返回的响应数据；通信失败时返回 None
         """
-        data_bytes = bytes.fromhex(data_hex.replace(" ", ""))
-        crc = 0xFFFF
-        for byte in data_bytes:
-            crc ^= byte
-            for _ in range(8):
-                if crc & 0x0001:
-                    crc = (crc >> 1) ^ 0xA001
-                else:
-                    crc >>= 1
-        return bytes([crc & 0xFF, (crc >> 8) & 0xFF])
+        try:
+            return self.client.send(frame)
+        except ModbusError as e:
+            print(f"指令 {frame.hex(' ').upper()} 通信失败: {e}")
+            return None
     
     def _build_command(self, addr, func_code, reg_addr, data):
         """
-        构建完整指令
+        构建完整指令（常用指令帧由 ModbusRTUClient 缓存复用）
         :param addr: 设备地址（如 0x0A）
-        :param func_code: 功能码（如 0x06）
+        :param func_code: 功能码（目前只使用 0x06 写单个寄存器）
         :param reg_addr: 寄存器地址（如 0x0005）
         :param data: 数据（如 0x00FF）
-        :return: 完整的十六进制指令字符串
+        :return: 完整的指令帧（bytes）
         """
-        # 构建基础指令
-        base_cmd = f"{addr:02X}{func_code:02X}{reg_addr >> 8:02X}{reg_addr & 0xFF:02X}{data >> 8:02X}{data & 0xFF:02X}"
-        
-        # 计算CRC
-        crc = self._calculate_crc(base_cmd)
-        # 将CRC附加到指令末尾
-        full_cmd = base_cmd + crc.hex().upper()
-        print(f'构建指令：{full_cmd}')
-        return full_cmd
+        if func_code != FUNC_WRITE_SINGLE_REGISTER:
+            raise ValueError(f"不支持的功能码: {func_code:02X}")
+        return self.client.frame_write_register(addr, reg_addr, data)
 
     def set_speed(self, speed):
         """
@@ -1,5 +1,6 @@
 import serial
 import time
+from modbus_rtu import ModbusRTUClient, ModbusError, FUNC_READ_COILS
 
 # 配置串口
 ser = serial.Serial(
@@ -10,40 +11,42 @@ ser = serial.Serial(
     bytesize=serial.EIGHTBITS,
     timeout=1
 )
+client = ModbusRTUClient(ser)
 
-# 发送指令并接收返回
-def send_command(command_hex):
-    command_bytes = bytes.fromhex(command_hex)
-    ser.write(command_bytes)
-    time.sleep(0.1)  # 等待设备响应
-    response = ser.read_all()
-    print(f"发送命令: {command_hex}, 接收响应: {response.hex()}")
-    #decode_relay_status(response)
-    return response.hex()
+RELAY_ADDR = 0xFF  # 继电器模块地址
+RELAY_COUNT = 8
+
+# 发送继电器指令帧（帧由 ModbusRTUClient 构建并缓存），按功能码和 CRC 校验响应
+def send_frame(frame):
+    try:
+        return client.send(frame).hex()
+    except ModbusError as e:
+        print(f"发送命令: {frame.hex(' ').upper()}, 通信失败: {e}")
+        return None
 
 # 打开1号继电器（手动模式）
 def open_relay_1():
-    command = "FF 05 00 00 FF 00 99 E4"
-    response = send_command(command)
-    print(f"打开1号继电器（手动模式）: 发送 {command}, 返回 {response}")
+    command = client.frame_write_coil(RELAY_ADDR, 0, True)
+    response = send_frame(command)
+    print(f"打开1号继电器（手动模式）: 发送 {command.hex(' ').upper()}, 返回 {response}")
 
 # 关闭1号继电器（手动模式）
 def close_relay_1():
-    command = "FF 05 00 00 00 00 D8 14"
-    response = send_command(command)
-    print(f"关闭1号继电器（手动模式）: 发送 {command}, 返回 {response}")
+    command = client.frame_write_coil(RELAY_ADDR, 0, False)
+    response = send_frame(command)
+    print(f"关闭1号继电器（手动模式）: 发送 {command.hex(' ').upper()}, 返回 {response}")
 
 # 打开所有继电器
 def open_all_relays():
-    command = "FF 0F 00 00 00 08 01 FF 30 1D"
-    response = send_command(command)
-    print(f"打开所有继电器: 发送 {command}, 返回 {response}")
+    command = client.frame_write_coils(RELAY_ADDR, 0, RELAY_COUNT, b'\xFF')
+    response = send_frame(command)
+    print(f"打开所有继电器: 发送 {command.hex(' ').upper()}, 返回 {response}")
 
 # 关闭所有继电器
 def close_all_relays():
-    command = "FF 0F 00 00 00 08 01 00 70 5D"
-    response = send_command(command)
-    print(f"关闭所有继电器: 发送 {command}, 返回 {response}")
+    command = client.frame_write_coils(RELAY_ADDR, 0, RELAY_COUNT, b'\x00')
+    response = send_frame(command)
+    print(f"关闭所有继电器: 发送 {command.hex(' ').upper()}, 返回 {response}")
 
 # 解读读取继电器状态的返回值
 def decode_relay_status(response_bytes):
@@ -56,20 +59,21 @@ def decode_relay_status(response_bytes):
     返回:
         str: 继电器状态字符串，格式为 "继电器状态： 关 关 关 关 关 关 关 关"。
     """
-    # 将字节流转换为十六进制字符串
-    response_hex = response_bytes.hex().upper()
-
-    # 检查返回值长度
-    if len(response_hex) == 0:
+    # 检查返回值
+    if len(response_bytes) == 0:
         print("未接收到响应数据")
         return
 
-    if len(response_hex) != 10:
-        raise ValueError("返回值长度不正确，应为 10 个字符（5 字节）。")
+    try:
+        ModbusRTUClient.validate_reply(response_bytes, RELAY_ADDR, FUNC_READ_COILS)
+    except ModbusError as e:
+        raise ValueError(f"返回值校验失败：{e}")
+
+    if len(response_bytes) != 5 + response_bytes[2]:
+        raise ValueError("返回值长度与字节数不符。")
 
     # 提取数据部分（第 4 字节）
-    data_byte = response_hex[6:8]  # 第 4 字节
-    data_int = int(data_byte, 16)  # 转换为整数
+    data_int = response_bytes[3]
 
     # 解析每个继电器的状态
     status_list = []
@@ -1,15 +1,21 @@
 import serial
 import time 
+from CRC import verify_frame
+from modbus_rtu import ModbusRTUClient
 
-def send_hex_command(port, baudrate, hex_command):
+def send_write_register(port, baudrate, addr, reg_addr, value):
     """
-    通过串口发送 16 进制指令，并接收返回的响应。
+    通过串口发送写单个寄存器指令（功能码 0x06），并接收返回的响应。
+    指令帧由 ModbusRTUClient 按字段构建并计算 CRC，不再手写十六进制指令。
 
     参数:
         port (str): 串口号，例如 '/dev/ttyUSB0' 或 'COM3'。
         baudrate (int): 波特率，例如 9600。
-        hex_command (str): 16 进制指令字符串，例如 "FF 05 00 00 FF 00 99 E4"。
+        addr (int): 设备地址，例如 0x0A。
+        reg_addr (int): 寄存器地址，例如 0x0001（反转）。
+        value (int): 写入的值，例如 0x0001。
     """
+    ser = None
     try:
         # 初始化串口
         ser = serial.Serial(
@@ -24,14 +30,12 @@ def send_hex_command(port, baudrate, hex_command):
         if ser.is_open:
             print(f"串口 {port} 已打开")
 
-        # 将 16 进制指令转换为字节流
-        command_bytes = bytes.fromhex(hex_command.replace(" ", ""))
-        print(command_bytes)
-    
+        # 构建指令帧（自动附加 CRC）
+        command_bytes = ModbusRTUClient(ser).frame_write_register(addr, reg_addr, value)
 
         # 发送指令
         ser.write(command_bytes)
-        print(f"发送指令: {hex_command}")
+        print(f"发送指令: {command_bytes.hex(' ').upper()}")
 
         # 等待设备响应
         time.sleep(0.1)  # 根据设备响应时间调整
@@ -40,13 +44,15 @@ def send_hex_command(port, baudrate, hex_command):
         # 打印响应
         if response:
             print(f"接收响应: {response.hex().upper()}")
+            if not verify_frame(response):
+                print("响应 CRC 校验失败")
         else:
             print("未接收到响应数据")
 
     except Exception as e:
         print(f"串口通信失败: {e}")
     finally:
-        if ser.is_open:
+        if ser is not None and ser.is_open:
             ser.close()
             print(f"串口 {port} 已关闭")
 
@@ -61,6 +67,6 @@ if __name__ == "__main__":
     # 发送指令
 
     for i in range(5):
-        send_hex_command(port, baudrate, "0A 06 00 01 00 01 18 B1") 
-        #send_hex_command(port, baudrate, "0A 06 00 00 00 01 49 71")
+        send_write_register(port, baudrate, 0x0A, 0x0001, 0x0001)  # 反转
+        #send_write_register(port, baudrate, 0x0A, 0x0000, 0x0001)  # 正转
         time.sleep(10)
\ No newline at end of file
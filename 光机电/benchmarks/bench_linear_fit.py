@@ -0,0 +1,55 @@
+"""
+fit_linear 与 sklearn LinearRegression + r2_score 的单次拟合耗时对比
+
+用法（在 光机电 目录下）：
+    python benchmarks/bench_linear_fit.py [-n 点数] [-r 重复次数]
+
+结果一致性由 tests/test_linear_fit.py 检查，这里只测速度。
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'src'))
+
+from analysis_unit.linear_fit import fit_linear  # noqa: E402
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="fit_linear 与 sklearn 的拟合耗时对比")
+    parser.add_argument('-n', '--points', type=int, default=200, help="每次拟合的点数")
+    parser.add_argument('-r', '--repeat', type=int, default=2000, help="重复次数")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    x = np.sort(rng.uniform(0.0, 1.0, args.points))
+    y = -150.0 * x + 250.0 + rng.normal(0.0, 2.0, args.points)
+
+    t_numpy = timeit.timeit(lambda: fit_linear(x, y), number=args.repeat) / args.repeat
+    print(f"numpy  : {t_numpy * 1e6:.1f} us/fit")
+
+    try:
+        from sklearn.linear_model import LinearRegression
+        from sklearn.metrics import r2_score
+    except ImportError:
+        print("sklearn 未安装，跳过对比")
+        return 0
+
+    X = x.reshape(-1, 1)
+
+    def sklearn_fit():
+        model = LinearRegression().fit(X, y)
+        return r2_score(y, model.predict(X))
+
+    number = max(1, args.repeat // 10)
+    t_sklearn = timeit.timeit(sklearn_fit, number=number) / number
+    print(f"sklearn: {t_sklearn * 1e6:.1f} us/fit（fit_linear 快 {t_sklearn / t_numpy:.1f}x）")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
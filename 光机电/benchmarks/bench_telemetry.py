@@ -0,0 +1,56 @@
+"""
+二进制遥测帧与文本行协议的解析吞吐量对比
+
+用法（在 光机电 目录下）：
+    python benchmarks/bench_telemetry.py [-n 采样数] [-r 重复次数]
+
+编码/解码的正确性由 tests/test_telemetry.py 检查，这里只测速度。
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'src'))
+
+from serial_unit.command_parser import CommandParser  # noqa: E402
+from serial_unit.line_framer import LineFramer  # noqa: E402
+from serial_unit.telemetry import TelemetryDecoder, TelemetryEncoder  # noqa: E402
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="二进制遥测帧与文本行的解析吞吐量对比")
+    parser.add_argument('-n', '--samples', type=int, default=20000, help="采样数")
+    parser.add_argument('-r', '--repeat', type=int, default=5, help="重复次数（取最快）")
+    args = parser.parse_args(argv)
+    n = args.samples
+
+    encoder = TelemetryEncoder()
+    samples = [(i % 3000, 3000 - i % 3000, 1000.0 + (i % 500) * 0.25) for i in range(n)]
+    binary = b''.join(encoder.encode_sample(m1, m2, c, device_ms=i * 500)
+                      for i, (m1, m2, c) in enumerate(samples))
+    text = ''.join(f"m1={m1}.00, m2={m2}.00, c={c:.2f}\n" for m1, m2, c in samples).encode()
+
+    def parse_text():
+        parse = CommandParser().parse_arduino_data
+        for line in LineFramer().feed(text):
+            parse(line)
+
+    t_binary = t_text = float('inf')
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        TelemetryDecoder().feed(binary)
+        t_binary = min(t_binary, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        parse_text()
+        t_text = min(t_text, time.perf_counter() - start)
+
+    print(f"{n} 条采样：二进制 {len(binary)} 字节 {n / t_binary:,.0f} 帧/秒，"
+          f"文本 {len(text)} 字节 {n / t_text:,.0f} 行/秒（{t_text / t_binary:.2f}x）")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
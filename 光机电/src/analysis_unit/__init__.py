@@ -1,3 +1,28 @@
 from .sim import TitrationSimulator
-from .analysis import analyze_titration_from_curve
-from .plot_results import TitrationPlotter, create_titration_plotter
+from .analysis import analyze_titration_from_curve, SPLIT_MINIMUM, SPLIT_RSS
+from .sample_store import SampleStore
+from .decimation import MinMaxDecimator, minmax_decimate
+from .time_index import TimeProportionIndex
+from .linear_fit import fit_linear, fit_from_sums
+from .online_estimator import OnlineEquivalenceEstimator
+from .raw_io import load_raw, load_raw_curve, RAW_COLUMNS, RAW_DTYPE
+from .run_file import RunWriter, read_run, export_run_text, is_run_file
+
+# 依赖 PyQt5 / pyqtgraph 的模块在首次访问时才导入，批量分析等无界面场景不加载 GUI 库
+_LAZY_IMPORTS = {
+    'TitrationPlotter': '.plot_results',
+    'create_titration_plotter': '.plot_results',
+    'BackgroundWriter': '.io_worker',
+    'AnalysisJob': '.analysis_job',
+    'AnalysisResult': '.analysis_job',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -1,13 +1,20 @@
+import io
 import numpy as np
 import os
 import time
 from typing import Sequence, Optional, Dict
-from sklearn.linear_model import LinearRegression
-from sklearn.metrics import r2_score
+
+from .linear_fit import fit_linear, fit_from_sums
 
 # 默认保存目录
 DEFAULT_SAVE_DIR = r"../results"
 
+# 分割点选取方式
+SPLIT_MINIMUM = "minimum"  # 以全局最小值为分割点
+SPLIT_RSS = "rss"  # 以两段残差平方和最小的位置为分割点
+# 分割点置信区间阈值：轮廓似然比检验 χ²(1) 的 95% 分位数
+_SPLIT_CHI2_95 = 3.841
+
 def _format_number(value: Optional[float], precision: int = 4) -> Optional[float]:
     """格式化数字到指定精度"""
     return None if value is None else round(float(value), precision)
@@ -30,22 +37,12 @@ def _resolve_save_path(save_txt_path: Optional[str], filename: Optional[str]) ->
     return save_txt_path
 
 def _fit_linear_segment(x: np.ndarray, y: np.ndarray) -> Dict[str, float]:
-    """使用sklearn进行线性拟合"""
-    if len(x) < 2:
-        raise ValueError("线性拟合至少需要2个点")
-    
-    # 使用sklearn的线性回归
-    model = LinearRegression()
-    X = x.reshape(-1, 1)
-    model.fit(X, y)
-    
-    y_pred = model.predict(X)
-    r2 = r2_score(y, y_pred)
-    
+    """最小二乘线性拟合（闭式解，结果与 sklearn LinearRegression + r2_score 一致）"""
+    fit = fit_linear(x, y)
     return {
-        'slope': float(model.coef_[0]),
-        'intercept': float(model.intercept_),
-        'r2': float(r2)
+        'slope': fit['slope'],
+        'intercept': fit['intercept'],
+        'r2': fit['r2']
     }
 
 def _find_global_minimum(x: np.ndarray, y: np.ndarray) -> int:
@@ -56,6 +53,80 @@ def _find_global_minimum(x: np.ndarray, y: np.ndarray) -> int:
 
     return min_idx
 
+def _cumsum0(values: np.ndarray) -> np.ndarray:
+    """前缀和，首元素为 0（长度 n+1）"""
+    out = np.zeros(len(values) + 1)
+    np.cumsum(values, out=out[1:])
+    return out
+
+def _find_optimal_split(x: np.ndarray, y: np.ndarray, min_points: int = 3) -> Dict[str, float]:
+    """
+    按两段拟合的总残差平方和搜索最优分割点
+
+    利用 Σx、Σy、Σxx、Σxy、Σyy 的前缀和，一次性得到所有候选分割点左右两段的
+    闭式拟合结果，整体 O(n)。置信区间取轮廓似然 n·ln(RSS(k)/RSS_min) ≤ χ²(1, 0.95)
+    的所有候选分割点，对应两段交点的最小/最大值。
+
+    Args:
+        x, y: 按 x 排序后的数据
+        min_points: 每段至少包含的点数
+    Returns:
+        dict: split_idx（右段起始索引）、rss、V_eq_lower、V_eq_upper
+    """
+    n = len(x)
+    # 平移到均值附近，减小幂和的抵消误差
+    x0, y0 = x.mean(), y.mean()
+    xs, ys = x - x0, y - y0
+    sx, sy = _cumsum0(xs), _cumsum0(ys)
+    sxx, sxy, syy = _cumsum0(xs * xs), _cumsum0(xs * ys), _cumsum0(ys * ys)
+
+    k = np.arange(min_points, n - min_points + 1)
+    left = fit_from_sums(k, sx[k], sy[k], sxx[k], sxy[k], syy[k])
+    right = fit_from_sums(n - k, sx[n] - sx[k], sy[n] - sy[k],
+                          sxx[n] - sxx[k], sxy[n] - sxy[k], syy[n] - syy[k])
+    rss = left['rss'] + right['rss']
+    best = int(np.argmin(rss))
+    rss_min = float(rss[best])
+
+    # 轮廓似然置信集
+    if rss_min > 0:
+        with np.errstate(divide='ignore'):
+            accepted = n * np.log(rss / rss_min) <= _SPLIT_CHI2_95
+    else:
+        accepted = rss <= rss_min
+    with np.errstate(divide='ignore', invalid='ignore'):
+        v_eq = (right['intercept'] - left['intercept']) / (left['slope'] - right['slope']) + x0
+    v_eq = v_eq[accepted]
+    v_eq = v_eq[np.isfinite(v_eq)]
+
+    return {
+        'split_idx': int(k[best]),
+        'rss': rss_min,
+        'V_eq_lower': float(v_eq.min()) if len(v_eq) else None,
+        'V_eq_upper': float(v_eq.max()) if len(v_eq) else None,
+    }
+
+def _format_report(*, x, y, split_line, fit_left, fit_right, x_intersection,
+                   y_intersection, split_search, hcl_conc, naoh_conc) -> str:
+    """生成分析结果文本（含全部原始数据点）"""
+    buf = io.StringIO()
+    buf.write(f"分析时间: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+
+    buf.write(f"\n==== 分析结果 ====\n")
+    buf.write(f"{split_line}\n")
+    buf.write(f"左段拟合: y = {fit_left['slope']:.4f}x + {fit_left['intercept']:.4f} (R² = {fit_left['r2']:.4f})\n")
+    buf.write(f"右段拟合: y = {fit_right['slope']:.4f}x + {fit_right['intercept']:.4f} (R² = {fit_right['r2']:.4f})\n")
+    buf.write(f"交点: ({x_intersection:.6f}, {y_intersection:.6f})\n")
+    if split_search is not None and split_search['V_eq_lower'] is not None:
+        buf.write(f"交点95%置信区间: [{split_search['V_eq_lower']:.6f}, {split_search['V_eq_upper']:.6f}]\n")
+    buf.write(f"HCl浓度: {hcl_conc:.6f} mol/L\n")
+    buf.write(f"NaOH浓度: {naoh_conc:.6f} mol/L\n")
+
+    buf.write("==== 原始数据 ====\n")
+    buf.write("x_fraction\ty_conductance\n")
+    np.savetxt(buf, np.column_stack((x, y)), fmt='%.6f', delimiter='\t')
+    return buf.getvalue()
+
 def analyze_titration_from_curve(
     *,
     x: Sequence[float],
@@ -64,14 +135,22 @@ def analyze_titration_from_curve(
     save_txt_path: Optional[str] = None,
     ratio_method: str = "mean",
     filename: Optional[str] = None,
+    split_method: str = SPLIT_MINIMUM,
+    write_file: bool = True,
+    writer=None,
+    writer_tag: object = None,
 ) -> Dict[str, Optional[float]]:
     """
     滴定曲线分析主函数：
-    1) 找到全局最小值作为分割点
-    2) 最小值左边数据拟合直线1
-    3) 最小值右边数据拟合直线2
+    1) 找到分割点：全局最小值（split_method="minimum"），
+       或两段总残差平方和最小的位置（split_method="rss"，同时给出交点置信区间）
+    2) 分割点左边数据拟合直线1
+    3) 分割点右边数据拟合直线2
     4) 计算两条直线交点 
     5) 根据 HCL:NaOH=c(NaOH):c(HCL) 计算浓度
+    6) write_file=True 时将结果写入文本文件（批量分析时可关闭）；
+       提供 writer（BackgroundWriter）时由后台线程写出，writer_tag 随完成信号返回；
+       此时结果中只有 _pending_txt_path，由调用方在写入确认后记录 _saved_txt_path
     """
     # ---------- 数据准备 ----------
     x = np.asarray(x, dtype=float)
@@ -87,8 +166,15 @@ def analyze_titration_from_curve(
     x_clean = x[sort_indices]
     y_clean = y[sort_indices]
 
-    # ---------- 找到全局最小值作为分割点 ----------
-    split_idx = _find_global_minimum(x_clean, y_clean)
+    # ---------- 确定分割点 ----------
+    split_search = None
+    if split_method == SPLIT_MINIMUM:
+        split_idx = _find_global_minimum(x_clean, y_clean)
+    elif split_method == SPLIT_RSS:
+        split_search = _find_optimal_split(x_clean, y_clean)
+        split_idx = split_search['split_idx']
+    else:
+        raise ValueError(f"未知的分割点选取方式: {split_method}")
 
     # ---------- 两段线性拟合 ----------
     x_left, y_left = x_clean[:split_idx], y_clean[:split_idx]
@@ -132,31 +218,37 @@ def analyze_titration_from_curve(
         "ratio_value": _format_number(x_intersection / (1 - x_intersection)),
         "HCl_conc": _format_number(hcl_conc),
         "NaOH_conc": _format_number(naoh_conc),
+        "split_method": split_method,
     }
+    if split_search is not None:
+        result_dict["V_eq_lower"] = _format_number(split_search['V_eq_lower'])
+        result_dict["V_eq_upper"] = _format_number(split_search['V_eq_upper'])
 
     # ---------- 保存结果到文件 ----------
+    if not write_file:
+        return result_dict
+
     try:
         save_path = _resolve_save_path(save_txt_path, filename)
-        
-        with open(save_path, "w", encoding="utf-8-sig") as f:
-            f.write(f"分析时间: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-
-            f.write(f"\n==== 分析结果 ====\n")
-            f.write(f"全局最小值位置: {x_clean[split_idx]:.6f}\n")
-            f.write(f"左段拟合: y = {fit_left['slope']:.4f}x + {fit_left['intercept']:.4f} (R² = {fit_left['r2']:.4f})\n")
-            f.write(f"右段拟合: y = {fit_right['slope']:.4f}x + {fit_right['intercept']:.4f} (R² = {fit_right['r2']:.4f})\n")
-            f.write(f"交点: ({x_intersection:.6f}, {y_intersection:.6f})\n")
-            f.write(f"HCl浓度: {hcl_conc:.6f} mol/L\n")
-            f.write(f"NaOH浓度: {naoh_conc:.6f} mol/L\n")
-            
-            f.write("==== 原始数据 ====\n")
-            f.write("x_fraction\ty_conductance\n")
-            for xi, yi in zip(x, y):
-                f.write(f"{xi:.6f}\t{yi:.6f}\n")
-            
+        if split_search is None:
+            split_line = f"全局最小值位置: {x_clean[split_idx]:.6f}"
+        else:
+            split_line = f"最优分割点位置: {x_clean[split_idx]:.6f} (RSS = {split_search['rss']:.6f})"
+        report = _format_report(
+            x=x, y=y, split_line=split_line,
+            fit_left=fit_left, fit_right=fit_right,
+            x_intersection=x_intersection, y_intersection=y_intersection,
+            split_search=split_search, hcl_conc=hcl_conc, naoh_conc=naoh_conc,
+        )
 
-        
-        result_dict["_saved_txt_path"] = save_path
+        if writer is not None:
+            # 交给后台写入线程，完成/失败通过 writer 的信号通知；写入确认前只记为待写入
+            writer.submit_text(save_path, report, encoding="utf-8-sig", tag=writer_tag)
+            result_dict["_pending_txt_path"] = save_path
+        else:
+            with open(save_path, "w", encoding="utf-8-sig") as f:
+                f.write(report)
+            result_dict["_saved_txt_path"] = save_path
         
     except Exception as e:
         print(f"保存文件失败: {e}")
@@ -0,0 +1,132 @@
+"""
+后台分析任务：在 QThreadPool 中执行拟合，结果以不可变对象返回 GUI 线程
+"""
+
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+import numpy as np
+from PyQt5 import QtCore
+
+from .analysis import analyze_titration_from_curve, SPLIT_MINIMUM
+
+# 分析所需的最少数据点数（与 analyze_titration_from_curve 一致）
+MIN_ANALYSIS_POINTS = 8
+
+
+def _frozen(array: np.ndarray) -> np.ndarray:
+    """返回只读数组"""
+    array = np.array(array, dtype=np.float64)
+    array.flags.writeable = False
+    return array
+
+
+@dataclass(frozen=True)
+class AnalysisResult:
+    """一次分析的结果（只读）"""
+    job_id: int
+    result: Mapping[str, object]  # analyze_titration_from_curve 的结果（只读映射）
+    x: np.ndarray  # 参与拟合的占比
+    y: np.ndarray  # 参与拟合的电导率
+    times: np.ndarray  # 对应的采样时间
+    prop_range: tuple  # (pmin, pmax)
+
+
+class AnalysisCancelled(Exception):
+    """分析任务已被取消"""
+
+
+class AnalysisJobSignals(QtCore.QObject):
+    """QRunnable 不是 QObject，信号放在单独的对象上"""
+    finished = QtCore.pyqtSignal(object)  # AnalysisResult
+    failed = QtCore.pyqtSignal(int, str)  # (job_id, 错误信息)
+    cancelled = QtCore.pyqtSignal(int)  # job_id
+
+
+class AnalysisJob(QtCore.QRunnable):
+    """
+    可取消的后台分析任务
+
+    构造时传入的是已按占比范围选好的数据快照（调用方负责选取与复制，如 SampleStore.select），
+    任务在工作线程中直接拟合，不再重复筛选；
+    在各阶段之间检查取消标志：已取消的任务不再返回结果，在拟合开始前取消时也不会写文件。
+    """
+
+    def __init__(self, job_id: int, times: np.ndarray, props: np.ndarray, conds: np.ndarray,
+                 prop_range: tuple, hcl_conc: float, split_method: str = SPLIT_MINIMUM,
+                 save_dir: Optional[str] = None, filename: Optional[str] = None,
+                 writer=None, writer_tag: object = None):
+        """
+        Args:
+            job_id: 任务编号，随结果返回，用于丢弃过期结果
+            times, props, conds: 已选取的采样数据快照
+            prop_range: 选取时使用的占比范围 (pmin, pmax)，随结果返回
+            hcl_conc: HCl 浓度（mol/L）
+            split_method: 分割点选取方式
+            save_dir, filename: 分析报告保存位置；save_dir 为 None 时不写文件
+            writer, writer_tag: 后台写入器及完成信号的 tag
+        """
+        super().__init__()
+        self.job_id = job_id
+        self.signals = AnalysisJobSignals()
+        self._times = times
+        self._props = props
+        self._conds = conds
+        self._prop_range = (min(prop_range), max(prop_range))
+        self._hcl_conc = hcl_conc
+        self._split_method = split_method
+        self._save_dir = save_dir
+        self._filename = filename
+        self._writer = writer
+        self._writer_tag = writer_tag
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """请求取消（任务在下一个检查点退出）"""
+        self._cancel_event.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def _check_cancelled(self):
+        if self._cancel_event.is_set():
+            raise AnalysisCancelled()
+
+    def run(self):
+        try:
+            self._check_cancelled()
+            x, y, times = self._props, self._conds, self._times
+            if len(x) < MIN_ANALYSIS_POINTS:
+                raise ValueError(
+                    f"所选范围数据点太少 ({len(x)})，需要至少 {MIN_ANALYSIS_POINTS} 个点"
+                )
+
+            self._check_cancelled()
+            result = analyze_titration_from_curve(
+                x=x,
+                y=y,
+                hcl_conc=self._hcl_conc,
+                save_txt_path=self._save_dir,
+                filename=self._filename,
+                split_method=self._split_method,
+                write_file=self._save_dir is not None,
+                writer=self._writer,
+                writer_tag=self._writer_tag,
+            )
+
+            self._check_cancelled()
+            self.signals.finished.emit(AnalysisResult(
+                job_id=self.job_id,
+                result=MappingProxyType(dict(result)),
+                x=_frozen(x),
+                y=_frozen(y),
+                times=_frozen(times),
+                prop_range=self._prop_range,
+            ))
+        except AnalysisCancelled:
+            self.signals.cancelled.emit(self.job_id)
+        except Exception as e:
+            self.signals.failed.emit(self.job_id, str(e))
@@ -0,0 +1,192 @@
+"""
+批量重新分析：无界面地对原始数据目录树并行执行滴定分析，汇总为一个表格
+
+用法（在 src 目录下）：
+    python -m analysis_unit.batch ../results/raw -o ../results/summary.csv --hcl 0.2
+"""
+
+import argparse
+import csv
+import fnmatch
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .analysis import analyze_titration_from_curve, SPLIT_MINIMUM, SPLIT_RSS
+from .raw_io import load_raw_curve
+
+# 汇总表的列
+SUMMARY_FIELDS = (
+    'file', 'status', 'error', 'n_points',
+    'V_eq', 'Y_eq', 'V_eq_lower', 'V_eq_upper', 'HCl_conc', 'NaOH_conc',
+    'slope_left', 'intercept_left', 'r2_left',
+    'slope_right', 'intercept_right', 'r2_right',
+    'split_method',
+)
+
+
+def find_raw_files(root: str, pattern: str = "raw_*.txt") -> List[str]:
+    """递归查找 root 下文件名匹配 pattern 的原始数据文件（按路径排序）"""
+    if os.path.isfile(root):
+        return [root]
+    paths = []
+    for dirpath, _, filenames in os.walk(root):
+        for name in fnmatch.filter(filenames, pattern):
+            paths.append(os.path.join(dirpath, name))
+    return sorted(paths)
+
+
+def analyze_file(path: str, hcl_conc: float, split_method: str = SPLIT_MINIMUM,
+                 prop_range: Optional[Tuple[float, float]] = None,
+                 mmap: bool = False, cache_dir: Optional[str] = None) -> Dict[str, object]:
+    """
+    分析单个文件（在子进程中执行），失败时不抛出异常，而是在结果中记录错误
+
+    Args:
+        path: 原始数据文件路径
+        hcl_conc: HCl 浓度（mol/L）
+        split_method: 分割点选取方式
+        prop_range: 仅分析该占比范围内的数据（对应界面上的两次点选）
+        mmap, cache_dir: 以内存映射方式读取及其缓存目录（见 raw_io.load_raw）
+    """
+    row: Dict[str, object] = {'file': path, 'status': 'ok', 'error': ''}
+    try:
+        x, y = load_raw_curve(path, mmap=mmap, cache_dir=cache_dir)
+        if prop_range is not None:
+            pmin, pmax = prop_range
+            mask = (x >= pmin) & (x <= pmax)
+            x, y = x[mask], y[mask]
+        row['n_points'] = len(x)
+        result = analyze_titration_from_curve(
+            x=x, y=y, hcl_conc=hcl_conc,
+            split_method=split_method, write_file=False
+        )
+        for key in SUMMARY_FIELDS:
+            if key in result:
+                row[key] = result[key]
+    except Exception as e:
+        row['status'] = 'error'
+        row['error'] = f"{type(e).__name__}: {e}"
+    return row
+
+
+def _print_progress(done: int, total: int, failed: int, start_time: float, width: int = 30):
+    """在 stderr 上绘制文本进度条"""
+    ratio = done / total if total else 1.0
+    filled = int(width * ratio)
+    elapsed = time.time() - start_time
+    sys.stderr.write(
+        f"\r[{'#' * filled}{'-' * (width - filled)}] {done}/{total} "
+        f"失败 {failed}  {elapsed:.1f}s"
+    )
+    if done == total:
+        sys.stderr.write("\n")
+    sys.stderr.flush()
+
+
+def run_batch(paths: Sequence[str], hcl_conc: float, split_method: str = SPLIT_MINIMUM,
+              prop_range: Optional[Tuple[float, float]] = None,
+              workers: Optional[int] = None, progress: bool = True,
+              mmap: bool = False, cache_dir: Optional[str] = None) -> List[Dict[str, object]]:
+    """
+    使用进程池并行分析多个文件
+
+    Args:
+        workers: 进程数，None 为 CPU 核数，1 表示在当前进程中顺序执行
+    Returns:
+        每个文件一行的结果列表（顺序与 paths 一致）
+    """
+    total = len(paths)
+    rows: List[Optional[Dict[str, object]]] = [None] * total
+    failed = 0
+    start_time = time.time()
+
+    if workers == 1:
+        for i, path in enumerate(paths):
+            rows[i] = analyze_file(path, hcl_conc, split_method, prop_range, mmap, cache_dir)
+            failed += rows[i]['status'] != 'ok'
+            if progress:
+                _print_progress(i + 1, total, failed, start_time)
+        return rows
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(analyze_file, path, hcl_conc, split_method, prop_range, mmap, cache_dir): i
+            for i, path in enumerate(paths)
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            i = futures[future]
+            try:
+                rows[i] = future.result()
+            except Exception as e:
+                # 子进程异常退出等情况
+                rows[i] = {'file': paths[i], 'status': 'error',
+                           'error': f"{type(e).__name__}: {e}"}
+            failed += rows[i]['status'] != 'ok'
+            if progress:
+                _print_progress(done, total, failed, start_time)
+    return rows
+
+
+def write_summary(rows: Sequence[Dict[str, object]], output_path: str):
+    """写出汇总表：.parquet 后缀需要 pandas（及 pyarrow），其余写为 CSV"""
+    out_dir = os.path.dirname(os.path.abspath(output_path))
+    os.makedirs(out_dir, exist_ok=True)
+
+    if output_path.lower().endswith('.parquet'):
+        try:
+            import pandas as pd
+        except ImportError:
+            raise RuntimeError("写出 Parquet 需要安装 pandas 和 pyarrow")
+        pd.DataFrame(list(rows), columns=list(SUMMARY_FIELDS)).to_parquet(output_path, index=False)
+        return
+
+    with open(output_path, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="批量重新分析滴定原始数据")
+    parser.add_argument('root', help="原始数据目录（递归查找）或单个文件")
+    parser.add_argument('-o', '--output', default='titration_summary.csv',
+                        help="汇总文件路径（.csv 或 .parquet）")
+    parser.add_argument('--pattern', default='raw_*.txt', help="文件名匹配模式")
+    parser.add_argument('--hcl', type=float, default=0.2, help="HCl 浓度（mol/L）")
+    parser.add_argument('--split-method', choices=(SPLIT_MINIMUM, SPLIT_RSS),
+                        default=SPLIT_MINIMUM, help="分割点选取方式")
+    parser.add_argument('--prop-range', type=float, nargs=2, metavar=('PMIN', 'PMAX'),
+                        help="仅分析该占比范围内的数据")
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help="进程数（默认 CPU 核数，1 为顺序执行）")
+    parser.add_argument('--mmap', action='store_true',
+                        help="以内存映射方式读取（缓存 .npy 文件，默认在数据目录的 .raw_cache 子目录）")
+    parser.add_argument('--cache-dir', default=None, help="--mmap 的缓存目录")
+    parser.add_argument('-q', '--quiet', action='store_true', help="不显示进度条")
+    args = parser.parse_args(argv)
+
+    paths = find_raw_files(args.root, args.pattern)
+    if not paths:
+        print(f"未找到匹配 {args.pattern} 的文件: {args.root}", file=sys.stderr)
+        return 1
+
+    rows = run_batch(
+        paths, args.hcl, args.split_method,
+        prop_range=tuple(args.prop_range) if args.prop_range else None,
+        workers=args.workers, progress=not args.quiet, mmap=args.mmap,
+        cache_dir=args.cache_dir
+    )
+    write_summary(rows, args.output)
+
+    failures = [row for row in rows if row['status'] != 'ok']
+    for row in failures:
+        print(f"失败: {row['file']}: {row['error']}", file=sys.stderr)
+    print(f"完成 {len(rows) - len(failures)}/{len(rows)} 个文件，汇总已保存: {args.output}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
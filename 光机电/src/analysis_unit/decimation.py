@@ -0,0 +1,168 @@
+"""
+实时曲线降采样：按像素宽度保留每个分桶的最小/最大值
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+
+def _bucket_minmax(y: np.ndarray, offset: int, bucket_size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    对 y 按 bucket_size 连续分桶（最后一个桶可以不满），返回各桶最小/最大值的全局索引
+
+    Args:
+        y: 待分桶的数据片段
+        offset: y[0] 在完整数据中的索引
+        bucket_size: 每个桶的样本数
+    """
+    n = len(y)
+    full = n // bucket_size
+    min_idx = []
+    max_idx = []
+    if full:
+        body = y[:full * bucket_size].reshape(full, bucket_size)
+        starts = offset + np.arange(full) * bucket_size
+        min_idx.append(starts + body.argmin(axis=1))
+        max_idx.append(starts + body.argmax(axis=1))
+    if n > full * bucket_size:
+        tail = y[full * bucket_size:]
+        start = offset + full * bucket_size
+        min_idx.append(np.array([start + tail.argmin()]))
+        max_idx.append(np.array([start + tail.argmax()]))
+    if not min_idx:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    return np.concatenate(min_idx), np.concatenate(max_idx)
+
+
+def _interleave(min_idx: np.ndarray, max_idx: np.ndarray) -> np.ndarray:
+    """每个桶输出两个点，并按原始顺序排列"""
+    pairs = np.stack((min_idx, max_idx), axis=1)
+    pairs.sort(axis=1)
+    return pairs.ravel()
+
+
+def minmax_decimate(x: np.ndarray, y: np.ndarray, n_buckets: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    一次性对 (x, y) 做最小/最大值降采样（用于缩放后的可见区间）
+
+    Returns:
+        (x_dec, y_dec)；点数不超过 2 * n_buckets 时原样返回
+    """
+    n = len(y)
+    if n <= 2 * max(1, n_buckets):
+        return x, y
+    bucket_size = -(-n // n_buckets)
+    idx = _interleave(*_bucket_minmax(y, 0, bucket_size))
+    return x[idx], y[idx]
+
+
+class MinMaxDecimator:
+    """
+    增量式最小/最大值降采样器
+
+    数据按固定样本数分桶，每个桶记录最小值与最大值的索引。新样本到达时只更新最后一个
+    未满的桶并追加新桶；桶数超过目标的两倍时相邻两桶合并、桶宽加倍。因此每个样本的均摊
+    代价为 O(1)，输出点数始终在目标像素宽度的 2~4 倍之间。
+    """
+
+    REBUILD_RATIO = 2.0  # 目标桶数变化超过该倍数时才重建
+
+    def __init__(self, target_buckets: int = 1000):
+        """
+        Args:
+            target_buckets: 目标桶数（一般取绘图区的像素宽度）
+        """
+        self.target_buckets = max(1, int(target_buckets))
+        self.reset()
+
+    def reset(self):
+        """清空分桶状态（之后按当前目标桶数重新分桶）"""
+        self._built_target = self.target_buckets  # 上次重建时的目标桶数
+        self.bucket_size = 1
+        self._count = 0  # 已处理的样本数
+        self._min_idx = np.empty(0, dtype=np.int64)
+        self._max_idx = np.empty(0, dtype=np.int64)
+
+    def set_target(self, target_buckets: int, y: np.ndarray = None):
+        """
+        修改目标桶数；与上次重建时的目标相差超过 REBUILD_RATIO 倍时（如窗口大幅缩放）
+        按新目标重建（桶宽随之变小或变大），否则只记录新目标（目标变小时在下次 update 中
+        合并相邻桶）。与上次重建时而不是上一次调用比较，窗口分多步缩放时累计变化同样会触发重建
+
+        Args:
+            target_buckets: 新的目标桶数
+            y: 当前完整数据，提供时立即重建
+        """
+        target_buckets = max(1, int(target_buckets))
+        ratio = target_buckets / self._built_target
+        self.target_buckets = target_buckets
+        if 1 / self.REBUILD_RATIO <= ratio <= self.REBUILD_RATIO:
+            return
+        self.reset()
+        if y is not None:
+            self.update(y)
+
+    def update(self, y: np.ndarray):
+        """
+        处理 y 中新增的样本（y 为完整数据，长度只增不减；数据被清空后需先 reset）
+        """
+        n = len(y)
+        if n < self._count:
+            self.reset()
+        if n == self._count:
+            return
+
+        start = self._count
+        k = self.bucket_size
+
+        # 先补满最后一个未满的桶
+        partial = start % k
+        if partial and len(self._min_idx):
+            fill_end = min(n, start + (k - partial))
+            seg = y[start:fill_end]
+            i_min = start + int(seg.argmin())
+            i_max = start + int(seg.argmax())
+            if y[i_min] < y[self._min_idx[-1]]:
+                self._min_idx[-1] = i_min
+            if y[i_max] > y[self._max_idx[-1]]:
+                self._max_idx[-1] = i_max
+            start = fill_end
+
+        # 其余样本整体分桶后追加
+        if start < n:
+            new_min, new_max = _bucket_minmax(y[start:n], start, k)
+            self._min_idx = np.concatenate((self._min_idx, new_min))
+            self._max_idx = np.concatenate((self._max_idx, new_max))
+
+        self._count = n
+        while len(self._min_idx) > 2 * self.target_buckets:
+            self._merge_pairs(y)
+
+    def _merge_pairs(self, y: np.ndarray):
+        """相邻两桶合并，桶宽加倍"""
+        mins, maxs = self._min_idx, self._max_idx
+        if len(mins) % 2:
+            # 落单的最后一个桶单独保留
+            mins = np.append(mins, mins[-1])
+            maxs = np.append(maxs, maxs[-1])
+        a_min, b_min = mins[0::2], mins[1::2]
+        a_max, b_max = maxs[0::2], maxs[1::2]
+        self._min_idx = np.where(y[b_min] < y[a_min], b_min, a_min)
+        self._max_idx = np.where(y[b_max] > y[a_max], b_max, a_max)
+        self.bucket_size *= 2
+
+    def indices(self) -> np.ndarray:
+        """降采样后各点在原始数据中的索引（按原始顺序）"""
+        return _interleave(self._min_idx, self._max_idx)
+
+    def points(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        返回降采样后的 (x, y)；桶宽为 1 时直接返回原始数据
+        """
+        self.update(y)
+        if self.bucket_size == 1:
+            return x, y
+        idx = self.indices()
+        return x[idx], y[idx]
@@ -0,0 +1,97 @@
+"""
+后台文件写入：所有文件输出经由一个队列交给单独的写入线程，完成后以 Qt 信号通知界面
+"""
+
+import queue
+import threading
+from typing import Callable
+
+import numpy as np
+from PyQt5 import QtCore
+
+
+class BackgroundWriter(QtCore.QObject):
+    """
+    单线程后台写入器
+
+    submit 系列方法只把写入任务放入队列后立即返回，任务按提交顺序在写入线程中执行；
+    完成或失败时发出信号（跨线程信号会排队投递到接收者所在的 GUI 线程）。
+    """
+
+    # 信号定义
+    write_finished = QtCore.pyqtSignal(str, object)  # (路径, tag)
+    write_failed = QtCore.pyqtSignal(str, str, object)  # (路径, 错误信息, tag)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name='BackgroundWriter', daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def pending(self) -> int:
+        """尚未完成的写入任务数"""
+        return self._queue.unfinished_tasks
+
+    def submit(self, path: str, write_fn: Callable[[], None], tag: object = None,
+               notify: bool = True):
+        """
+        提交一个写入任务
+
+        Args:
+            path: 目标路径（用于信号与错误信息）
+            write_fn: 在写入线程中执行的无参函数
+            tag: 随完成/失败信号返回的任意对象
+            notify: 成功时是否发出 write_finished（失败总会发出 write_failed）
+        """
+        if self._closed:
+            raise RuntimeError("后台写入线程已关闭")
+        self._queue.put((path, write_fn, tag, notify))
+
+    def submit_text(self, path: str, text: str, encoding: str = 'utf-8',
+                    tag: object = None, notify: bool = True):
+        """写出文本文件"""
+        def write():
+            with open(path, 'w', encoding=encoding) as f:
+                f.write(text)
+        self.submit(path, write, tag, notify)
+
+    def submit_savetxt(self, path: str, rows: np.ndarray, tag: object = None,
+                       notify: bool = True, **savetxt_kwargs):
+        """以 np.savetxt 写出数组（rows 需为调用方不再修改的数组，如快照副本）"""
+        def write():
+            np.savetxt(path, rows, **savetxt_kwargs)
+        self.submit(path, write, tag, notify)
+
+    def wait_idle(self):
+        """阻塞直到队列中的任务全部完成"""
+        self._queue.join()
+
+    def shutdown(self, wait: bool = True):
+        """不再接受新任务；wait=True 时等待已提交的任务写完"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        if wait:
+            self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                path, write_fn, tag, notify = item
+                try:
+                    write_fn()
+                except Exception as e:
+                    self.write_failed.emit(path, str(e), tag)
+                else:
+                    if notify:
+                        self.write_finished.emit(path, tag)
+            finally:
+                self._queue.task_done()
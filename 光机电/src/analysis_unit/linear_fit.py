@@ -0,0 +1,74 @@
+"""
+一维最小二乘直线拟合：基于充分统计量（Σx, Σy, Σxx, Σxy, Σyy）的闭式解
+
+与 sklearn 的 LinearRegression + r2_score 结果一致，但不需要构造估计器，
+也便于在前缀和上对大量候选分段同时求解。
+"""
+
+from typing import Dict
+
+import numpy as np
+
+
+def fit_from_sums(n, sx, sy, sxx, sxy, syy) -> Dict[str, np.ndarray]:
+    """
+    由充分统计量计算拟合参数（支持标量或等长数组，逐元素计算）
+
+    Args:
+        n: 点数
+        sx, sy: Σx, Σy
+        sxx, sxy, syy: Σx², Σxy, Σy²
+    Returns:
+        dict: slope, intercept, r2, rss（残差平方和）
+    Note:
+        原始幂和在数值较大时存在抵消误差，调用方应先将 x、y 平移到接近零的位置。
+    """
+    n = np.asarray(n, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # 中心化二阶矩
+        cxx = sxx - sx * sx / n
+        cxy = sxy - sx * sy / n
+        cyy = syy - sy * sy / n
+        return _fit_from_moments(n, sx / n, sy / n, cxx, cxy, cyy)
+
+
+def _fit_from_moments(n, mean_x, mean_y, cxx, cxy, cyy) -> Dict[str, np.ndarray]:
+    """由均值与中心化二阶矩计算拟合参数"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # x 全部相同时取斜率 0（与 sklearn 的最小范数解一致）
+        degenerate = cxx <= 0
+        slope = np.where(degenerate, 0.0, cxy / np.where(degenerate, 1.0, cxx))
+        intercept = mean_y - slope * mean_x
+        rss = np.maximum(cyy - slope * cxy, 0.0)
+        # 与 r2_score 一致：y 为常数时，完全拟合记为 1，否则为 0
+        constant_y = cyy <= 0
+        r2 = np.where(
+            constant_y,
+            np.where(rss <= 0, 1.0, 0.0),
+            1.0 - rss / np.where(constant_y, 1.0, cyy),
+        )
+    return {'slope': slope, 'intercept': intercept, 'r2': r2, 'rss': rss}
+
+
+def fit_linear(x, y) -> Dict[str, float]:
+    """
+    对一组点做直线拟合
+
+    Returns:
+        dict: slope, intercept, r2, rss（均为 float）
+    """
+    x = np.asarray(x, dtype=float).ravel()
+    y = np.asarray(y, dtype=float).ravel()
+    if len(x) != len(y):
+        raise ValueError("x 和 y 的长度必须一致")
+    if len(x) < 2:
+        raise ValueError("线性拟合至少需要2个点")
+
+    # 先中心化再求二阶矩，避免大数值下的抵消误差
+    mean_x = x.mean()
+    mean_y = y.mean()
+    dx = x - mean_x
+    dy = y - mean_y
+    fit = _fit_from_moments(len(x), mean_x, mean_y, dx @ dx, dx @ dy, dy @ dy)
+    return {key: float(value) for key, value in fit.items()}
+
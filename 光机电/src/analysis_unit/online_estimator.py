@@ -0,0 +1,156 @@
+"""
+在线等当点估计：滴定过程中随采样增量更新两段直线拟合
+"""
+
+from collections import deque
+from typing import Dict, Optional
+
+import numpy as np
+
+from .linear_fit import fit_from_sums
+
+
+class OnlineEquivalenceEstimator:
+    """
+    滴定过程中的在线等当点估计器
+
+    采样按到达顺序（即电机占比的递增顺序）追加，保存 Σx、Σy、Σxx、Σxy、Σyy 的前缀和，
+    同时维护 y 的运行最小值位置作为分割点（与离线分析的 "minimum" 方式一致）。
+    左段 = 最小值之前的样本，右段 = 其余样本，两段的充分统计量都可由前缀和 O(1) 得到，
+    因此每个新样本的更新代价为 O(1)。
+
+    收敛判据：两段都有足够点数，且最近 window 次估计的交点波动不超过 tolerance。
+    """
+
+    def __init__(self, hcl_conc: float = 0.1, min_points: int = 5, window: int = 20,
+                 tolerance: float = 0.002, initial_capacity: int = 4096):
+        """
+        Args:
+            hcl_conc: HCl 浓度（mol/L），用于换算 NaOH 浓度
+            min_points: 每段至少包含的点数
+            window: 收敛判据使用的最近估计次数
+            tolerance: 收敛时交点（占比）允许的最大波动
+            initial_capacity: 前缀和数组的初始容量
+        """
+        self.hcl_conc = float(hcl_conc)
+        self.min_points = max(2, int(min_points))
+        self.window = max(2, int(window))
+        self.tolerance = float(tolerance)
+        self._capacity = max(16, int(initial_capacity))
+        self._sums = np.zeros((self._capacity + 1, 5), dtype=np.float64)
+        self._history = deque(maxlen=self.window)
+        self.reset()
+
+    def reset(self):
+        """清空全部状态，开始新一轮滴定时调用"""
+        self._size = 0
+        self._origin = None  # 平移原点 (x0, y0)，减小幂和的抵消误差
+        self._min_idx = -1
+        self._min_y = np.inf
+        self._history.clear()
+        self._estimate = None
+        self.converged = False
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def estimate(self) -> Optional[Dict[str, float]]:
+        """最近一次估计结果，尚无法估计时为 None"""
+        return self._estimate
+
+    # ---------- 写入 ----------
+    def update(self, x: float, y: float) -> Optional[Dict[str, float]]:
+        """追加一个采样点 (占比, 电导率) 并返回最新估计"""
+        if self._origin is None:
+            self._origin = (float(x), float(y))
+        i = self._size
+        if i >= self._capacity:
+            self._reserve(i + 1)
+        dx = x - self._origin[0]
+        dy = y - self._origin[1]
+        self._sums[i + 1] = self._sums[i] + (dx, dy, dx * dx, dx * dy, dy * dy)
+        if y < self._min_y:
+            self._min_y = y
+            self._min_idx = i
+        self._size = i + 1
+        return self._refresh()
+
+    def extend(self, xs, ys) -> Optional[Dict[str, float]]:
+        """批量追加采样点，整块只计算一次估计"""
+        xs = np.asarray(xs, dtype=np.float64).ravel()
+        ys = np.asarray(ys, dtype=np.float64).ravel()
+        if len(xs) != len(ys):
+            raise ValueError("xs 和 ys 的长度必须一致")
+        n = len(xs)
+        if n == 0:
+            return self._estimate
+        if self._origin is None:
+            self._origin = (float(xs[0]), float(ys[0]))
+
+        start = self._size
+        self._reserve(start + n)
+        dx = xs - self._origin[0]
+        dy = ys - self._origin[1]
+        terms = np.column_stack((dx, dy, dx * dx, dx * dy, dy * dy))
+        np.cumsum(terms, axis=0, out=self._sums[start + 1:start + n + 1])
+        self._sums[start + 1:start + n + 1] += self._sums[start]
+
+        j = int(np.argmin(ys))
+        if ys[j] < self._min_y:
+            self._min_y = float(ys[j])
+            self._min_idx = start + j
+        self._size = start + n
+        return self._refresh()
+
+    # ---------- 估计 ----------
+    def _refresh(self) -> Optional[Dict[str, float]]:
+        """由前缀和计算两段拟合与交点，并更新收敛状态"""
+        n = self._size
+        split = self._min_idx
+        if split < self.min_points or n - split < self.min_points:
+            return self._estimate
+
+        total = self._sums[n]
+        head = self._sums[split]
+        left = fit_from_sums(split, *head)
+        right = fit_from_sums(n - split, *(total - head))
+        slope_diff = float(left['slope'] - right['slope'])
+        if abs(slope_diff) < 1e-12:
+            return self._estimate
+
+        # 交点（平移坐标系下求解后还原）
+        x0, y0 = self._origin
+        xs_eq = float(right['intercept'] - left['intercept']) / slope_diff
+        v_eq = xs_eq + x0
+        y_eq = float(left['slope']) * xs_eq + float(left['intercept']) + y0
+        naoh = self.hcl_conc * v_eq / (1 - v_eq) if abs(1 - v_eq) > 1e-12 else None
+
+        self._history.append(v_eq)
+        spread = max(self._history) - min(self._history)
+        self.converged = (
+            len(self._history) >= self.window and spread <= self.tolerance
+        )
+        self._estimate = {
+            'V_eq': v_eq,
+            'Y_eq': y_eq,
+            'NaOH_conc': naoh,
+            'r2_left': float(left['r2']),
+            'r2_right': float(right['r2']),
+            'n_left': split,
+            'n_right': n - split,
+            'spread': spread,
+            'converged': self.converged,
+        }
+        return self._estimate
+
+    def _reserve(self, needed: int):
+        if needed <= self._capacity:
+            return
+        new_capacity = self._capacity
+        while new_capacity < needed:
+            new_capacity *= 2
+        new = np.zeros((new_capacity + 1, 5), dtype=np.float64)
+        new[:self._size + 1] = self._sums[:self._size + 1]
+        self._sums = new
+        self._capacity = new_capacity
@@ -0,0 +1,116 @@
+"""
+原始数据文件读取：将 AppController._save_data 写出的文本直接解析为 NumPy 列
+
+文件格式（逗号分隔，首行为表头）：
+    time_s,conductivity,motor1_proportion,motor1_speed,motor2_speed
+早期文件只有前三列，缺少的列以 NaN 填充。
+也可直接读取 run_file 模块写出的二进制记录（按文件头魔数识别）。
+"""
+
+import os
+import warnings
+from typing import List, Optional
+
+import numpy as np
+
+# 原始数据的列（与 _save_data 的表头一致）
+RAW_COLUMNS = ('time_s', 'conductivity', 'motor1_proportion', 'motor1_speed', 'motor2_speed')
+RAW_DTYPE = np.dtype([(name, np.float64) for name in RAW_COLUMNS])
+
+# 内存映射模式下缓存的二进制文件：默认放在数据所在目录下的专用子目录中
+MMAP_CACHE_DIR = '.raw_cache'
+MMAP_CACHE_SUFFIX = '.npy'
+
+
+def _read_header(path: str) -> List[str]:
+    """读取表头并校验列名"""
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        header = [name.strip() for name in f.readline().split(',')]
+    if 'conductivity' not in header or 'motor1_proportion' not in header:
+        raise ValueError(f"无法识别的表头: {','.join(header)}")
+    return header
+
+
+def _parse_text(path: str) -> np.ndarray:
+    """解析文本文件为 RAW_DTYPE 结构化数组"""
+    header = _read_header(path)
+    known = [(i, name) for i, name in enumerate(header) if name in RAW_COLUMNS]
+    usecols = [i for i, _ in known]
+
+    try:
+        values = np.loadtxt(path, delimiter=',', skiprows=1, ndmin=2,
+                            usecols=usecols, encoding='utf-8-sig')
+    except ValueError:
+        # 存在损坏的行（如写入中断）：逐行容错解析，丢弃无法解析的行
+        with warnings.catch_warnings():
+            # 被丢弃的行会触发 ConversionWarning（UserWarning 子类）
+            warnings.simplefilter('ignore', UserWarning)
+            values = np.genfromtxt(path, delimiter=',', skip_header=1, usecols=usecols,
+                                   invalid_raise=False, encoding='utf-8-sig')
+        values = np.atleast_2d(values)
+        if values.size:
+            values = values[~np.isnan(values).any(axis=1)]
+        else:
+            values = values.reshape(0, len(usecols))
+
+    data = np.full(len(values), np.nan, dtype=RAW_DTYPE)
+    for col, (_, name) in enumerate(known):
+        data[name] = values[:, col]
+    return data
+
+
+def mmap_cache_path(path: str, cache_dir: Optional[str] = None) -> str:
+    """文本文件对应的二进制缓存路径（cache_dir 为 None 时使用数据目录下的 MMAP_CACHE_DIR）"""
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(path)), MMAP_CACHE_DIR)
+    return os.path.join(cache_dir, os.path.basename(path) + MMAP_CACHE_SUFFIX)
+
+
+def load_raw(path: str, mmap: bool = False, cache_dir: Optional[str] = None) -> np.ndarray:
+    """
+    读取原始数据文件
+
+    Args:
+        path: 原始数据文本文件或二进制记录文件
+        mmap: True 时首次读取会在缓存目录写出 <文件名>.npy 二进制缓存，之后以只读内存映射
+              方式打开（文本更新后自动重建），适合反复读取的大文件；
+              二进制记录文件直接内存映射，不写缓存
+        cache_dir: 缓存目录，默认为数据所在目录下的 MMAP_CACHE_DIR 子目录
+    Returns:
+        RAW_DTYPE 结构化数组，可按列名取出各列，如 data['conductivity']
+    """
+    # run_file 依赖本模块的 RAW_DTYPE，在函数内导入以避免循环导入
+    from .run_file import is_run_file, read_run
+    if is_run_file(path):
+        return read_run(path, mmap=mmap)[1]
+
+    if not mmap:
+        return _parse_text(path)
+
+    cache_path = mmap_cache_path(path, cache_dir)
+    try:
+        fresh = os.path.getmtime(cache_path) >= os.path.getmtime(path)
+    except OSError:
+        fresh = False
+
+    if not fresh:
+        data = _parse_text(path)
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            np.save(cache_path, data)
+        except OSError:
+            # 目录不可写时退回内存读取
+            return data
+
+    return np.load(cache_path, mmap_mode='r')
+
+
+def load_raw_curve(path: str, mmap: bool = False, cache_dir: Optional[str] = None):
+    """
+    读取分析所需的滴定曲线（参数同 load_raw）
+
+    Returns:
+        (motor1_proportion, conductivity)
+    """
+    data = load_raw(path, mmap=mmap, cache_dir=cache_dir)
+    return data['motor1_proportion'], data['conductivity']
@@ -0,0 +1,216 @@
+"""
+二进制滴定记录格式：文件头（魔数 + JSON 元数据）后接定长 float64 记录，只追加写入
+
+文件布局（小端）：
+    MAGIC(8) | 版本 uint16 | 元数据长度 uint32 | 元数据 JSON（补齐到 8 字节对齐）
+    | 记录 * N（每条记录为 RAW_DTYPE：time_s, conductivity, motor1_proportion,
+      motor1_speed, motor2_speed，共 40 字节）
+
+记录区只追加，程序崩溃时最多丢失最后一个刷新周期的数据；末尾不完整的记录在读取时忽略。
+"""
+
+import json
+import os
+import struct
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .raw_io import RAW_COLUMNS, RAW_DTYPE
+
+MAGIC = b'TTRUN\x00\x00\x01'
+FORMAT_VERSION = 1
+_PREFIX = struct.Struct('<8sHI')  # 魔数、版本、元数据长度
+_RECORD_DTYPE = RAW_DTYPE.newbyteorder('<')
+
+# 导出文本时与 AppController._save_data 一致的格式
+TEXT_FORMAT = ['%.4f', '%.6f', '%.6f', '%.4f', '%.4f']
+
+
+def is_run_file(path: str) -> bool:
+    """判断文件是否为二进制滴定记录"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def _read_header(f) -> Tuple[Dict[str, object], int]:
+    """读取文件头，返回 (元数据, 记录区起始偏移)"""
+    prefix = f.read(_PREFIX.size)
+    if len(prefix) < _PREFIX.size:
+        raise ValueError("文件头不完整")
+    magic, version, meta_len = _PREFIX.unpack(prefix)
+    if magic != MAGIC:
+        raise ValueError("不是滴定记录文件")
+    if version > FORMAT_VERSION:
+        raise ValueError(f"不支持的记录格式版本: {version}")
+    metadata = json.loads(f.read(meta_len).decode('utf-8').rstrip(' '))
+    return metadata, _PREFIX.size + meta_len
+
+
+class RunWriter:
+    """
+    滴定记录写入器
+
+    append_row / append_block 只把数据放入内存缓冲区（GUI 线程上几乎无开销），
+    追加时距上次刷新超过 flush_interval 秒才写入文件；采样可能停顿时，调用方应定时调用
+    flush()（或 flush_if_due()），close() 写出剩余数据。
+    提供 io_writer（BackgroundWriter）时，实际的文件写入在后台写入线程中进行。
+    """
+
+    def __init__(self, path: str, metadata: Optional[Dict[str, object]] = None,
+                 flush_interval: float = 1.0, fsync: bool = False, io_writer=None):
+        """
+        Args:
+            path: 输出文件路径（已存在时覆盖）
+            metadata: 写入文件头的元数据（需可 JSON 序列化）
+            flush_interval: 刷新间隔（秒）
+            fsync: 刷新时是否调用 os.fsync（防止断电丢失，代价是每次刷新多一次磁盘同步）
+            io_writer: 后台写入器，None 时在调用线程中直接写入
+        """
+        self.path = path
+        self.flush_interval = float(flush_interval)
+        self.fsync = fsync
+        self._io_writer = io_writer
+        self._closed = False
+        self.records_written = 0
+        self._rows: List[tuple] = []
+        self._chunks: List[np.ndarray] = []
+        self._last_flush = time.monotonic()
+
+        meta = {'columns': list(RAW_COLUMNS), 'created': time.strftime('%Y-%m-%d %H:%M:%S')}
+        meta.update(metadata or {})
+        payload = json.dumps(meta, ensure_ascii=False).encode('utf-8')
+        # 记录区按 8 字节对齐，便于内存映射
+        pad = -(_PREFIX.size + len(payload)) % 8
+        payload += b' ' * pad
+
+        self._file = open(path, 'wb')
+        self._dispatch(self._write_bytes,
+                       _PREFIX.pack(MAGIC, FORMAT_VERSION, len(payload)) + payload)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def append_row(self, time_s: float, conductivity: float, proportion: float,
+                   motor1_speed: float, motor2_speed: float):
+        """追加一条记录"""
+        self._rows.append((time_s, conductivity, proportion, motor1_speed, motor2_speed))
+        self.flush_if_due()
+
+    def append_block(self, records: np.ndarray):
+        """追加一批记录（RAW_DTYPE 结构化数组或形状为 (n, 5) 的数组）"""
+        self._take_rows()
+        records = np.asarray(records)
+        if records.dtype.names is None:
+            records = np.ascontiguousarray(records, dtype=np.float64).reshape(-1, len(RAW_COLUMNS))
+            records = records.view(_RECORD_DTYPE).ravel()
+        self._chunks.append(records.astype(_RECORD_DTYPE, copy=False))
+        self.flush_if_due()
+
+    def flush_if_due(self):
+        """距上次刷新超过刷新间隔时写入文件"""
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """将缓冲区中的记录写入文件"""
+        self._last_flush = time.monotonic()
+        if self._closed:
+            return
+        self._take_rows()
+        if not self._chunks:
+            return
+        chunks, self._chunks = self._chunks, []
+        self.records_written += sum(len(chunk) for chunk in chunks)
+        self._dispatch(self._write_bytes, b''.join(chunk.tobytes() for chunk in chunks))
+
+    def close(self):
+        """写出剩余数据并关闭文件"""
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        self._dispatch(self._file.close)
+
+    def _take_rows(self):
+        """把逐条追加的记录合并为一个数据块（保持先后顺序）"""
+        if self._rows:
+            self._chunks.append(np.array(self._rows, dtype=_RECORD_DTYPE))
+            self._rows = []
+
+    def _dispatch(self, fn, *args):
+        """在后台写入线程（若有）或当前线程中执行文件操作"""
+        if self._io_writer is None:
+            fn(*args)
+        else:
+            self._io_writer.submit(self.path, lambda: fn(*args), notify=False)
+
+    def _write_bytes(self, data: bytes):
+        self._file.write(data)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_run(path: str, mmap: bool = True) -> Tuple[Dict[str, object], np.ndarray]:
+    """
+    读取二进制滴定记录
+
+    Args:
+        mmap: True 时以只读内存映射返回记录，否则读入内存
+    Returns:
+        (元数据, RAW_DTYPE 记录数组)
+    """
+    with open(path, 'rb') as f:
+        metadata, offset = _read_header(f)
+    count = (os.path.getsize(path) - offset) // _RECORD_DTYPE.itemsize
+    if count == 0:
+        return metadata, np.empty(0, dtype=RAW_DTYPE)
+    if mmap:
+        records = np.memmap(path, dtype=_RECORD_DTYPE, mode='r', offset=offset, shape=(count,))
+    else:
+        records = np.fromfile(path, dtype=_RECORD_DTYPE, count=count, offset=offset)
+    return metadata, records
+
+
+def export_run_text(path: str, txt_path: Optional[str] = None) -> str:
+    """
+    将二进制记录导出为原有的文本格式
+
+    Returns:
+        导出的文本文件路径（默认与记录文件同名，扩展名为 .txt）
+    """
+    if txt_path is None:
+        txt_path = os.path.splitext(path)[0] + '.txt'
+    _, records = read_run(path)
+    rows = np.column_stack([records[name] for name in RAW_COLUMNS])
+    np.savetxt(
+        txt_path, rows,
+        fmt=TEXT_FORMAT,
+        delimiter=',',
+        header=','.join(RAW_COLUMNS),
+        comments='',
+        encoding='utf-8'
+    )
+    return txt_path
+
+
+if __name__ == "__main__":
+    # 用法：python -m analysis_unit.run_file <记录文件> [<导出的文本文件>]
+    if len(sys.argv) < 2:
+        print("用法: python -m analysis_unit.run_file <run文件> [<txt文件>]")
+        sys.exit(1)
+    out = export_run_text(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
+    print(f"已导出: {out}")
@@ -0,0 +1,186 @@
+"""
+采样数据存储：预分配、按需倍增扩容的列式 NumPy 存储
+"""
+
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+class SampleStore:
+    """
+    列式采样存储
+
+    每一列是一个预分配的 float64 数组，容量不足时按倍数扩容（均摊 O(1) 追加）。
+    通过属性访问到的是长度为当前样本数的零拷贝视图，可直接交给绘图、保存和分析代码，
+    无需再把 Python 列表转换为数组。每列的最小/最大值在追加时同步更新，
+    查询坐标轴范围为 O(1)；同时记录每列是否单调不减，按范围选取时可直接二分查找。
+    """
+
+    COLUMNS = ('time', 'prop', 'cond', 's1', 's2')
+
+    def __init__(self, initial_capacity: int = 4096):
+        """
+        Args:
+            initial_capacity: 初始容量（样本数）
+        """
+        self._capacity = max(16, int(initial_capacity))
+        self._columns: Dict[str, np.ndarray] = {
+            name: np.empty(self._capacity, dtype=np.float64) for name in self.COLUMNS
+        }
+        self._size = 0
+        self.version = 0  # 每次数据变化时递增，供缓存判断是否失效
+        self._min = dict.fromkeys(self.COLUMNS, np.inf)
+        self._max = dict.fromkeys(self.COLUMNS, -np.inf)
+        self._monotonic = dict.fromkeys(self.COLUMNS, True)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    # ---------- 列视图 ----------
+    def column(self, name: str) -> np.ndarray:
+        """返回指定列当前数据的只读视图（零拷贝）"""
+        view = self._columns[name][:self._size]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def time(self) -> np.ndarray:
+        """采样时间（s）"""
+        return self.column('time')
+
+    @property
+    def prop(self) -> np.ndarray:
+        """电机1速度占比"""
+        return self.column('prop')
+
+    @property
+    def cond(self) -> np.ndarray:
+        """电导率"""
+        return self.column('cond')
+
+    @property
+    def s1(self) -> np.ndarray:
+        """电机1原始速度"""
+        return self.column('s1')
+
+    @property
+    def s2(self) -> np.ndarray:
+        """电机2原始速度"""
+        return self.column('s2')
+
+    def extrema(self, name: str) -> Optional[Tuple[float, float]]:
+        """返回指定列的 (最小值, 最大值)（忽略 NaN），无有效数据时返回 None"""
+        lo, hi = self._min[name], self._max[name]
+        if self._size == 0 or lo > hi:
+            return None
+        return lo, hi
+
+    def is_monotonic(self, name: str) -> bool:
+        """指定列是否单调不减"""
+        return self._monotonic[name]
+
+    # ---------- 范围选取 ----------
+    def select_range(self, name: str, lo: float, hi: float) -> Union[slice, np.ndarray]:
+        """
+        选取 name 列落在 [lo, hi] 内的行
+
+        Returns:
+            列单调不减时返回 slice（二分查找，O(log n)），否则返回布尔掩码
+        """
+        values = self.column(name)
+        if self._monotonic[name]:
+            i0 = int(np.searchsorted(values, lo, side='left'))
+            i1 = int(np.searchsorted(values, hi, side='right'))
+            return slice(i0, max(i0, i1))
+        return (values >= lo) & (values <= hi)
+
+    def select(self, name: str, lo: float, hi: float,
+               columns: Sequence[str] = COLUMNS) -> Dict[str, np.ndarray]:
+        """
+        按 name 列的范围 [lo, hi] 一次性选取多列数据
+
+        Returns:
+            {列名: 选中行的数组}，均为副本，后续追加或清空数据不影响结果
+        """
+        rows = self.select_range(name, lo, hi)
+        return {col: np.array(self.column(col)[rows]) for col in columns}
+
+    # ---------- 写入 ----------
+    def append(self, time: float, prop: float, cond: float, s1: float, s2: float):
+        """追加一个采样点"""
+        i = self._size
+        if i >= self._capacity:
+            self._reserve(i + 1)
+        cols = self._columns
+        for name, value in zip(self.COLUMNS, (time, prop, cond, s1, s2)):
+            if i and value < cols[name][i - 1]:
+                self._monotonic[name] = False
+            cols[name][i] = value
+            if value < self._min[name]:
+                self._min[name] = value
+            if value > self._max[name]:
+                self._max[name] = value
+        self._size = i + 1
+        self.version += 1
+
+    def extend(self, time, prop, cond, s1, s2):
+        """批量追加采样点（各参数为等长的一维数组）"""
+        values = {
+            'time': np.asarray(time, dtype=np.float64),
+            'prop': np.asarray(prop, dtype=np.float64),
+            'cond': np.asarray(cond, dtype=np.float64),
+            's1': np.asarray(s1, dtype=np.float64),
+            's2': np.asarray(s2, dtype=np.float64),
+        }
+        n = len(values['time'])
+        if any(len(v) != n for v in values.values()):
+            raise ValueError("各列长度必须一致")
+        if n == 0:
+            return
+
+        start = self._size
+        self._reserve(start + n)
+        for name, v in values.items():
+            if self._monotonic[name]:
+                if start and v[0] < self._columns[name][start - 1]:
+                    self._monotonic[name] = False
+                elif n > 1 and np.any(v[1:] < v[:-1]):
+                    self._monotonic[name] = False
+            self._columns[name][start:start + n] = v
+            lo, hi = float(v.min()), float(v.max())
+            if np.isnan(lo):
+                # 与 append 一致：极值忽略 NaN
+                valid = v[~np.isnan(v)]
+                if len(valid) == 0:
+                    continue
+                lo, hi = float(valid.min()), float(valid.max())
+            self._min[name] = min(self._min[name], lo)
+            self._max[name] = max(self._max[name], hi)
+        self._size = start + n
+        self.version += 1
+
+    def clear(self):
+        """清空数据（保留已分配的容量）"""
+        self._size = 0
+        self.version += 1
+        self._min = dict.fromkeys(self.COLUMNS, np.inf)
+        self._max = dict.fromkeys(self.COLUMNS, -np.inf)
+        self._monotonic = dict.fromkeys(self.COLUMNS, True)
+
+    def _reserve(self, needed: int):
+        """确保容量不小于 needed，不足时按倍数扩容"""
+        if needed <= self._capacity:
+            return
+        new_capacity = self._capacity
+        while new_capacity < needed:
+            new_capacity *= 2
+        for name, old in self._columns.items():
+            new = np.empty(new_capacity, dtype=np.float64)
+            new[:self._size] = old[:self._size]
+            self._columns[name] = new
+        self._capacity = new_capacity
@@ -0,0 +1,170 @@
+"""
+时间 -> 电机1占比 映射索引：一次构建、增量扩展，使用 NumPy 二分/插值查询
+"""
+
+from typing import Optional, Sequence, Union
+
+import numpy as np
+
+
+class TimeProportionIndex:
+    """
+    time -> proportion 线性插值索引
+
+    数据按时间追加时保持单调，查询直接在存储数组上做 np.interp（O(log n)）；
+    若追加的数据打破单调性，则在下一次查询时做一次稳定排序并缓存结果。
+    查询超出范围时取端点值，与原先逐段扫描的插值结果一致。
+
+    也可以用 from_store 直接建立在 SampleStore 的列视图上：不保存数据副本，
+    随存储的追加与清空自动更新。
+    """
+
+    def __init__(self, times: Optional[Sequence[float]] = None,
+                 props: Optional[Sequence[float]] = None,
+                 initial_capacity: int = 1024):
+        self._capacity = max(16, int(initial_capacity))
+        self._times = np.empty(self._capacity, dtype=np.float64)
+        self._props = np.empty(self._capacity, dtype=np.float64)
+        self._size = 0
+        self._monotonic = True
+        self._sorted = None  # 非单调时缓存的 (xp, fp)
+        self._sorted_version = None
+        self._version = 0
+        self._store = None
+        self._store_columns = None
+
+        if times is not None and props is not None:
+            self.extend(times, props)
+
+    @classmethod
+    def from_store(cls, store, time_column: str = 'time',
+                   prop_column: str = 'prop') -> 'TimeProportionIndex':
+        """
+        在 SampleStore 的 time/prop 列视图上建立索引（零拷贝）
+
+        索引随存储的追加与清空自动更新，不能再通过 append/extend/clear 写入。
+        """
+        index = cls(initial_capacity=0)
+        index._times = index._props = None
+        index._store = store
+        index._store_columns = (time_column, prop_column)
+        return index
+
+    def __len__(self) -> int:
+        if self._store is not None:
+            return len(self._store)
+        return self._size
+
+    @property
+    def version(self) -> int:
+        """每次数据变化时递增，供缓存判断是否失效"""
+        if self._store is not None:
+            return self._store.version
+        return self._version
+
+    @property
+    def is_monotonic(self) -> bool:
+        """时间是否单调不减"""
+        if self._store is not None:
+            return self._store.is_monotonic(self._store_columns[0])
+        return self._monotonic
+
+    def _check_writable(self):
+        if self._store is not None:
+            raise TypeError("建立在 SampleStore 上的索引随存储更新，不能直接写入")
+
+    # ---------- 写入 ----------
+    def append(self, t: float, prop: float):
+        """追加一个 (time, proportion) 对"""
+        self._check_writable()
+        i = self._size
+        if i >= self._capacity:
+            self._reserve(i + 1)
+        if i and t < self._times[i - 1]:
+            self._monotonic = False
+        self._times[i] = t
+        self._props[i] = prop
+        self._size = i + 1
+        self._sorted = None
+        self._version += 1
+
+    def extend(self, times: Sequence[float], props: Sequence[float]):
+        """批量追加 (time, proportion) 对"""
+        self._check_writable()
+        times = np.asarray(times, dtype=np.float64).ravel()
+        props = np.asarray(props, dtype=np.float64).ravel()
+        if len(times) != len(props):
+            raise ValueError("times 和 props 的长度必须一致")
+        n = len(times)
+        if n == 0:
+            return
+
+        start = self._size
+        self._reserve(start + n)
+        if self._monotonic:
+            if start and times[0] < self._times[start - 1]:
+                self._monotonic = False
+            elif n > 1 and np.any(np.diff(times) < 0):
+                self._monotonic = False
+        self._times[start:start + n] = times
+        self._props[start:start + n] = props
+        self._size = start + n
+        self._sorted = None
+        self._version += 1
+
+    def clear(self):
+        """清空索引"""
+        self._check_writable()
+        self._size = 0
+        self._monotonic = True
+        self._sorted = None
+        self._version += 1
+
+    # ---------- 查询 ----------
+    def arrays(self):
+        """返回按时间排序的 (xp, fp) 数组"""
+        if self._store is not None:
+            xp = self._store.column(self._store_columns[0])
+            fp = self._store.column(self._store_columns[1])
+        else:
+            xp = self._times[:self._size]
+            fp = self._props[:self._size]
+        if self.is_monotonic:
+            return xp, fp
+        version = self.version
+        if self._sorted is None or self._sorted_version != version:
+            order = np.argsort(xp, kind='stable')
+            self._sorted = (xp[order], fp[order])
+            self._sorted_version = version
+        return self._sorted
+
+    def interp(self, t: Union[float, Sequence[float], np.ndarray]) -> Union[float, np.ndarray, None]:
+        """
+        查询时间 t 对应的 proportion
+
+        Args:
+            t: 标量或数组
+        Returns:
+            标量输入返回 float，数组输入返回 ndarray；索引为空时返回 None
+        """
+        if len(self) == 0:
+            return None
+        xp, fp = self.arrays()
+        if np.ndim(t) == 0:
+            return float(np.interp(t, xp, fp))
+        return np.interp(np.asarray(t, dtype=np.float64), xp, fp)
+
+    __call__ = interp
+
+    def _reserve(self, needed: int):
+        if needed <= self._capacity:
+            return
+        new_capacity = self._capacity
+        while new_capacity < needed:
+            new_capacity *= 2
+        for name in ('_times', '_props'):
+            old = getattr(self, name)
+            new = np.empty(new_capacity, dtype=np.float64)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+        self._capacity = new_capacity
@@ -4,15 +4,25 @@ from dataclasses import dataclass
 from typing import Optional
 
 from PyQt5 import QtCore, QtWidgets
+import numpy as np
 import pyqtgraph as pg
 
 from ui import MainForm
 from analysis_unit import (
-    analyze_titration_from_curve, 
+    SPLIT_MINIMUM,
     TitrationSimulator, 
-    create_titration_plotter
+    create_titration_plotter,
+    SampleStore,
+    MinMaxDecimator,
+    minmax_decimate,
+    TimeProportionIndex,
+    OnlineEquivalenceEstimator,
+    RunWriter,
+    BackgroundWriter,
+    AnalysisJob,
+    load_raw
 )
-from serial_unit import SerialController
+from serial_unit import SerialController, READER_MODE_TIMER, TELEMETRY_TEXT
 
 
 @dataclass
@@ -25,14 +35,98 @@ class AppConfig:
     X_AXIS_LIMIT_ENABLED: bool = False
     DEFAULT_Y_RANGE: tuple = (0, 400)
     Y_AXIS_MARGIN_RATIO: float = 0.1
+    PLOT_MAX_FPS: int = 30  # 实时曲线最大刷新帧率
+    PLOT_SYMBOL_MIN_SPACING_PX: int = 4  # 可见点平均间距不小于该像素数时才绘制数据点符号
     
     # 定时器配置
     SIMULATION_INTERVAL_MS: int = 50
     
+    # 串口读取模式："timer"（GUI 线程定时轮询，默认）；可选 "thread"（后台线程读取）
+    # 或 "notifier"（数据到达时读取，仅 POSIX）
+    SERIAL_READER_MODE: str = READER_MODE_TIMER
+    # 是否以数据块（NumPy 结构化数组）批量接收串口数据（可选，默认逐点接收）
+    SERIAL_BATCH_SIGNALS: bool = False
+    # 下位机数据格式："text"（文本行）或 "binary"（二进制帧，需固件设置 BINARY_TELEMETRY 为 1）
+    SERIAL_TELEMETRY: str = TELEMETRY_TEXT
+    
+    # 分析配置：分割点选取方式，"minimum"（全局最小值）或 "rss"（残差平方和最优）
+    ANALYSIS_SPLIT_METHOD: str = SPLIT_MINIMUM
+    # 在线等当点估计：最近 N 次估计的交点波动不超过容差即视为收敛
+    ONLINE_ESTIMATE_WINDOW: int = 20
+    ONLINE_ESTIMATE_TOLERANCE: float = 0.002
+    # 在线估计收敛后是否自动停止滴定
+    AUTO_STOP_ON_CONVERGENCE: bool = False
+    
     # 文件配置
     DEFAULT_RESULTS_FOLDER: str = "results"
     FILE_EXTENSION: str = ".txt"
     FILENAME_TIME_FORMAT: str = "%Y%m%d_%H%M%S"
+    ANALYSIS_SAVED_TAG: str = "分析结果已保存"
+    # 滴定过程中自动写入二进制记录（raw 目录下的 .run 文件）
+    RUN_AUTOSAVE_ENABLED: bool = True
+    RUN_FILE_EXTENSION: str = ".run"
+    RUN_FLUSH_INTERVAL_S: float = 1.0
+
+
+class AnalysisReportTag:
+    """
+    分析报告的后台写入 tag：写入确认后才把路径记入所属的分析结果
+
+    报告在工作线程中提交写入，写入完成信号可能先于分析完成信号到达，
+    此时先记下写入结果，待结果关联（attach）后再应用。
+    """
+
+    def __init__(self, message: str, result: Optional[dict] = None, allow_fallback: bool = True):
+        self.message = message
+        self.result = result
+        self.allow_fallback = allow_fallback  # 写入失败时是否改为保存摘要
+        self.outcome = None  # 结果关联之前到达的写入结果 (是否成功, 路径)
+
+
+class PlotRenderScheduler(QtCore.QObject):
+    """绘图刷新调度器：新数据只标记为待刷新，按最大帧率合并重绘"""
+
+    def __init__(self, render_callback, max_fps: int = 30, parent=None):
+        """
+        Args:
+            render_callback: 实际执行重绘的函数
+            max_fps: 最大刷新帧率
+        """
+        super().__init__(parent)
+        self._render_callback = render_callback
+        self._min_interval = 1.0 / max(1, max_fps)
+        self._last_render = 0.0
+        self._dirty = False
+
+        # 统计：实际重绘次数与被合并（跳过）的刷新请求数
+        self.render_count = 0
+        self.skipped_count = 0
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._render)
+
+    def mark_dirty(self):
+        """标记需要重绘；已有待执行的重绘时直接合并"""
+        if self._dirty:
+            self.skipped_count += 1
+            return
+        self._dirty = True
+        elapsed = time.monotonic() - self._last_render
+        delay_ms = max(0, int((self._min_interval - elapsed) * 1000))
+        self._timer.start(delay_ms)
+
+    def flush(self):
+        """立即执行待处理的重绘"""
+        if self._dirty:
+            self._timer.stop()
+            self._render()
+
+    def _render(self):
+        self._dirty = False
+        self._last_render = time.monotonic()
+        self.render_count += 1
+        self._render_callback()
 
 
 class AppController(QtCore.QObject):
@@ -57,8 +151,15 @@ class AppController(QtCore.QObject):
         """初始化串口控制器"""
         self.serial_controller = None
         if SerialController:
-            self.serial_controller = SerialController(self)
+            self.serial_controller = SerialController(
+                self,
+                reader_mode=AppConfig.SERIAL_READER_MODE,
+                batch_signals=AppConfig.SERIAL_BATCH_SIGNALS,
+                telemetry=AppConfig.SERIAL_TELEMETRY,
+                simulation_loader=load_raw
+            )
             self.serial_controller.data_received.connect(self._on_serial_data)
+            self.serial_controller.data_block_received.connect(self._on_serial_block)
             self.serial_controller.connection_changed.connect(self._on_connection_changed)
             self.serial_controller.log_message.connect(self._append_arduino_log)
 
@@ -68,14 +169,32 @@ class AppController(QtCore.QObject):
             self.ui.titration_curve_plot
         )
         
-        self._data_x = []
-        self._data_y = []
-        self._raw_s1_list = []
-        self._raw_s2_list = []
+        # 采样数据：time / prop / cond / s1 / s2 五列
+        self._store = SampleStore()
+        # time -> proportion 插值索引，直接建立在 _store 的列视图上（不复制数据）
+        self._time_prop_index = TimeProportionIndex.from_store(self._store)
+        # 在线等当点估计（占比 -> 电导率），每个采样 O(1) 更新
+        self._online_estimator = OnlineEquivalenceEstimator(
+            window=AppConfig.ONLINE_ESTIMATE_WINDOW,
+            tolerance=AppConfig.ONLINE_ESTIMATE_TOLERANCE
+        )
+        self._online_converged_reported = False
+        self._titration_active = False
+        # 后台文件写入：所有文件输出经由同一个写入线程
+        self._io_writer = BackgroundWriter(self)
+        self._io_writer.write_finished.connect(self._on_write_finished)
+        self._io_writer.write_failed.connect(self._on_write_failed)
+        # 滴定过程中的二进制记录写入器
+        self._run_writer = None
+        # 后台分析任务（同一时间只保留最新的一个）
+        self._analysis_pool = QtCore.QThreadPool(self)
+        self._analysis_job = None
+        self._analysis_job_id = 0
+        self._analysis_report_tag = None  # 当前分析任务报告写入的 tag
+        QtWidgets.QApplication.instance().aboutToQuit.connect(self._on_about_to_quit)
         self._last_s1 = 0
         self._last_s2 = 0
         self._analysis_done = False
-        self._time_list = []
         self.start_time = time.time()
         
         self._curve = self.ui.titration_curve_plot.plot(
@@ -85,6 +204,13 @@ class AppController(QtCore.QObject):
             symbolBrush=pg.mkBrush(*AppConfig.PLOT_COLOR_RGB),
             symbolPen=pg.mkPen(*AppConfig.PLOT_COLOR_RGB)
         )
+        # 曲线降采样（按绘图区像素宽度保留每段的最小/最大值）
+        self._decimator = MinMaxDecimator()
+        self._curve_symbols_visible = True
+        self._in_render = False
+        self.ui.titration_curve_plot.getPlotItem().getViewBox().sigXRangeChanged.connect(
+            self._on_view_range_changed
+        )
         
         try:
             plot_item = self.ui.titration_curve_plot.getPlotItem()
@@ -108,11 +234,9 @@ class AppController(QtCore.QObject):
             
         try:
             top_axis = self.ui.titration_curve_plot.getPlotItem().getAxis('top')
-            if hasattr(top_axis, 'set_mapping'):
-                top_axis.set_mapping(
-                    lambda: list(self._time_list), 
-                    lambda: list(self._data_x)
-                )
+            if hasattr(top_axis, 'set_index'):
+                # 注入增量维护的插值索引（ui 不依赖 analysis_unit）
+                top_axis.set_index(self._time_prop_index)
         except Exception:
             pass
     
@@ -144,6 +268,15 @@ class AppController(QtCore.QObject):
         self._simulation_timer = QtCore.QTimer(self)
         self._simulation_timer.setInterval(AppConfig.SIMULATION_INTERVAL_MS)
         self._simulation_timer.timeout.connect(self._poll_simulation)
+
+        self._render_scheduler = PlotRenderScheduler(
+            self._render_plot, AppConfig.PLOT_MAX_FPS, self
+        )
+
+        # 定时刷新滴定记录：采样停顿时缓冲的数据也会按刷新间隔写入文件
+        self._run_flush_timer = QtCore.QTimer(self)
+        self._run_flush_timer.setInterval(int(AppConfig.RUN_FLUSH_INTERVAL_S * 1000))
+        self._run_flush_timer.timeout.connect(self._flush_run_writer)
     # endregion
 
     #region ---------- 基础工具 ----------
@@ -161,14 +294,11 @@ class AppController(QtCore.QObject):
         if getattr(AppConfig, 'X_AXIS_LIMIT_ENABLED', False):
             vb.setXRange(*AppConfig.X_AXIS_RANGE, padding=0)
         else:
-            x_source = None
-            if hasattr(self, '_time_list') and self._time_list:
-                x_source = self._time_list
-            elif hasattr(self, '_data_x') and self._data_x:
-                x_source = self._data_x
-
-            if x_source and len(x_source) > 0:
-                x_min, x_max = min(x_source), max(x_source)
+            # 使用追加时维护的极值，避免每次全量扫描
+            x_extrema = self._store.extrema('time')
+
+            if x_extrema is not None:
+                x_min, x_max = x_extrema
                 x_range = x_max - x_min
                 if x_range > 0:
                     x_margin = max(0.5, x_range * 0.05)
@@ -180,8 +310,9 @@ class AppController(QtCore.QObject):
             else:
                 vb.setXRange(*AppConfig.X_AXIS_RANGE, padding=0)
         
-        if self._data_y:
-            y_min, y_max = min(self._data_y), max(self._data_y)
+        y_extrema = self._store.extrema('cond')
+        if y_extrema is not None:
+            y_min, y_max = y_extrema
             y_range = y_max - y_min
             
             if y_range > 0:
@@ -227,6 +358,20 @@ class AppController(QtCore.QObject):
         filename = self._generate_filename()
         return os.path.join(save_folder, filename)
 
+    def _resolve_results_folder(self) -> str:
+        """解析结果根目录（相对路径相对于项目根目录）"""
+        user_folder = (
+            self.ui.save_folder_display.text().strip()
+            or AppConfig.DEFAULT_RESULTS_FOLDER
+        )
+        user_folder = os.path.expanduser(user_folder)
+        if not os.path.isabs(user_folder):
+            project_root = os.path.abspath(
+                os.path.join(os.path.dirname(__file__), '..')
+            )
+            return os.path.abspath(os.path.join(project_root, user_folder))
+        return os.path.abspath(user_folder)
+
     def _generate_filename(self, prefix: str = "titration") -> str:
         """生成保存文件名"""
         filename = self.ui.filename_input.text().strip()
@@ -294,7 +439,8 @@ class AppController(QtCore.QObject):
         data_type = data.get('type')
         
         if data_type == 'titration_stop':
-            pass
+            self._titration_active = False
+            self._close_run_writer()
         else:
             # 普通数据：包含电机速度和电导率
             motor1 = data.get('motor1', 0)
@@ -306,8 +452,49 @@ class AppController(QtCore.QObject):
             self.ui.stepper1_speed_label.setText(f"当前速度: {motor1}")
             self.ui.stepper2_speed_label.setText(f"当前速度: {motor2}")
 
+            if self.ui.max_speed_input is None:
+                return
+            timestamp = data.get('timestamp')
+            if timestamp is None:
+                timestamp = time.time()
+            time_elapsed = timestamp - self.start_time
+            prop = float(self._normalize_speed(motor1))
+
+            # 记录文件由数据通路写入，暂停绘图不影响记录
+            if self._run_writer is not None:
+                self._run_writer.append_row(
+                    time_elapsed, float(conductivity), prop, float(motor1), float(motor2)
+                )
             if not getattr(self, '_plot_paused', False):
-                self._append_measure(motor1, motor2, conductivity)
+                self._append_measure(
+                    time_elapsed, prop, float(motor1), float(motor2), float(conductivity)
+                )
+
+    def _on_serial_block(self, block):
+        """处理批量串口数据（SAMPLE_DTYPE 结构化数组）"""
+        if len(block) == 0:
+            return
+            
+        motor1 = int(block['motor1'][-1])
+        motor2 = int(block['motor2'][-1])
+        self._last_s1, self._last_s2 = motor1, motor2
+        
+        self.ui.stepper1_speed_label.setText(f"当前速度: {motor1}")
+        self.ui.stepper2_speed_label.setText(f"当前速度: {motor2}")
+
+        if self.ui.max_speed_input is None:
+            return
+        times = block['time'] - self.start_time
+        s1 = block['motor1'].astype(float)
+        props = self._normalize_speed(s1)
+
+        # 记录文件由数据通路写入，暂停绘图不影响记录
+        if self._run_writer is not None:
+            self._run_writer.append_block(np.column_stack(
+                (times, block['conductivity'], props, s1, block['motor2'])
+            ))
+        if not getattr(self, '_plot_paused', False):
+            self._append_block(times, props, s1, block)
 
     def _poll_simulation(self):
         """轮询模拟数据"""
@@ -328,30 +515,123 @@ class AppController(QtCore.QObject):
     # endregion
 
     #region ---------- 数据与绘图 ----------
-    def _append_measure(self, s1: float, s2: float, cond: float):
-        """添加测量数据点"""
-        if self.ui.max_speed_input is not None:
-            time_elapsed = time.time() - self.start_time
-            max_sp = float(self.ui.max_speed_input.value())
-            
-            # 归一化速度
-            x_plot = float(s1) / max_sp if max_sp > 0 else 0.0
-            
-            self._data_x.append(x_plot)
-            self._data_y.append(float(cond))
-            self._time_list.append(time_elapsed)
-            self._raw_s1_list.append(float(s1))
-            self._raw_s2_list.append(float(s2))
-            
-            self._update_plot()
-    
+    def _normalize_speed(self, s1):
+        """电机 1 速度归一化为占比（最大速度为 0 时返回 0）"""
+        max_sp = float(self.ui.max_speed_input.value())
+        return s1 / max_sp if max_sp > 0 else s1 * 0.0
+
+    def _append_measure(self, time_elapsed: float, prop: float,
+                        s1: float, s2: float, cond: float):
+        """添加一个测量数据点（time_elapsed 为相对滴定开始的时间）"""
+        self._store.append(time_elapsed, prop, cond, s1, s2)
+        self._online_estimator.update(prop, cond)
+        self._check_online_convergence()
+
+        self._update_plot()
+
+    def _append_block(self, times, props, s1, block):
+        """批量添加测量数据点，整块只刷新一次绘图"""
+        self._store.extend(
+            times,
+            props,
+            block['conductivity'],
+            s1,
+            block['motor2']
+        )
+        self._online_estimator.extend(props, block['conductivity'])
+        self._check_online_convergence()
+
+        self._update_plot()
+
     def _update_plot(self):
-        """更新绘图显示"""
+        """请求更新绘图显示（按最大帧率合并刷新）"""
+        self._render_scheduler.mark_dirty()
+
+    def _render_plot(self):
+        """更新坐标轴范围并重绘曲线"""
+        self._in_render = True
         try:
-            self._curve.setData(self._time_list, self._data_y)
-        except Exception:
-            self._curve.setData(list(range(len(self._data_y))), self._data_y)
-        self._apply_axes_limits()
+            self._apply_axes_limits()
+            self._refresh_curve()
+            self._update_online_estimate_label()
+        finally:
+            self._in_render = False
+
+    def _update_online_estimate_label(self):
+        """显示在线等当点估计（随绘图按帧率刷新）"""
+        if not hasattr(self.ui, 'online_estimate_label'):
+            return
+        estimate = self._online_estimator.estimate
+        if estimate is None:
+            self.ui.online_estimate_label.setText("在线估计: --")
+            return
+        state = "已收敛" if estimate['converged'] else f"波动 {estimate['spread']:.4f}"
+        naoh = estimate['NaOH_conc']
+        naoh_text = f"{naoh:.4f} mol/L" if naoh is not None else "--"
+        self.ui.online_estimate_label.setText(
+            f"在线估计: x={estimate['V_eq']:.4f}, c(NaOH)={naoh_text} ({state})"
+        )
+
+    def _check_online_convergence(self):
+        """在线估计首次收敛时提示，并按配置自动停止滴定"""
+        if not self._online_estimator.converged or self._online_converged_reported:
+            return
+        self._online_converged_reported = True
+        estimate = self._online_estimator.estimate
+        self._append_output(
+            f"在线估计已收敛：交点 x={estimate['V_eq']:.4f}"
+        )
+        if AppConfig.AUTO_STOP_ON_CONVERGENCE and self._titration_active:
+            self._auto_stop_titration()
+
+    def _auto_stop_titration(self):
+        """在线估计收敛后停止滴定"""
+        self._titration_active = False
+        self._close_run_writer()
+        current_port = self.ui.port_combo.currentText().strip()
+        if not self.serial_controller:
+            self._data_generator = None
+        elif current_port == "模拟数据":
+            self.serial_controller.stop_simulation()
+        else:
+            self.serial_controller.emergency_stop()
+        self._append_output("等当点估计已稳定，自动停止滴定")
+
+    def _on_view_range_changed(self, *args):
+        """用户缩放/平移后按新的可见范围重新选择细节层次"""
+        if not self._in_render:
+            self._refresh_curve()
+
+    def _refresh_curve(self):
+        """
+        按可见范围设置曲线数据：
+        放大到点足够稀疏时绘制原始数据并显示符号；视图覆盖大部分数据时使用增量降采样结果；
+        其余情况对可见区间即时降采样。时间列在一次滴定中单调递增，可直接二分查找可见区间。
+        """
+        t, y = self._store.time, self._store.cond
+        n = len(t)
+        vb = self.ui.titration_curve_plot.getPlotItem().getViewBox()
+        width_px = max(1, int(vb.width()))
+        self._decimator.set_target(width_px, y)
+        self._decimator.update(y)
+
+        x_lo, x_hi = vb.viewRange()[0]
+        i0 = max(0, int(np.searchsorted(t, x_lo, side='left')) - 1)
+        i1 = min(n, int(np.searchsorted(t, x_hi, side='right')) + 1)
+        visible = max(0, i1 - i0)
+
+        show_symbols = visible * AppConfig.PLOT_SYMBOL_MIN_SPACING_PX <= width_px
+        if show_symbols:
+            xs, ys = t[i0:i1], y[i0:i1]
+        elif visible * 2 >= n:
+            xs, ys = self._decimator.points(t, y)
+        else:
+            xs, ys = minmax_decimate(t[i0:i1], y[i0:i1], width_px)
+
+        if show_symbols != self._curve_symbols_visible:
+            self._curve.setSymbol('o' if show_symbols else None)
+            self._curve_symbols_visible = show_symbols
+        self._curve.setData(xs, ys)
     
     def _on_pause_plot(self):
         """处理停止绘图按钮点击"""
@@ -360,52 +640,135 @@ class AppController(QtCore.QObject):
 
     def _save_data(self):
         """保存原始数据"""
-        user_folder = self.ui.save_folder_display.text().strip()
-        if not user_folder:
-            user_folder = AppConfig.DEFAULT_RESULTS_FOLDER
-
-        user_folder = os.path.expanduser(user_folder)
-        if not os.path.isabs(user_folder):
-            project_root = os.path.abspath(
-                os.path.join(os.path.dirname(__file__), '..')
-            )
-            save_folder = os.path.abspath(
-                os.path.join(project_root, user_folder)
-            )
-        else:
-            save_folder = os.path.abspath(user_folder)
-
-        raw_dir = os.path.join(save_folder, "raw")
+        raw_dir = os.path.join(self._resolve_results_folder(), "raw")
         os.makedirs(raw_dir, exist_ok=True)
 
         filename = self._generate_filename("raw")
         path = os.path.join(raw_dir, filename)
 
-        n = min(
-            len(self._time_list),
-            len(self._data_y),
-            len(self._data_x),
-            len(self._raw_s1_list),
-            len(self._raw_s2_list),
+        # column_stack 生成快照副本，后台写入期间数据继续追加不受影响
+        store = self._store
+        rows = np.column_stack(
+            (store.time, store.cond, store.prop, store.s1, store.s2)
         )
+        self._io_writer.submit_savetxt(
+            path, rows,
+            tag="已保存原始数据",
+            fmt=['%.4f', '%.6f', '%.6f', '%.4f', '%.4f'],
+            delimiter=',',
+            header='time_s,conductivity,motor1_proportion,motor1_speed,motor2_speed',
+            comments='',
+            encoding='utf-8'
+        )
+        self._append_output(f"正在保存原始数据: {path}")
 
-        with open(path, 'w', encoding='utf-8') as f:
-            f.write(
-                'time_s,conductivity,motor1_proportion,motor1_speed,motor2_speed\n'
+    def _open_run_writer(self, max_speed: int, increment_ms: int):
+        """开始滴定时创建二进制记录文件，数据随采样追加写入"""
+        self._close_run_writer()
+        if not AppConfig.RUN_AUTOSAVE_ENABLED:
+            return
+        try:
+            raw_dir = os.path.join(self._resolve_results_folder(), "raw")
+            os.makedirs(raw_dir, exist_ok=True)
+            filename = os.path.splitext(self._generate_filename("raw"))[0]
+            path = os.path.join(raw_dir, filename + AppConfig.RUN_FILE_EXTENSION)
+            self._run_writer = RunWriter(
+                path,
+                metadata={
+                    'start_time': self.start_time,
+                    'max_speed': max_speed,
+                    'increment_ms': increment_ms,
+                    'hcl_conc': float(self.ui.c_hcl_input.value()),
+                    'port': self.ui.port_combo.currentText().strip(),
+                },
+                flush_interval=AppConfig.RUN_FLUSH_INTERVAL_S,
+                io_writer=self._io_writer
             )
-            for i in range(n):
-                t = self._time_list[i]
-                cond = self._data_y[i]
-                prop = self._data_x[i]
-                s1 = self._raw_s1_list[i]
-                s2 = self._raw_s2_list[i]
-                f.write(f"{t:.4f},{cond:.6f},{prop:.6f},{s1:.4f},{s2:.4f}\n")
+            self._run_flush_timer.start()
+            self._append_output(f"滴定记录写入: {path}")
+        except Exception as e:
+            self._run_writer = None
+            self._append_output(f"无法创建滴定记录文件: {e}")
 
-        self._append_output(f"已保存原始数据: {path}")
+    def _close_run_writer(self):
+        """写出剩余数据并关闭二进制记录文件"""
+        if self._run_writer is None:
+            return
+        self._run_flush_timer.stop()
+        writer, self._run_writer = self._run_writer, None
+        try:
+            writer.close()
+        except Exception as e:
+            self._append_output(f"关闭滴定记录文件失败: {e}")
+
+    def _flush_run_writer(self):
+        """定时器回调：写出缓冲的记录（采样停顿时 append 不会触发刷新）"""
+        if self._run_writer is None:
+            return
+        try:
+            self._run_writer.flush()
+        except Exception as e:
+            self._append_output(f"写入滴定记录失败: {e}")
+
+    def _on_write_finished(self, path: str, tag):
+        """后台写入完成（tag 为提示文字或 AnalysisReportTag）"""
+        if isinstance(tag, AnalysisReportTag):
+            self._append_output(f"{tag.message}: {path}")
+            self._on_report_written(tag, True, path)
+        elif isinstance(tag, str):
+            self._append_output(f"{tag}: {path}")
+
+    def _on_write_failed(self, path: str, error: str, tag):
+        """后台写入失败；分析报告写入失败时改为保存摘要文本"""
+        self._append_output(f"文件写入失败 {path}: {error}")
+        if isinstance(tag, AnalysisReportTag):
+            self._on_report_written(tag, False, path)
+
+    def _on_report_written(self, tag: AnalysisReportTag, ok: bool, path: str):
+        """分析报告写入结束：结果尚未关联时先记下，否则应用到该结果"""
+        if tag.result is None:
+            tag.outcome = (ok, path)
+        else:
+            self._apply_report_outcome(tag, ok, path)
+
+    def _apply_report_outcome(self, tag: AnalysisReportTag, ok: bool, path: str):
+        """写入成功时记录保存路径；失败时为同一结果回退保存摘要"""
+        if ok:
+            tag.result['_saved_txt_path'] = path
+        elif tag.allow_fallback:
+            self._save_analysis_fallback(os.path.dirname(path), tag.result)
+
+    def _attach_report_result(self, tag: AnalysisReportTag, result_dict: dict):
+        """关联分析结果，并应用此前已到达的写入结果"""
+        tag.result = result_dict
+        if tag.outcome is not None:
+            self._apply_report_outcome(tag, *tag.outcome)
+            tag.outcome = None
+
+    def _save_analysis_fallback(self, processed_dir: str, result_dict: dict):
+        """回退保存：只写出分析摘要（写入确认后记入 result_dict）"""
+        summary_text = self.titration_plotter.get_analysis_summary_text(result_dict)
+        fallback_name = (
+            f"analysis_fallback_"
+            f"{time.strftime(AppConfig.FILENAME_TIME_FORMAT)}"
+            f"{AppConfig.FILE_EXTENSION}"
+        )
+        fallback_path = os.path.join(processed_dir, fallback_name)
+        tag = AnalysisReportTag(
+            "分析结果（回退）已保存", result=result_dict, allow_fallback=False
+        )
+        self._io_writer.submit_text(fallback_path, summary_text, tag=tag)
+
+    def _on_about_to_quit(self):
+        """退出前写出记录文件，并等待后台写入完成"""
+        self._cancel_analysis_job()
+        self._analysis_pool.waitForDone()
+        self._close_run_writer()
+        self._io_writer.shutdown(wait=True)
 
     def _perform_analysis(self):
         """点击分析按钮：激活选择模式，等待用户选择两个位置"""
-        if not self._data_x or not self._data_y:
+        if len(self._store) == 0:
             self._append_output("没有数据可供分析")
             return
             
@@ -435,140 +798,102 @@ class AppController(QtCore.QObject):
         self._append_output("开始分析选定范围的数据...")
 
         # 将所选的 time 坐标映射为 proportion（线性插值）
-        def time_to_prop(t):
-            if not self._time_list or not self._data_x:
-                return None
-            pairs = sorted(
-                zip(self._time_list, self._data_x), 
-                key=lambda p: p[0]
-            )
-            xp = [p[0] for p in pairs]
-            fp = [p[1] for p in pairs]
-            if t <= xp[0]:
-                return fp[0]
-            if t >= xp[-1]:
-                return fp[-1]
-            for i in range(len(xp)-1):
-                if xp[i] <= t <= xp[i+1]:
-                    x0, x1 = xp[i], xp[i+1]
-                    y0, y1 = fp[i], fp[i+1]
-                    if x1 == x0:
-                        return y0
-                    tt = (t - x0) / (x1 - x0)
-                    return y0 + tt * (y1 - y0)
-            return fp[-1]
-
         t1, t2 = self._selected_times
-        p1 = time_to_prop(t1)
-        p2 = time_to_prop(t2)
+        p1 = self._time_prop_index.interp(t1)
+        p2 = self._time_prop_index.interp(t2)
         if p1 is None or p2 is None:
             self._append_output(
                 "选择无效：当前无数据用于映射 time->proportion"
             )
             return
 
-        pmin, pmax = min(p1, p2), max(p1, p2)
-        filtered_x, filtered_y = [], []
-        for prop, y in zip(self._data_x, self._data_y):
-            if pmin <= prop <= pmax:
-                filtered_x.append(prop)
-                filtered_y.append(y)
-        
-        if len(filtered_x) < 8:
-            self._append_output(
-                f"所选范围数据点太少 ({len(filtered_x)})，需要至少 8 个点"
-            )
-            return
-
         # 准备保存路径
-        user_folder = (
-            self.ui.save_folder_display.text().strip() 
-            or AppConfig.DEFAULT_RESULTS_FOLDER
-        )
-        user_folder = os.path.expanduser(user_folder)
-        if not os.path.isabs(user_folder):
-            project_root = os.path.abspath(
-                os.path.join(os.path.dirname(__file__), '..')
-            )
-            user_folder = os.path.abspath(
-                os.path.join(project_root, user_folder)
-            )
-        processed_dir = os.path.join(user_folder, 'processed')
+        processed_dir = os.path.join(self._resolve_results_folder(), 'processed')
         try:
             os.makedirs(processed_dir, exist_ok=True)
         except Exception:
             self._append_output(f"无法创建 processed 目录: {processed_dir}")
             return
 
-        filename = self._generate_filename()
-        # 只传递目录路径，让 analyze_titration_from_curve 自己生成文件名
-        
+        # 重新选择范围时取消仍在运行的上一次分析
+        self._cancel_analysis_job()
+
+        # 一次性选取范围内的 time/prop/cond（占比单调时为二分查找），得到的副本即为
+        # 分析任务的数据快照，工作线程运行期间采样数据可以继续追加或被清空
+        pmin, pmax = min(p1, p2), max(p1, p2)
+        selected = self._store.select('prop', pmin, pmax, ('time', 'prop', 'cond'))
+        self._analysis_job_id += 1
+        self._analysis_report_tag = AnalysisReportTag(AppConfig.ANALYSIS_SAVED_TAG)
+        job = AnalysisJob(
+            self._analysis_job_id,
+            selected['time'],
+            selected['prop'],
+            selected['cond'],
+            (pmin, pmax),
+            hcl_conc=self.ui.c_hcl_input.value(),
+            split_method=AppConfig.ANALYSIS_SPLIT_METHOD,
+            save_dir=processed_dir,
+            # 只传递目录路径和文件名，由 AnalysisJob 在工作线程中生成完整路径并提交写入
+            filename=self._generate_filename(),
+            writer=self._io_writer,
+            writer_tag=self._analysis_report_tag
+        )
+        job.signals.finished.connect(self._on_analysis_finished)
+        job.signals.failed.connect(self._on_analysis_failed)
+        self._analysis_job = job
+        self._analysis_pool.start(job)
+
+    def _cancel_analysis_job(self):
+        """取消正在运行的分析任务"""
+        if self._analysis_job is not None:
+            self._analysis_job.cancel()
+            self._analysis_job = None
+
+    def _on_analysis_finished(self, job_result):
+        """分析完成（GUI 线程）：记录结果并绘制"""
+        if job_result.job_id != self._analysis_job_id:
+            return  # 已被新的分析取代
+        self._analysis_job = None
+
         try:
-            result_dict = analyze_titration_from_curve(
-                x=filtered_x,
-                y=filtered_y,
-                hcl_conc=self.ui.c_hcl_input.value(),
-                save_txt_path=processed_dir,
-                filename=filename
-            )
-            
-            # 记录并显示分析结果
+            # 记录并显示分析结果（复制为普通字典，写入确认后补充保存路径）
+            result_dict = dict(job_result.result)
             self._last_analysis_result = result_dict
             self._update_analysis_results(result_dict)
-            
-            # 检查保存路径
-            saved_path = (
-                result_dict.get('_saved_txt_path') 
-                if isinstance(result_dict, dict) 
-                else None
-            )
-            if saved_path and os.path.exists(saved_path):
-                self._append_output(f"分析结果已保存: {saved_path}")
-            else:
-                # 回退保存
-                try:
-                    summary_text = self.titration_plotter.get_analysis_summary_text(
-                        result_dict
-                    )
-                    fallback_name = (
-                        f"analysis_fallback_"
-                        f"{time.strftime(AppConfig.FILENAME_TIME_FORMAT)}"
-                        f"{AppConfig.FILE_EXTENSION}"
-                    )
-                    fallback_path = os.path.join(processed_dir, fallback_name)
-                    with open(fallback_path, 'w', encoding='utf-8') as f:
-                        f.write(summary_text)
-                    self._append_output(
-                        f"分析结果（回退）已保存: {fallback_path}"
-                    )
-                    result_dict['_saved_txt_path'] = fallback_path
-                except Exception as e:
-                    self._append_output(f"分析结果保存失败: {e}")
-            
-            # 绘制分析结果
-            filtered_times = []
-            for prop, y, t in zip(self._data_x, self._data_y, self._time_list):
-                if pmin <= prop <= pmax:
-                    filtered_times.append(t)
-            
-            if len(filtered_times) == len(filtered_x):
-                self.titration_plotter.plot_analysis_results(
-                    result_dict, filtered_y, filtered_times, filtered_x
-                )
+
+            # 报告由后台线程写出，完成/失败通过信号通知；未能提交时直接回退保存
+            if result_dict.get('_pending_txt_path'):
+                self._attach_report_result(self._analysis_report_tag, result_dict)
             else:
-                self.titration_plotter.plot_analysis_results(
-                    result_dict, filtered_y, self._time_list, self._data_x
+                processed_dir = os.path.join(
+                    self._resolve_results_folder(), 'processed'
                 )
+                self._save_analysis_fallback(processed_dir, result_dict)
+
+            # 绘制分析结果
+            self.titration_plotter.plot_analysis_results(
+                result_dict,
+                job_result.y,
+                job_result.times,
+                job_result.x
+            )
 
             # 显示分析摘要
             summary_text = self.titration_plotter.get_analysis_summary_text(
                 result_dict
             )
             self._append_output(summary_text)
-            
+
         except Exception as e:
             self._append_output(f"分析失败: {e}")
 
+    def _on_analysis_failed(self, job_id: int, error: str):
+        """分析任务失败"""
+        if job_id != self._analysis_job_id:
+            return
+        self._analysis_job = None
+        self._append_output(f"分析失败: {error}")
+
     def _save_analysis_result(self):
         """保存最近一次分析结果"""
         if (not hasattr(self, '_last_analysis_result') 
@@ -580,19 +905,7 @@ class AppController(QtCore.QObject):
                 self._append_output("无法生成分析结果，取消保存。")
                 return
 
-        save_folder = (
-            self.ui.save_folder_display.text().strip() 
-            or AppConfig.DEFAULT_RESULTS_FOLDER
-        )
-        save_folder = os.path.expanduser(save_folder)
-        if not os.path.isabs(save_folder):
-            project_root = os.path.abspath(
-                os.path.join(os.path.dirname(__file__), '..')
-            )
-            save_folder = os.path.abspath(
-                os.path.join(project_root, save_folder)
-            )
-        processed_dir = os.path.join(save_folder, 'processed')
+        processed_dir = os.path.join(self._resolve_results_folder(), 'processed')
         os.makedirs(processed_dir, exist_ok=True)
         filename = self._generate_filename("analysis")
         path = os.path.join(processed_dir, filename)
@@ -601,19 +914,17 @@ class AppController(QtCore.QObject):
             summary_text = self.titration_plotter.get_analysis_summary_text(
                 self._last_analysis_result
             )
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write(summary_text)
-            self._append_output(f"分析结果已保存: {path}")
+            self._io_writer.submit_text(path, summary_text, tag="分析摘要已保存")
         except Exception as e:
             self._append_output(f"保存分析结果失败: {e}")
 
     def _clear_plot(self):
         """清空绘图和相关显示"""
-        self._data_x.clear()
-        self._data_y.clear()
-        self._time_list.clear()
-        self._raw_s1_list.clear()
-        self._raw_s2_list.clear()
+        self._cancel_analysis_job()
+        self._store.clear()
+        self._decimator.reset()
+        self._online_estimator.reset()
+        self._online_converged_reported = False
         self._analysis_done = False
         self._update_plot()
         self.titration_plotter.clear_fit_items()
@@ -770,9 +1081,11 @@ class AppController(QtCore.QObject):
         self.titration_plotter.clear_fit_items()
         self._append_output("旧拟合已清除")
 
-        # 清除时间
-        self._time_list = []
+        # 重置计时起点
         self.start_time = time.time()
+        self._online_estimator.hcl_conc = float(self.ui.c_hcl_input.value())
+        self._titration_active = True
+        self._open_run_writer(max_sp, inc_ms)
             
         self._append_output("开始滴定")
         
@@ -2,8 +2,19 @@
 串口控制单元：包含串口通信、电机控制、数据解析等功能
 """
 
-from .serial_controller import SerialController
+from .serial_controller import (
+    SerialController, READER_MODE_TIMER, READER_MODE_THREAD, READER_MODE_NOTIFIER,
+    TELEMETRY_TEXT, TELEMETRY_BINARY
+)
 from .command_parser import CommandParser
+from .line_framer import LineFramer
 from .motor_commands import MotorCommands
+from .sample_buffer import SampleRingBuffer, SAMPLE_DTYPE
+from .telemetry import TelemetryEncoder, TelemetryDecoder
 
-__all__ = ['SerialController', 'CommandParser', 'MotorCommands']
\ No newline at end of file
+__all__ = [
+    'SerialController', 'CommandParser', 'MotorCommands', 'LineFramer',
+    'SampleRingBuffer', 'SAMPLE_DTYPE',
+    'READER_MODE_TIMER', 'READER_MODE_THREAD', 'READER_MODE_NOTIFIER',
+    'TELEMETRY_TEXT', 'TELEMETRY_BINARY', 'TelemetryEncoder', 'TelemetryDecoder',
+]
\ No newline at end of file
@@ -3,14 +3,42 @@
 """
 
 import re
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
+
+# 数据流格式（由 CommandParser 自动识别并锁定）
+DIALECT_MAIN = 'main'      # m1=<speed>, m2=<speed>, c=<ec_value>（固件输出格式）
+DIALECT_LEGACY = 'legacy'  # <motor1>,<motor2>,<conductivity>
+
+# 锁定格式后使用的严格匹配：能匹配的行，其解析结果与完整识别流程完全一致
+_MAIN_STRICT = re.compile(r'm1=([+-]?\d+)(?:\.\d*)?, m2=([+-]?\d+)(?:\.\d*)?, c=([+-]?\d*\.?\d+)')
+
 
 class CommandParser:
-    """串口数据解析器"""
+    """
+    串口数据解析器
+
+    数据流的格式在会话中通常不变：完整识别流程首次解析出数据行后即锁定该格式，
+    之后的行先用对应的专用解码器解析，不匹配时（如 "OK f"、滴定开始/结束等消息行，
+    或格式发生变化）才回退到完整识别流程，并按其结果重新锁定。
+    """
     
-    def __init__(self):
+    def __init__(self, fast_path: bool = True):
+        """
+        Args:
+            fast_path: 是否启用格式锁定的快速路径（False 时每行都走完整识别流程）
+        """
         # 主要格式的正则表达式
         self.main_pattern = re.compile(r'm1=([+-]?\d+).*?m2=([+-]?\d+).*?c=([+-]?\d*\.?\d+)')
+        self.fast_path = fast_path
+        self.dialect = None  # 当前锁定的格式
+        self._decoder = None
+        self.fast_misses = 0  # 快速路径未命中、回退到完整识别的行数
+        
+    def reset(self):
+        """解除格式锁定（如切换设备时）"""
+        self.dialect = None
+        self._decoder = None
+        self.fast_misses = 0
         
     def parse_arduino_data(self, line: str) -> Optional[Dict[str, Any]]:
         """
@@ -23,7 +51,59 @@ class CommandParser:
         line = line.strip()
         if not line:
             return None
-            
+        
+        decoder = self._decoder
+        if decoder is not None:
+            result = decoder(line)
+            if result is not None:
+                return result
+            self.fast_misses += 1
+        
+        result = self._parse_full(line)
+        if self.fast_path:
+            self._lock_dialect(result)
+        return result
+    
+    def _lock_dialect(self, result: Optional[Dict[str, Any]]):
+        """根据完整识别的结果锁定数据流格式（非数据行不改变当前锁定）"""
+        data_type = result.get('type') if result else None
+        if data_type == 'data':
+            self.dialect, self._decoder = DIALECT_MAIN, self._decode_main
+        elif data_type == 'legacy_data':
+            self.dialect, self._decoder = DIALECT_LEGACY, self._decode_legacy
+    
+    @staticmethod
+    def _decode_main(line: str, _match=_MAIN_STRICT.fullmatch) -> Optional[Dict[str, Any]]:
+        """主格式专用解码器，不匹配时返回 None"""
+        match = _match(line)
+        if match is None:
+            return None
+        motor1, motor2, conductivity = match.groups()
+        return {
+            'type': 'data',
+            'motor1': int(motor1),
+            'motor2': int(motor2),
+            'conductivity': float(conductivity)
+        }
+    
+    @staticmethod
+    def _decode_legacy(line: str) -> Optional[Dict[str, Any]]:
+        """旧格式（motor1,motor2,conductivity）专用解码器，不匹配时返回 None"""
+        parts = line.split(',')
+        if len(parts) != 3:
+            return None
+        try:
+            return {
+                'type': 'legacy_data',
+                'motor1': int(parts[0]),
+                'motor2': int(parts[1]),
+                'conductivity': float(parts[2])
+            }
+        except ValueError:
+            return None
+    
+    def _parse_full(self, line: str) -> Dict[str, Any]:
+        """完整识别流程（line 已去除首尾空白且非空）"""
         # 检查滴定结束信号
         if 'titration stop' in line.lower():
             return {'type': 'stop'}
@@ -93,4 +173,44 @@ class CommandParser:
             except ValueError:
                 pass
                 
-        return None
\ No newline at end of file
+        return None
+
+def sample_from_parsed(parsed_data: Dict[str, Any], last_speeds: Tuple[int, int]
+                       ) -> Tuple[Optional[Tuple[int, int, float]], Tuple[int, int]]:
+    """
+    将解析结果转换为采样点（纯函数，不修改任何共享状态）
+
+    Args:
+        parsed_data: parse_arduino_data 的解析结果
+        last_speeds: 上次记录的 (motor1, motor2) 速度，仅电导率的数据沿用该速度
+    Returns:
+        (sample, last_speeds)：sample 为 (motor1, motor2, conductivity)，不含电导率的数据为 None；
+        last_speeds 为更新后的电机速度
+    """
+    data_type = parsed_data.get('type')
+
+    if data_type in ('data', 'legacy_data'):
+        # 完整数据：包含电机速度和电导率
+        speeds = (parsed_data['motor1'], parsed_data['motor2'])
+        return speeds + (parsed_data['conductivity'],), speeds
+
+    if data_type == 'conductivity_only':
+        # 仅电导率数据，使用上次的电机速度
+        return tuple(last_speeds) + (parsed_data['conductivity'],), last_speeds
+
+    if data_type == 'motors_only':
+        # 仅电机速度数据（如果同时包含电导率，则为完整数据）
+        speeds = (parsed_data['motor1'], parsed_data['motor2'])
+        if 'conductivity' in parsed_data:
+            return speeds + (parsed_data['conductivity'],), speeds
+        return None, speeds
+
+    return None, last_speeds
+
+
+def format_sample_log(data_type: str, sample: Tuple[int, int, float]) -> str:
+    """采样点的日志文本"""
+    motor1, motor2, conductivity = sample
+    if data_type == 'data':
+        return f"m1={motor1}, m2={motor2}, EC={conductivity:.3f}"
+    return f"COND: {conductivity:.3f}"
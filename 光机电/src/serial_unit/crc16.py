@@ -0,0 +1,41 @@
+"""
+CRC-16/Modbus 校验（多项式 0xA001 反射，初值 0xFFFF），算法与 01/CRC.py 的 crc16 相同，
+这里预先计算 256 项查找表，每个字节只需一次查表。
+CRC16_TABLE 与 01/CRC.py 的 CRC16_TABLE 一致（两边独立运行，由 tests/test_crc16.py 核对）
+"""
+
+from typing import Union
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+
+def _make_table():
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            if crc & 0x0001:
+                crc = (crc >> 1) ^ 0xA001
+            else:
+                crc >>= 1
+        table.append(crc)
+    return tuple(table)
+
+
+CRC16_TABLE = _make_table()
+
+
+def crc16_modbus(data: BytesLike, crc: int = 0xFFFF) -> int:
+    """
+    计算 CRC-16/Modbus
+
+    Args:
+        data: 输入字节
+        crc: 初值；传入上一段的结果可分段计算
+    Returns:
+        16 位校验值（发送时低字节在前）
+    """
+    table = CRC16_TABLE
+    for byte in data:
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+    return crc
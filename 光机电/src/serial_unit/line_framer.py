@@ -0,0 +1,109 @@
+"""
+行分帧模块：将串口字节流增量地切分为完整的文本行
+"""
+
+from typing import List
+
+
+class LineFramer:
+    """
+    字节级增量行分帧器
+
+    每次读取到的字节可能在任意位置截断一行；未以换行符结束的尾部会保留到下一次
+    feed，只返回完整的行。同时统计分帧错误，便于排查高速数据下的丢行问题。
+    """
+
+    def __init__(self, max_line_length: int = 256, encoding: str = 'utf-8'):
+        """
+        Args:
+            max_line_length: 单行最大字节数，超出时丢弃该行并计为溢出错误
+            encoding: 行文本编码
+        """
+        self.max_line_length = max_line_length
+        self.encoding = encoding
+        self._tail = b''
+        self._discarding = False  # 正在丢弃超长行的剩余部分，直到下一个换行符
+
+        # 统计计数
+        self.lines_framed = 0      # 已输出的完整行数
+        self.overflow_errors = 0   # 超长行（缺少换行符）被丢弃的次数
+        self.decode_errors = 0     # 含非法字节的行数（非法字节被忽略）
+
+    def feed(self, data: bytes) -> List[str]:
+        """
+        输入新读取的字节，返回其中所有完整的行（已去除首尾空白，跳过空行）
+        """
+        if not data:
+            return []
+
+        if self._discarding:
+            first_newline = data.find(b'\n')
+            if first_newline < 0:
+                return []
+            self._discarding = False
+            data = data[first_newline + 1:]
+
+        buffer = self._tail + data if self._tail else data
+        last_newline = buffer.rfind(b'\n')
+        if last_newline < 0:
+            self._tail = self._check_tail(buffer)
+            return []
+
+        self._tail = self._check_tail(buffer[last_newline + 1:])
+
+        lines = []
+        for raw in buffer[:last_newline].split(b'\n'):
+            if len(raw) > self.max_line_length:
+                self.overflow_errors += 1
+                continue
+            line = self._decode(raw).strip()
+            if line:
+                lines.append(line)
+        self.lines_framed += len(lines)
+        return lines
+
+    def flush(self) -> List[str]:
+        """取出缓冲中未以换行结束的尾部（例如断开连接时）"""
+        tail, self._tail = self._tail, b''
+        line = self._decode(tail).strip()
+        if not line:
+            return []
+        self.lines_framed += 1
+        return [line]
+
+    def reset(self):
+        """清空尾部缓冲与统计计数"""
+        self._tail = b''
+        self._discarding = False
+        self.lines_framed = 0
+        self.overflow_errors = 0
+        self.decode_errors = 0
+
+    @property
+    def pending_bytes(self) -> int:
+        """当前缓存的未完成字节数"""
+        return len(self._tail)
+
+    def stats(self) -> dict:
+        """返回分帧统计信息"""
+        return {
+            'lines_framed': self.lines_framed,
+            'overflow_errors': self.overflow_errors,
+            'decode_errors': self.decode_errors,
+            'pending_bytes': self.pending_bytes,
+        }
+
+    def _check_tail(self, tail: bytes) -> bytes:
+        """尾部超过最大行长仍无换行：视为噪声丢弃"""
+        if len(tail) > self.max_line_length:
+            self.overflow_errors += 1
+            self._discarding = True
+            return b''
+        return tail
+
+    def _decode(self, raw: bytes) -> str:
+        try:
+            return raw.decode(self.encoding)
+        except UnicodeDecodeError:
+            self.decode_errors += 1
+            return raw.decode(self.encoding, errors='ignore')
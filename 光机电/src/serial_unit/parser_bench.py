@@ -0,0 +1,93 @@
+"""
+CommandParser 吞吐量基准：在合成的串口行语料上比较完整识别流程与格式锁定快速路径
+（语料由保存的原始数据按固件输出格式生成，不是串口实录，见 corpus/arduino_lines.txt）
+
+用法（在 src 目录下）：
+    python -m serial_unit.parser_bench [语料文件] [-r 重复次数]
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import List, Optional, Sequence, Tuple
+
+from .command_parser import CommandParser
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(__file__), 'corpus', 'arduino_lines.txt')
+
+
+def load_corpus(path: str = DEFAULT_CORPUS) -> List[str]:
+    """读取语料（忽略以 # 开头的注释行）"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.rstrip('\n') for line in f if not line.startswith('#')]
+
+
+def to_legacy(lines: Sequence[str]) -> List[str]:
+    """将主格式数据行改写为旧格式 motor1,motor2,conductivity（其余行保持不变）"""
+    parser = CommandParser(fast_path=False)
+    out = []
+    for line in lines:
+        parsed = parser.parse_arduino_data(line)
+        if parsed and parsed.get('type') == 'data':
+            out.append(f"{parsed['motor1']},{parsed['motor2']},{parsed['conductivity']:.2f}")
+        else:
+            out.append(line)
+    return out
+
+
+def _run(lines: Sequence[str], fast_path: bool) -> float:
+    """用新的解析器解析一遍语料，返回耗时（秒）"""
+    parse = CommandParser(fast_path=fast_path).parse_arduino_data
+    start = time.perf_counter()
+    for line in lines:
+        parse(line)
+    return time.perf_counter() - start
+
+
+def measure(lines: Sequence[str], repeat: int) -> Tuple[float, float]:
+    """
+    交替运行两种路径各 repeat 次，取各自最快的一次
+
+    Returns:
+        (完整识别吞吐量, 格式锁定吞吐量)，单位为行/秒
+    """
+    best_full = best_fast = float('inf')
+    for _ in range(repeat):
+        best_full = min(best_full, _run(lines, fast_path=False))
+        best_fast = min(best_fast, _run(lines, fast_path=True))
+    return len(lines) / best_full, len(lines) / best_fast
+
+
+def check_parity(lines: Sequence[str]) -> int:
+    """逐行比较两种路径的解析结果，返回不一致的行数"""
+    full = CommandParser(fast_path=False)
+    fast = CommandParser()
+    mismatches = 0
+    for line in lines:
+        if full.parse_arduino_data(line) != fast.parse_arduino_data(line):
+            mismatches += 1
+            print(f"结果不一致: {line!r}", file=sys.stderr)
+    return mismatches
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="CommandParser 吞吐量基准")
+    parser.add_argument('corpus', nargs='?', default=DEFAULT_CORPUS, help="语料文件")
+    parser.add_argument('-r', '--repeat', type=int, default=20, help="重复次数（取最快）")
+    args = parser.parse_args(argv)
+
+    main_lines = load_corpus(args.corpus)
+    datasets = (('主格式', main_lines), ('旧格式', to_legacy(main_lines)))
+
+    failed = 0
+    for name, lines in datasets:
+        failed += check_parity(lines)
+        before, after = measure(lines, args.repeat)
+        print(f"{name}（{len(lines)} 行）: 完整识别 {before:,.0f} 行/秒，"
+              f"格式锁定 {after:,.0f} 行/秒，提升 {after / before:.2f}x")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+采样环形缓冲区：串口读取线程与 GUI 线程之间的单生产者/单消费者队列
+"""
+
+from collections import deque
+
+import numpy as np
+
+# 每个采样点的结构化格式（读取时间戳、两路电机速度、电导率）
+SAMPLE_DTYPE = np.dtype([
+    ('time', 'f8'),
+    ('motor1', 'i4'),
+    ('motor2', 'i4'),
+    ('conductivity', 'f8'),
+])
+
+
+class SampleRingBuffer:
+    """
+    预分配的无锁环形缓冲区（单生产者/单消费者）
+
+    生产者只修改写索引，消费者只修改读索引；两个索引单调递增，
+    在 GIL 下整数赋值是原子的，因此无需加锁。缓冲区满时新数据被丢弃并计数，
+    不会覆盖尚未取走的数据，从而保证顺序。
+
+    生产者还可以在数据流中插入标记（如滴定结束），标记记录插入时的写索引，
+    消费者通过 drain_events 按原顺序取出数据块与标记。
+    """
+
+    def __init__(self, capacity: int = 65536):
+        """
+        Args:
+            capacity: 容量（向上取整为 2 的幂）
+        """
+        size = 1
+        while size < max(2, int(capacity)):
+            size <<= 1
+        self._data = np.zeros(size, dtype=SAMPLE_DTYPE)
+        self._mask = size - 1
+        self._write_idx = 0
+        self._read_idx = 0
+        self._markers = deque()  # (写索引, 标记)，deque 的两端操作是线程安全的
+        self.dropped_count = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self._data)
+
+    def __len__(self) -> int:
+        return self._write_idx - self._read_idx
+
+    def push(self, timestamp: float, motor1: int, motor2: int, conductivity: float) -> bool:
+        """写入一个采样点（仅由生产者线程调用），缓冲区满时返回 False"""
+        w = self._write_idx
+        if w - self._read_idx >= len(self._data):
+            self.dropped_count += 1
+            return False
+        self._data[w & self._mask] = (timestamp, motor1, motor2, conductivity)
+        # 数据写入完成后再发布写索引
+        self._write_idx = w + 1
+        return True
+
+    def push_marker(self, marker):
+        """在当前位置插入标记（仅由生产者线程调用）"""
+        self._markers.append((self._write_idx, marker))
+
+    def drain_events(self) -> list:
+        """
+        取出当前所有采样点与标记（仅由消费者调用）
+
+        Returns:
+            按原顺序排列的列表：元素为数据块（SAMPLE_DTYPE 数组）或标记；
+            数据块在标记处分开，标记之前写入的数据排在标记之前
+        """
+        w = self._write_idx
+        events = []
+        while self._markers and self._markers[0][0] <= w:
+            idx, marker = self._markers.popleft()
+            block = self.drain(idx - self._read_idx)
+            if len(block):
+                events.append(block)
+            events.append(marker)
+        block = self.drain(w - self._read_idx)
+        if len(block):
+            events.append(block)
+        return events
+
+    def drain(self, max_items: int = None) -> np.ndarray:
+        """取出当前所有（或至多 max_items 个）采样点，返回按写入顺序排列的副本（仅由消费者调用）"""
+        r = self._read_idx
+        count = self._write_idx - r
+        if max_items is not None:
+            count = min(count, max_items)
+        if count <= 0:
+            return np.empty(0, dtype=SAMPLE_DTYPE)
+
+        start = r & self._mask
+        end = start + count
+        if end <= len(self._data):
+            block = self._data[start:end].copy()
+        else:
+            block = np.concatenate((self._data[start:], self._data[:end - len(self._data)]))
+        self._read_idx = r + count
+        return block
+
+    def clear(self):
+        """丢弃所有未读数据（仅在生产者停止后调用）"""
+        self._read_idx = self._write_idx
+        self._markers.clear()
+        self.dropped_count = 0
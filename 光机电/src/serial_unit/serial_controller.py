@@ -3,10 +3,16 @@
 """
 
 from PyQt5 import QtCore
-from typing import List
+from typing import Callable, List, Optional, Tuple
 import os
-from .command_parser import CommandParser
+import time
+import numpy as np
+from .command_parser import CommandParser, format_sample_log, sample_from_parsed
+from .line_framer import LineFramer
 from .motor_commands import MotorCommands
+from .sample_buffer import SampleRingBuffer, SAMPLE_DTYPE
+from .serial_reader import SerialReaderThread, STOP_MARKER
+from .telemetry import TelemetryDecoder
 
 # 串口依赖（可选）
 try:
@@ -16,23 +22,65 @@ except ImportError:
     serial = None
     list_ports = None
 
+# 视为连接失效的读取错误（pyserial 的 SerialException 为 OSError 的子类，这里显式列出）
+SERIAL_ERRORS = (OSError,) if serial is None else (OSError, serial.SerialException)
+
+# 读取模式
+READER_MODE_TIMER = 'timer'    # GUI 线程定时轮询
+READER_MODE_THREAD = 'thread'  # 后台线程读取 + 环形缓冲区
+READER_MODE_NOTIFIER = 'notifier'  # 串口文件描述符可读时读取（仅 POSIX，不可用时退回定时轮询）
+
+# 下位机数据格式（需与固件的 BINARY_TELEMETRY 设置一致）
+TELEMETRY_TEXT = 'text'      # 文本行：m1=<speed>, m2=<speed>, c=<ec_value>
+TELEMETRY_BINARY = 'binary'  # COBS 分隔的二进制帧（见 telemetry 模块）
+
 class SerialController(QtCore.QObject):
     """串口控制器类"""
     
     # 信号定义
     data_received = QtCore.pyqtSignal(dict)  # 接收到数据
+    data_block_received = QtCore.pyqtSignal(object)  # 批量数据（SAMPLE_DTYPE 结构化数组）
     connection_changed = QtCore.pyqtSignal(bool, str)  # 连接状态变化 (connected, status_text)
     log_message = QtCore.pyqtSignal(str)  # 日志消息
     
-    def __init__(self, parent=None):
+    NOTIFIER_MAX_EMPTY_READS = 5  # notifier 模式下连续空读达到该次数视为设备断开
+    
+    def __init__(self, parent=None, reader_mode: str = READER_MODE_TIMER,
+                 batch_signals: bool = False, telemetry: str = TELEMETRY_TEXT,
+                 simulation_loader: Optional[Callable[[str], np.ndarray]] = None):
+        """
+        Args:
+            parent: 父对象
+            reader_mode: 串口读取模式（READER_MODE_TIMER / READER_MODE_THREAD / READER_MODE_NOTIFIER）
+            batch_signals: 为 True 时，每次轮询解析出的所有数据点通过 data_block_received
+                一次性发出，而不是逐点发出 data_received
+            telemetry: 下位机数据格式（TELEMETRY_TEXT / TELEMETRY_BINARY）
+            simulation_loader: 读取模拟数据文件的函数，返回含 conductivity、motor1_proportion
+                列的结构化数组（如 analysis_unit.load_raw）；为 None 时模拟模式不发送数据
+        """
         super().__init__(parent)
         
         # 串口相关
         self.serial_port = None
         self.is_simulation_mode = False
+        self.reader_mode = reader_mode
+        self.batch_signals = batch_signals
+        self._pending_samples = []  # 批量模式下本次轮询累积的数据点
         
-        # 解析器
+        # 后台读取线程及其输出缓冲区（仅 thread 模式下使用）
+        self._reader_thread = None
+        self._sample_ring = SampleRingBuffer()
+        self._reported_drops = 0  # 已在日志中报告的丢弃点数
+        
+        # 串口可读通知器（仅 notifier 模式下使用）
+        self._read_notifier = None
+        self._empty_reads = 0  # 连续的空唤醒次数
+        
+        # 分帧与解析器
+        self.telemetry = telemetry
+        self.line_framer = LineFramer()
         self.parser = CommandParser()
+        self.telemetry_decoder = TelemetryDecoder() if telemetry == TELEMETRY_BINARY else None
         self.commands = MotorCommands()
         
         # 定时器用于轮询串口数据
@@ -44,7 +92,8 @@ class SerialController(QtCore.QObject):
         self.last_motor1_speed = 0
         self.last_motor2_speed = 0
         # 模拟数据相关
-        self._sim_lines = []
+        self.simulation_loader = simulation_loader
+        self._sim_data = np.empty(0)
         self._sim_index = 0
         self._sim_running = False
 
@@ -99,19 +148,21 @@ class SerialController(QtCore.QObject):
             try:
                 base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
                 sim_path = os.path.join(base_dir, 'results', 'raw', 'wtf-4-!!!.txt')
-                if os.path.exists(sim_path):
-                    with open(sim_path, 'r', encoding='utf-8') as f:
-                        lines = f.read().splitlines()
-                    # 跳过表头并过滤空行
-                    self._sim_lines = [l for l in lines[1:] if l.strip()]
+                if self.simulation_loader is None:
+                    self._sim_data = np.empty(0)
+                    self._sim_index = 0
+                    self.log_message.emit("未设置模拟数据读取函数，将发送空数据")
+                elif os.path.exists(sim_path):
+                    # 一次性解析为 NumPy 列，播放时按行取值
+                    self._sim_data = self.simulation_loader(sim_path)
                     self._sim_index = 0
-                    self.log_message.emit(f"已加载模拟数据：{sim_path} （{len(self._sim_lines)} 行）")
+                    self.log_message.emit(f"已加载模拟数据：{sim_path} （{len(self._sim_data)} 行）")
                 else:
-                    self._sim_lines = []
+                    self._sim_data = np.empty(0)
                     self._sim_index = 0
                     self.log_message.emit(f"未找到模拟数据文件: {sim_path}，将发送空数据")
             except Exception as e:
-                self._sim_lines = []
+                self._sim_data = np.empty(0)
                 self._sim_index = 0
                 self.log_message.emit(f"加载模拟数据失败: {e}")
 
@@ -132,7 +183,14 @@ class SerialController(QtCore.QObject):
         try:
             self.serial_port = serial.Serial(port=port_name, baudrate=115200, timeout=0)
             self.is_simulation_mode = False
-            self.poll_timer.start()
+            self.line_framer.reset()
+            self.parser.reset()
+            if self.telemetry_decoder is not None:
+                self.telemetry_decoder.reset()
+            if self.reader_mode == READER_MODE_THREAD:
+                self._start_reader_thread()
+            if not (self.reader_mode == READER_MODE_NOTIFIER and self._start_read_notifier()):
+                self.poll_timer.start()
             self.connection_changed.emit(True, f"已连接 {port_name}")
             return True
         except Exception as e:
@@ -143,6 +201,8 @@ class SerialController(QtCore.QObject):
         """断开串口连接"""
         try:
             self.poll_timer.stop()
+            self._stop_read_notifier()
+            self._stop_reader_thread()
             if self.serial_port and self.serial_port.is_open:
                 self.serial_port.close()
                 self.serial_port = None
@@ -152,6 +212,15 @@ class SerialController(QtCore.QObject):
         self.is_simulation_mode = False
         self.connection_changed.emit(False, "未连接")
     
+    def get_framing_stats(self) -> dict:
+        """
+        获取串口分帧统计：文本协议为完整行数、溢出/解码错误数、缓存字节数；
+        二进制协议为解码帧数、CRC/分帧错误数、序号间断次数与丢失帧数
+        """
+        if self.telemetry_decoder is not None:
+            return self.telemetry_decoder.stats()
+        return self.line_framer.stats()
+    
     def is_connected(self) -> bool:
         """检查是否已连接"""
         if self.is_simulation_mode:
@@ -187,16 +256,134 @@ class SerialController(QtCore.QObject):
             self.log_message.emit(f"发送失败: {e}")
             return False
     
+    def _start_read_notifier(self) -> bool:
+        """
+        为串口文件描述符注册可读通知，数据到达时才读取（不再定时唤醒）
+        
+        Returns:
+            bool: 是否成功注册；失败时由调用方改用定时轮询
+        """
+        if os.name != 'posix' or not hasattr(self.serial_port, 'fileno'):
+            self.log_message.emit("当前平台不支持串口可读通知，改用定时轮询")
+            return False
+        try:
+            fd = self.serial_port.fileno()
+        except Exception as e:
+            self.log_message.emit(f"无法获取串口文件描述符（{e}），改用定时轮询")
+            return False
+        self._empty_reads = 0
+        self._read_notifier = QtCore.QSocketNotifier(fd, QtCore.QSocketNotifier.Read, self)
+        self._read_notifier.activated.connect(self._on_serial_readable)
+        return True
+
+    def _stop_read_notifier(self):
+        """注销串口可读通知"""
+        if self._read_notifier is None:
+            return
+        self._read_notifier.setEnabled(False)
+        self._read_notifier.deleteLater()
+        self._read_notifier = None
+
+    def _on_serial_readable(self, _fd=None):
+        """
+        串口可读：读取并处理已到达的数据
+
+        偶发的空唤醒不影响连接；只有读取出错（串口异常），或连续多次可读却读不到数据
+        （设备已断开时描述符会一直处于可读状态）才断开，否则通知会反复触发。
+        """
+        if not (self.serial_port and self.serial_port.is_open):
+            return
+        try:
+            if self._read_serial_data():
+                self._empty_reads = 0
+                return
+        except SERIAL_ERRORS as e:
+            self.log_message.emit(f"串口读取错误: {e}")
+            self.disconnect_port()
+            return
+        except Exception as e:
+            # 数据处理出错（如解析异常）：记录后继续接收
+            self.log_message.emit(f"串口数据处理错误: {e}")
+            return
+
+        self._empty_reads += 1
+        if self._empty_reads >= self.NOTIFIER_MAX_EMPTY_READS:
+            self.log_message.emit("串口设备已断开")
+            self.disconnect_port()
+
+    def _start_reader_thread(self):
+        """启动后台读取线程"""
+        self._sample_ring.clear()
+        self._reported_drops = 0
+        self._reader_thread = SerialReaderThread(
+            self.serial_port, self.line_framer, CommandParser(), self._sample_ring,
+            last_speeds=(self.last_motor1_speed, self.last_motor2_speed),
+            telemetry_decoder=self.telemetry_decoder
+        )
+        self._reader_thread.read_error.connect(self._on_reader_error)
+        self._reader_thread.start()
+
+    def _stop_reader_thread(self):
+        """停止后台读取线程并等待其退出"""
+        if self._reader_thread is None:
+            return
+        self._reader_thread.requestInterruption()
+        self._reader_thread.wait()
+        # 取出线程退出前已读取的数据，并读回线程维护的电机速度
+        self._drain_sample_ring()
+        self.last_motor1_speed, self.last_motor2_speed = self._reader_thread.last_speeds
+        self._reader_thread = None
+
+    def _on_reader_error(self, message: str):
+        """读取线程出错退出：记录错误并断开连接"""
+        if self.sender() is not self._reader_thread:
+            return  # 已断开或已重新连接
+        self.log_message.emit(message)
+        self.disconnect_port()
+
+    def _drain_sample_ring(self):
+        """批量取出读取线程缓冲的日志行、数据点与滴定结束标记（GUI 线程）"""
+        for line in self._reader_thread.drain_log_lines():
+            self.log_message.emit(line)
+        dropped = self._sample_ring.dropped_count
+        if dropped > self._reported_drops:
+            # 缓冲区满时新数据被丢弃：在日志中报告，而不是只记在计数里
+            self.log_message.emit(
+                f"采样缓冲区已满，丢弃 {dropped - self._reported_drops} 个数据点（累计 {dropped}）")
+            self._reported_drops = dropped
+        for item in self._sample_ring.drain_events():
+            if isinstance(item, np.ndarray):
+                self._emit_sample_block(item)
+            elif item == STOP_MARKER:
+                self.data_received.emit({'type': 'titration_stop'})
+
+    def _emit_sample_block(self, block: np.ndarray):
+        """发出一块数据点：批量模式整块发出，否则逐点发出"""
+        if self.batch_signals:
+            self.data_block_received.emit(block)
+            return
+        for sample in block:
+            self.data_received.emit({
+                'motor1': int(sample['motor1']),
+                'motor2': int(sample['motor2']),
+                'conductivity': float(sample['conductivity']),
+                'timestamp': float(sample['time'])
+            })
+
     def _poll_serial_data(self):
         """轮询串口数据。在模拟模式下，从预加载文件逐行返回数据点。"""
+        if self._reader_thread is not None:
+            self._drain_sample_ring()
+            return
+
         if self.is_simulation_mode:
             # 如果未启动播放，则直接返回（仍然维持连接状态）
             if not getattr(self, '_sim_running', False):
                 return
 
-            # 从 _sim_lines 中按序取行并发送数据
+            # 从 _sim_data 中按序取行并发送数据
             try:
-                if self._sim_index >= len(self._sim_lines):
+                if self._sim_index >= len(self._sim_data):
                     # 到达文件末尾，停止播放并通知（发送 titration_stop 类型）
                     try:
                         self._sim_running = False
@@ -207,39 +394,30 @@ class SerialController(QtCore.QObject):
                     self.log_message.emit('模拟数据已播放完毕')
                     return
 
-                line = self._sim_lines[self._sim_index]
+                row = self._sim_data[self._sim_index]
                 self._sim_index += 1
-                parts = [p.strip() for p in line.split(',')]
-                # 期望格式：time_s,conductivity,motor1_proportion
-                if len(parts) >= 3:
-                    try:
-                        # 解析数值
-                        time_s = float(parts[0])
-                        conductivity = float(parts[1])
-                        proportion = float(parts[2])
-                    except Exception:
-                        # 跳过解析失败的行
-                        return
+                conductivity = float(row['conductivity'])
+                proportion = float(row['motor1_proportion'])
 
-                    # 将 proportion 转换为 motor1 speed（使用父控件的 max_speed_input 值作为参考）
-                    motor1_speed = 0
-                    motor2_speed = 0
-                    try:
-                        parent = self.parent()
-                        if parent and hasattr(parent, 'ui') and hasattr(parent.ui, 'max_speed_input'):
-                            max_sp = int(parent.ui.max_speed_input.value())
-                            motor1_speed = int(round(proportion * max_sp))
-                        else:
-                            motor1_speed = int(round(proportion * 10000))
-                    except Exception:
+                # 将 proportion 转换为 motor1 speed（使用父控件的 max_speed_input 值作为参考）
+                motor1_speed = 0
+                motor2_speed = 0
+                try:
+                    parent = self.parent()
+                    if parent and hasattr(parent, 'ui') and hasattr(parent.ui, 'max_speed_input'):
+                        max_sp = int(parent.ui.max_speed_input.value())
+                        motor1_speed = int(round(proportion * max_sp))
+                    else:
                         motor1_speed = int(round(proportion * 10000))
+                except Exception:
+                    motor1_speed = int(round(proportion * 10000))
 
-                    # 发送数据字典，格式与真实串口解析一致
-                    self.data_received.emit({
-                        'motor1': motor1_speed,
-                        'motor2': motor2_speed,
-                        'conductivity': conductivity
-                    })
+                # 发送数据字典，格式与真实串口解析一致
+                self.data_received.emit({
+                    'motor1': motor1_speed,
+                    'motor2': motor2_speed,
+                    'conductivity': conductivity
+                })
                 return
             except Exception as e:
                 self.log_message.emit(f"模拟数据轮询错误: {e}")
@@ -248,95 +426,92 @@ class SerialController(QtCore.QObject):
         if not (self.serial_port and self.serial_port.is_open):
             return
             
+        try:
+            self._read_serial_data()
+        except Exception as e:
+            self.log_message.emit(f"串口读取错误: {e}")
+    
+    def _read_serial_data(self) -> bool:
+        """
+        读取并处理串口缓冲区中已有的数据（读取错误向上抛出）
+        
+        Returns:
+            bool: 是否读到了数据
+        """
         try:
             bytes_available = self.serial_port.in_waiting
             if bytes_available == 0:
-                return
+                return False
                 
             data = self.serial_port.read(bytes_available)
-            text = data.decode(errors='ignore')
+            timestamp = time.time()
+            
+            if self.telemetry_decoder is not None:
+                # 二进制帧：只处理完整的帧，未结束的尾部留到下一次读取
+                for parsed in self.telemetry_decoder.feed(data):
+                    if parsed['type'] == 'text':
+                        self.log_message.emit(f"Arduino: {parsed['raw']}")
+                    else:
+                        self._handle_parsed_data(parsed, timestamp)
+                return True
             
-            for line in text.splitlines():
-                line = line.strip()
-                if not line:
-                    continue
-                    
+            # 只处理完整的行，未结束的尾部留到下一次轮询
+            for line in self.line_framer.feed(data):
                 self.log_message.emit(f"Arduino: {line}")
                 
                 # 解析数据
                 parsed = self.parser.parse_arduino_data(line)
                 if parsed:
-                    self._handle_parsed_data(parsed)
-                    
-        except Exception as e:
-            self.log_message.emit(f"串口读取错误: {e}")
+                    self._handle_parsed_data(parsed, timestamp)
+            return True
+        finally:
+            self._flush_pending_samples()
+    
+    def _flush_pending_samples(self):
+        """批量模式：将本次轮询累积的数据点作为一个数据块发出"""
+        if not self._pending_samples:
+            return
+        block = np.array(self._pending_samples, dtype=SAMPLE_DTYPE)
+        self._pending_samples = []
+        self.data_block_received.emit(block)
+    
+    def _sample_from_parsed(self, parsed_data: dict) -> Optional[Tuple[int, int, float]]:
+        """
+        将解析结果转换为采样点，并更新记录的电机速度（GUI 线程读取路径）
+        
+        Returns:
+            (motor1, motor2, conductivity)；不含电导率的数据返回 None
+        """
+        sample, (self.last_motor1_speed, self.last_motor2_speed) = sample_from_parsed(
+            parsed_data, (self.last_motor1_speed, self.last_motor2_speed))
+        return sample
     
-    def _handle_parsed_data(self, parsed_data: dict):
+    def _handle_parsed_data(self, parsed_data: dict, timestamp: Optional[float] = None):
         """处理解析后的数据"""
         data_type = parsed_data.get('type')
         
-        if data_type == 'data':
-            # 完整数据：包含电机速度和电导率
-            motor1 = parsed_data['motor1']
-            motor2 = parsed_data['motor2']
-            conductivity = parsed_data['conductivity']
-            
-            self.last_motor1_speed = motor1
-            self.last_motor2_speed = motor2
-            
-            self.log_message.emit(f"m1={motor1}, m2={motor2}, EC={conductivity:.3f}")
-            self.data_received.emit({
-                'motor1': motor1,
-                'motor2': motor2, 
-                'conductivity': conductivity
-            })
-            
-        elif data_type == 'conductivity_only':
-            # 仅电导率数据，使用上次的电机速度
-            conductivity = parsed_data['conductivity']
-            self.log_message.emit(f"COND: {conductivity:.3f}")
-            self.data_received.emit({
-                'motor1': self.last_motor1_speed,
-                'motor2': self.last_motor2_speed,
-                'conductivity': conductivity
-            })
-            
-        elif data_type == 'motors_only':
-            # 仅电机速度数据
-            motor1 = parsed_data['motor1']
-            motor2 = parsed_data['motor2']
-            self.last_motor1_speed = motor1
-            self.last_motor2_speed = motor2
-            
-            # 如果同时包含电导率，则发送完整数据
-            if 'conductivity' in parsed_data:
-                conductivity = parsed_data['conductivity']
-                self.log_message.emit(f"COND: {conductivity:.3f}")
-                self.data_received.emit({
-                    'motor1': motor1,
-                    'motor2': motor2,
-                    'conductivity': conductivity
-                })
-                
-        elif data_type == 'legacy_data':
-            # 兼容格式的完整数据
-            motor1 = parsed_data['motor1']
-            motor2 = parsed_data['motor2']
-            conductivity = parsed_data['conductivity']
+        if data_type == 'stop':
+            # 滴定结束信号（先发出之前累积的数据，保证顺序）
+            self._flush_pending_samples()
+            self.data_received.emit({'type': 'titration_stop'})
+            return
             
-            self.last_motor1_speed = motor1
-            self.last_motor2_speed = motor2
+        sample = self._sample_from_parsed(parsed_data)
+        if sample is None:
+            return
             
-            self.log_message.emit(f"COND: {conductivity:.3f}")
-            self.data_received.emit({
-                'motor1': motor1,
-                'motor2': motor2,
-                'conductivity': conductivity
-            })
+        self.log_message.emit(format_sample_log(data_type, sample))
+        if self.batch_signals:
+            self._pending_samples.append((timestamp or time.time(),) + sample)
+            return
             
-        elif data_type == 'stop':
-            # 滴定结束信号
-            self.data_received.emit({'type': 'titration_stop'})
+        motor1, motor2, conductivity = sample
+        self.data_received.emit({
+            'motor1': motor1,
+            'motor2': motor2,
+            'conductivity': conductivity,
+            'timestamp': timestamp
+        })
     
     # 电机控制便捷方法
     def motor_forward(self, motor_id: int, speed: int) -> bool:
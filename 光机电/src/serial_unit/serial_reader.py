@@ -0,0 +1,100 @@
+"""
+串口读取线程：在后台线程中读取并解析串口数据，写入环形缓冲区供 GUI 线程批量取出
+"""
+
+import time
+from collections import deque
+from typing import List, Optional, Tuple
+
+from PyQt5 import QtCore
+
+from .command_parser import CommandParser, format_sample_log, sample_from_parsed
+from .line_framer import LineFramer
+from .sample_buffer import SampleRingBuffer
+from .telemetry import TelemetryDecoder
+
+# 环形缓冲区中的滴定结束标记
+STOP_MARKER = 'titration_stop'
+
+
+class SerialReaderThread(QtCore.QThread):
+    """后台串口读取线程"""
+
+    # 信号定义（跨线程，以队列方式投递到 GUI 线程）
+    read_error = QtCore.pyqtSignal(str)  # 读取错误（发出后线程即退出）
+
+    IDLE_SLEEP_MS = 2  # 无数据时的休眠间隔
+    LOG_QUEUE_SIZE = 4096  # 待输出日志行的上限（GUI 线程来不及取出时丢弃最旧的行）
+
+    def __init__(self, serial_port, framer: LineFramer, parser: CommandParser,
+                 ring: SampleRingBuffer, last_speeds: Tuple[int, int] = (0, 0),
+                 telemetry_decoder: Optional[TelemetryDecoder] = None, parent=None):
+        """
+        Args:
+            serial_port: 已打开的 pyserial 端口
+            framer: 字节流行分帧器（线程运行期间仅由本线程使用）
+            parser: 数据行解析器
+            ring: 采样输出缓冲区（滴定结束以标记的形式插入其中，保证与数据的顺序）
+            last_speeds: 初始的 (motor1, motor2) 速度；线程运行期间由本线程独占维护，
+                线程退出后可通过 last_speeds 属性读回
+            telemetry_decoder: 二进制帧解码器；提供时按二进制协议解码，不再按行解析
+        """
+        super().__init__(parent)
+        self._port = serial_port
+        self._framer = framer
+        self._parser = parser
+        self._ring = ring
+        self._decoder = telemetry_decoder
+        self.last_speeds = tuple(last_speeds)
+        self._log_lines = deque(maxlen=self.LOG_QUEUE_SIZE)
+
+    def drain_log_lines(self) -> List[str]:
+        """取出已读取的日志行（GUI 线程调用）"""
+        lines = []
+        pop = self._log_lines.popleft
+        while self._log_lines:
+            lines.append(pop())
+        return lines
+
+    def run(self):
+        while not self.isInterruptionRequested():
+            try:
+                bytes_available = self._port.in_waiting
+                if bytes_available == 0:
+                    self.msleep(self.IDLE_SLEEP_MS)
+                    continue
+
+                data = self._port.read(bytes_available)
+                timestamp = time.time()
+                if self._decoder is not None:
+                    self._process_frames(self._decoder.feed(data), timestamp)
+                else:
+                    self._process_lines(self._framer.feed(data), timestamp)
+            except Exception as e:
+                self.read_error.emit(f"串口读取错误: {e}")
+                return
+
+    def _process_lines(self, lines, timestamp: float):
+        parse = self._parser.parse_arduino_data
+        for line in lines:
+            self._log_lines.append(f"Arduino: {line}")
+            self._process_parsed(parse(line), timestamp)
+
+    def _process_frames(self, frames, timestamp: float):
+        for parsed in frames:
+            if parsed['type'] == 'text':
+                self._log_lines.append(f"Arduino: {parsed['raw']}")
+            else:
+                self._process_parsed(parsed, timestamp)
+
+    def _process_parsed(self, parsed: Optional[dict], timestamp: float):
+        if not parsed:
+            return
+        data_type = parsed.get('type')
+        if data_type == 'stop':
+            self._ring.push_marker(STOP_MARKER)
+            return
+        sample, self.last_speeds = sample_from_parsed(parsed, self.last_speeds)
+        if sample is not None:
+            self._log_lines.append(format_sample_log(data_type, sample))
+            self._ring.push(timestamp, *sample)
@@ -0,0 +1,275 @@
+"""
+二进制遥测帧：固件以 COBS 编码、0x00 分隔的定长记录发送数据（文本行协议的可选替代）
+
+帧内容（COBS 编码前，小端）：
+    类型 uint8 | 保留 uint8 | 序号 uint16 | 设备时间 ms uint32 | 数据 | CRC-16/Modbus uint16
+数据部分：
+    FRAME_SAMPLE  motor1 int32 | motor2 int32 | 电导率 float32（定长 20 字节 + CRC）
+    FRAME_STOP    无（滴定结束）
+    FRAME_TEXT    UTF-8 文本（固件的日志消息，如 "OK t"）
+每发送一帧序号加一（16 位回绕），接收端据此统计丢帧。
+固件端实现见 stepper&cond.ino 中的 BINARY_TELEMETRY。
+"""
+
+import struct
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+from .crc16 import CRC16_TABLE, crc16_modbus
+
+FRAME_SAMPLE = 0x01
+FRAME_STOP = 0x02
+FRAME_TEXT = 0x03
+
+FRAME_DELIMITER = b'\x00'
+
+_HEADER = struct.Struct('<BBHI')
+_SAMPLE = struct.Struct('<BBHIiif')
+_CRC = struct.Struct('<H')
+
+# 采样帧 COBS 编码后的长度（不含分隔符）；帧内无 254 字节以上的非零段，因此长度固定
+_SAMPLE_ENCODED_SIZE = _SAMPLE.size + _CRC.size + 1
+_SAMPLE_RECORD = np.dtype([
+    ('type', 'u1'), ('reserved', 'u1'), ('seq', '<u2'), ('device_ms', '<u4'),
+    ('motor1', '<i4'), ('motor2', '<i4'), ('conductivity', '<f4'), ('crc', '<u2'),
+])
+_CRC_TABLE = np.array(CRC16_TABLE, dtype=np.uint16)
+# 一次输入中至少有这么多采样帧时改用 NumPy 批量解码
+_BATCH_MIN_FRAMES = 8
+
+
+def cobs_encode(data: bytes) -> bytes:
+    """COBS 编码（结果不含 0x00，不含结尾分隔符）"""
+    out = bytearray()
+    for block in data.split(b'\x00'):
+        while len(block) >= 254:
+            out.append(0xFF)
+            out += block[:254]
+            block = block[254:]
+        out.append(len(block) + 1)
+        out += block
+    return bytes(out)
+
+
+def cobs_decode(data: bytes) -> bytes:
+    """COBS 解码，数据不合法时抛出 ValueError"""
+    out = bytearray()
+    i = 0
+    n = len(data)
+    while i < n:
+        code = data[i]
+        end = i + code
+        if code == 0 or end > n:
+            raise ValueError("COBS 数据不合法")
+        out += data[i + 1:end]
+        i = end
+        if code < 0xFF and i < n:
+            out.append(0)
+    return bytes(out)
+
+
+class TelemetryEncoder:
+    """
+    遥测帧编码器（与固件的输出一致），可在无硬件时代替固件生成数据流
+    """
+
+    def __init__(self, seq: int = 0):
+        self.seq = seq & 0xFFFF
+
+    def _frame(self, payload: bytes) -> bytes:
+        self.seq = (self.seq + 1) & 0xFFFF
+        return cobs_encode(payload + _CRC.pack(crc16_modbus(payload))) + FRAME_DELIMITER
+
+    def encode_sample(self, motor1: int, motor2: int, conductivity: float,
+                      device_ms: int = 0) -> bytes:
+        """编码一条采样"""
+        return self._frame(_SAMPLE.pack(FRAME_SAMPLE, 0, self.seq, device_ms & 0xFFFFFFFF,
+                                        int(motor1), int(motor2), conductivity))
+
+    def encode_stop(self, device_ms: int = 0) -> bytes:
+        """编码滴定结束帧"""
+        return self._frame(_HEADER.pack(FRAME_STOP, 0, self.seq, device_ms & 0xFFFFFFFF))
+
+    def encode_text(self, text: str, device_ms: int = 0) -> bytes:
+        """编码一条文本消息"""
+        return self._frame(_HEADER.pack(FRAME_TEXT, 0, self.seq, device_ms & 0xFFFFFFFF)
+                           + text.encode('utf-8'))
+
+
+class TelemetryDecoder:
+    """
+    字节级增量遥测帧解码器
+
+    与 LineFramer 类似，每次读取到的字节可能在任意位置截断一帧，未完整的尾部保留到
+    下一次 feed。解码结果与 CommandParser.parse_arduino_data 的返回格式一致
+    （'data' / 'stop'，文本消息为 {'type': 'text', 'raw': 文本}），可直接交给相同的处理流程。
+    """
+
+    def __init__(self, max_frame_length: int = 256):
+        """
+        Args:
+            max_frame_length: 单帧最大字节数（编码后），超出时丢弃并计为分帧错误
+        """
+        self.max_frame_length = max_frame_length
+        self._tail = b''
+        self._discarding = False  # 正在丢弃超长帧的剩余部分，直到下一个分隔符
+        self._last_seq = None
+
+        # 统计计数
+        self.frames_decoded = 0   # 校验通过的帧数
+        self.crc_errors = 0       # CRC 校验失败的帧数
+        self.framing_errors = 0   # COBS 不合法、长度不符或超长的帧数
+        self.sequence_gaps = 0    # 序号不连续的次数
+        self.lost_frames = 0      # 按序号推算丢失的帧数
+
+    def reset(self):
+        """清空缓存与统计（如重新连接时）"""
+        self.__init__(self.max_frame_length)
+
+    def stats(self) -> dict:
+        return {
+            'frames_decoded': self.frames_decoded,
+            'crc_errors': self.crc_errors,
+            'framing_errors': self.framing_errors,
+            'sequence_gaps': self.sequence_gaps,
+            'lost_frames': self.lost_frames,
+            'buffered_bytes': len(self._tail),
+        }
+
+    def feed(self, data: bytes) -> List[Dict[str, Any]]:
+        """输入新读取的字节，返回其中完整帧的解码结果"""
+        if not data:
+            return []
+
+        if self._discarding:
+            # 丢弃超长帧的剩余部分，直到下一个分隔符
+            first_delimiter = data.find(FRAME_DELIMITER)
+            if first_delimiter < 0:
+                return []
+            self._discarding = False
+            data = data[first_delimiter + 1:]
+
+        chunks = (self._tail + data if self._tail else data).split(FRAME_DELIMITER)
+        self._tail = chunks.pop()
+        if len(self._tail) > self.max_frame_length:
+            self.framing_errors += 1
+            self._tail = b''
+            self._discarding = True
+
+        batch = {}
+        sample_idx = [i for i, chunk in enumerate(chunks) if len(chunk) == _SAMPLE_ENCODED_SIZE]
+        if len(sample_idx) >= _BATCH_MIN_FRAMES:
+            batch = _decode_sample_batch(chunks, sample_idx)
+
+        results = []
+        for i, chunk in enumerate(chunks):
+            if not chunk:
+                continue
+            fields = batch.get(i)
+            if fields is not None:
+                seq, device_ms, motor1, motor2, conductivity = fields
+                parsed = self._accept({
+                    'type': 'data',
+                    'motor1': motor1,
+                    'motor2': motor2,
+                    'conductivity': conductivity,
+                }, seq, device_ms)
+            else:
+                # 非采样帧或批量校验未通过的帧：逐帧解码（并统计错误）
+                parsed = self._decode_frame(chunk)
+            if parsed is not None:
+                results.append(parsed)
+        return results
+
+    def _decode_frame(self, chunk: bytes):
+        try:
+            frame = cobs_decode(chunk)
+        except ValueError:
+            self.framing_errors += 1
+            return None
+        if len(frame) < _HEADER.size + _CRC.size:
+            self.framing_errors += 1
+            return None
+        body = frame[:-_CRC.size]
+        if crc16_modbus(body) != _CRC.unpack_from(frame, len(body))[0]:
+            self.crc_errors += 1
+            return None
+
+        frame_type, _, seq, device_ms = _HEADER.unpack_from(body)
+        if frame_type == FRAME_SAMPLE:
+            if len(body) != _SAMPLE.size:
+                self.framing_errors += 1
+                return None
+            _, _, _, _, motor1, motor2, conductivity = _SAMPLE.unpack(body)
+            parsed = {
+                'type': 'data',
+                'motor1': motor1,
+                'motor2': motor2,
+                'conductivity': conductivity,
+            }
+        elif frame_type == FRAME_STOP:
+            parsed = {'type': 'stop'}
+        elif frame_type == FRAME_TEXT:
+            parsed = {'type': 'text', 'raw': body[_HEADER.size:].decode('utf-8', errors='replace')}
+        else:
+            parsed = {'type': 'unknown', 'raw': body.hex()}
+        return self._accept(parsed, seq, device_ms)
+
+    def _accept(self, parsed: Dict[str, Any], seq: int, device_ms: int) -> Dict[str, Any]:
+        """记录一帧校验通过的帧，检查序号连续性"""
+        self.frames_decoded += 1
+        if self._last_seq is not None:
+            missing = (seq - self._last_seq - 1) & 0xFFFF
+            if missing:
+                self.sequence_gaps += 1
+                self.lost_frames += missing
+        self._last_seq = seq
+        parsed['seq'] = seq
+        parsed['device_ms'] = device_ms
+        return parsed
+
+
+def _decode_sample_batch(chunks: Sequence[bytes], indices: Sequence[int]) -> Dict[int, tuple]:
+    """
+    用 NumPy 批量解码定长的采样帧
+
+    Returns:
+        {chunk 下标: (seq, device_ms, motor1, motor2, conductivity)}，
+        只包含 COBS 合法、CRC 正确且类型为采样的帧
+    """
+    size = _SAMPLE_ENCODED_SIZE
+    enc = np.frombuffer(b''.join(chunks[i] for i in indices), dtype=np.uint8).reshape(-1, size)
+    n = len(enc)
+    rows = np.arange(n)
+    buf = enc.copy()
+    valid = np.ones(n, dtype=bool)
+
+    # COBS：沿每行的编码链把各段的长度字节替换为 0（首个长度字节随后去掉）
+    pos = np.zeros(n, dtype=np.intp)
+    active = rows
+    while len(active):
+        p = pos[active]
+        code = buf[active, p].astype(np.intp)
+        bad = (code == 0) | (code == 0xFF) | (p + code > size)
+        valid[active[bad]] = False
+        buf[active, p] = 0
+        pos[active] = np.where(bad, size, p + code)
+        active = active[pos[active] < size]
+
+    frames = np.ascontiguousarray(buf[:, 1:])
+    crc = np.full(n, 0xFFFF, dtype=np.uint16)
+    for j in range(_SAMPLE.size):
+        crc = (crc >> 8) ^ _CRC_TABLE[(crc ^ frames[:, j]) & 0xFF]
+
+    records = frames.view(_SAMPLE_RECORD).ravel()
+    valid &= (records['crc'] == crc) & (records['type'] == FRAME_SAMPLE)
+    ok = np.flatnonzero(valid)
+    records = records[ok]
+    fields = zip(
+        records['seq'].tolist(), records['device_ms'].tolist(),
+        records['motor1'].tolist(), records['motor2'].tolist(),
+        records['conductivity'].astype(np.float64).tolist(),
+    )
+    return {indices[k]: row for k, row in zip(ok.tolist(), fields)}
+
@@ -1,3 +1,4 @@
+import numpy as np
 from PyQt5 import QtCore, QtGui, QtWidgets
 import pyqtgraph as pg
 
@@ -69,54 +70,104 @@ class PercentAxisItem(pg.AxisItem):
 class ProportionTopAxis(pg.AxisItem):
     """顶部轴：根据时间轴的刻度值，在给定的 time->proportion 对上插值并显示 m1 比例"""
 
+    LABEL_CACHE_SIZE = 64  # 缓存的刻度组数（平移/缩放时刻度值会变化）
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         # 回调函数，用于获取最新数据列表
         self._get_time = lambda: []
         self._get_prop = lambda: []
-
-    def set_mapping(self, get_time_cb, get_prop_cb):
-        """设置回调：get_time_cb() -> list of times, get_prop_cb() -> list of proportions"""
+        self._get_version = None
+        # 回调方式下的插值快照：仅在数据版本变化时重建
+        self._snapshot = None
+        self._snapshot_version = None
+        self._label_cache = {}
+        self._external_index = None
+
+    def set_mapping(self, get_time_cb, get_prop_cb, get_version_cb=None):
+        """
+        设置回调：get_time_cb() -> 时间序列, get_prop_cb() -> proportion 序列（列表或数组）
+
+        get_version_cb() 返回数据版本号（数据增长时变化）；提供时只在版本变化后重建插值快照，
+        否则每次重绘都重新读取数据。
+        """
+        self._invalidate()
         self._get_time = get_time_cb
         self._get_prop = get_prop_cb
-
-    def _interp(self, x, xp, fp):
-        # 简单线性插值，不依赖 numpy；假定 xp,fp 已排序按 xp
-        if not xp or not fp:
-            return 0.0
-        if x <= xp[0]:
-            return fp[0]
-        if x >= xp[-1]:
-            return fp[-1]
-        # 找段
-        for i in range(len(xp) - 1):
-            if xp[i] <= x <= xp[i+1]:
-                x0, x1 = xp[i], xp[i+1]
-                y0, y1 = fp[i], fp[i+1]
-                if x1 == x0:
-                    return y0
-                t = (x - x0) / (x1 - x0)
-                return y0 + t * (y1 - y0)
-        return fp[-1]
+        self._get_version = get_version_cb
+
+    def set_index(self, index):
+        """
+        直接使用外部维护的插值索引（由调用方注入，无需复制数据）
+
+        index 需提供 len()、arrays() -> 按时间排序的 (xp, fp) 以及 is_monotonic / version，
+        如 analysis_unit.TimeProportionIndex。
+        """
+        self._invalidate()
+        self._external_index = index
+
+    def _invalidate(self):
+        self._snapshot = None
+        self._snapshot_version = None
+        self._label_cache = {}
+        self._external_index = None
+        self._get_version = None
+
+    def _current_arrays(self):
+        """
+        返回 (xp, fp, 缓存键附加部分)；无有效数据时返回 None
+
+        时间单调时，追加数据只影响超出原时间末端的刻度（插值取端点值），
+        因此缓存键只含起点的 time/prop，末端范围随标签一起保存、在 tickStrings 中校验。
+        """
+        index = self._external_index
+        if index is not None:
+            if len(index) == 0:
+                return None
+            xp, fp = index.arrays()
+            if not index.is_monotonic:
+                # 乱序数据排序后中间段也会变化，退回按版本失效
+                return xp, fp, ('version', index.version)
+            return xp, fp, (xp[0], fp[0])
+
+        version = self._get_version() if self._get_version else None
+        if version is None or version != self._snapshot_version or self._snapshot is None:
+            times = np.asarray(self._get_time(), dtype=np.float64)
+            props = np.asarray(self._get_prop(), dtype=np.float64)
+            if len(times) == 0 or len(props) == 0 or len(times) != len(props):
+                self._snapshot = None
+            else:
+                order = np.argsort(times, kind='stable')
+                self._snapshot = (times[order], props[order])
+            self._snapshot_version = version
+            self._label_cache = {}
+        if self._snapshot is None:
+            return None
+        xp, fp = self._snapshot
+        return xp, fp, (xp[0], fp[0])
 
     def tickStrings(self, values, scale, spacing):
         try:
-            times = list(self._get_time() or [])
-            props = list(self._get_prop() or [])
-            if not times or not props or len(times) != len(props):
+            current = self._current_arrays()
+            if current is None:
                 # 无效数据时显示空白（避免误导）
                 return ["" for _ in values]
 
-            # 排序数据对以确保 xp 单调递增
-            pairs = sorted(zip(times, props), key=lambda x: x[0])
-            xp = [p[0] for p in pairs]
-            fp = [p[1] for p in pairs]
-
-            out = []
-            for v in values:
-                prop_v = self._interp(v, xp, fp)
-                out.append(f"{prop_v:.3f}")
-            return out
+            xp, fp, range_key = current
+            key = (tuple(values), range_key)
+            end = (xp[-1], fp[-1])
+            cached = self._label_cache.get(key)
+            if cached is not None:
+                labels, cached_end = cached
+                # 刻度都在计算时的时间末端之前，或末端未变化时标签仍然有效
+                if cached_end == end or (len(values) and max(values) < cached_end[0]):
+                    return labels
+            # 对全部刻度做向量化插值
+            labels = [f"{prop_v:.3f}" for prop_v in np.interp(values, xp, fp)]
+            if len(self._label_cache) >= self.LABEL_CACHE_SIZE:
+                self._label_cache.clear()
+            self._label_cache[key] = (labels, end)
+            return labels
         except Exception:
             return super().tickStrings(values, scale, spacing)
 
@@ -389,6 +440,12 @@ class MainForm(QtWidgets.QWidget):
         self.save_analysis_button.setMinimumHeight(32)
         self.font_manager.add_body_component(self.save_analysis_button)
 
+        # 在线等当点估计
+        self.online_estimate_label = QtWidgets.QLabel("在线估计: --")
+        self.online_estimate_label.setFont(body_font)
+        self.online_estimate_label.setWordWrap(True)
+        self.font_manager.add_body_component(self.online_estimate_label)
+
         configLayout.addWidget(self.max_speed,       0, 0)
         configLayout.addWidget(self.max_speed_input, 0, 1)
         configLayout.addWidget(self.c_hcl_text,      1, 0)
@@ -419,6 +476,7 @@ class MainForm(QtWidgets.QWidget):
         vbtns.addLayout(btnRow1)
         vbtns.addLayout(btnRow2)
         configLayout.addLayout(vbtns, 4, 0, 1, 2)
+        configLayout.addWidget(self.online_estimate_label, 5, 0, 1, 2)
 
         # 左列加入两个组
         self.leftPanel.addWidget(motorGroup)
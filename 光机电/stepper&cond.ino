@@ -58,6 +58,66 @@ void pollEC() {
   }
 }
 
+// ---------------- 二进制遥测帧（可选） ----------------
+// 1：数据与日志以 COBS 编码、0x00 分隔的帧发送（上位机 SERIAL_TELEMETRY 需设为 "binary"）
+// 0：文本行（默认）
+#define BINARY_TELEMETRY 0
+
+// 帧格式见上位机 serial_unit/telemetry.py：
+// 类型 | 保留 | 序号 uint16 | millis uint32 | 数据 | CRC-16/Modbus（均为小端）
+#define FRAME_SAMPLE 0x01
+#define FRAME_STOP   0x02
+#define FRAME_TEXT   0x03
+#define FRAME_MAX_BODY 64
+uint16_t frameSeq = 0;
+
+uint16_t crc16Modbus(const uint8_t* p, size_t n) {
+  uint16_t crc = 0xFFFF;
+  for (size_t i = 0; i < n; i++) {
+    crc ^= p[i];
+    for (uint8_t b = 0; b < 8; b++) crc = (crc & 1) ? (crc >> 1) ^ 0xA001 : (crc >> 1);
+  }
+  return crc;
+}
+
+void sendFrame(uint8_t type, const void* body, size_t bodyLen) {
+  uint8_t raw[8 + FRAME_MAX_BODY + 2];
+  if (bodyLen > FRAME_MAX_BODY) bodyLen = FRAME_MAX_BODY;
+  uint32_t ms = millis();
+  raw[0] = type;
+  raw[1] = 0;
+  raw[2] = frameSeq & 0xFF;
+  raw[3] = frameSeq >> 8;
+  frameSeq++;
+  memcpy(raw + 4, &ms, 4);  // AVR 为小端
+  if (bodyLen) memcpy(raw + 8, body, bodyLen);
+  size_t n = 8 + bodyLen;
+  uint16_t crc = crc16Modbus(raw, n);
+  raw[n++] = crc & 0xFF;
+  raw[n++] = crc >> 8;
+
+  // COBS 编码（帧长远小于 254，无需处理 0xFF 分段），以 0x00 结尾
+  uint8_t out[sizeof(raw) + 2];
+  size_t codeIdx = 0, o = 1;
+  uint8_t code = 1;
+  for (size_t i = 0; i < n; i++) {
+    if (raw[i] == 0) { out[codeIdx] = code; codeIdx = o++; code = 1; }
+    else { out[o++] = raw[i]; code++; }
+  }
+  out[codeIdx] = code;
+  out[o++] = 0;
+  Serial.write(out, o);
+}
+
+void sendSample(long speed1, long speed2, float ec) {
+  uint8_t body[12];
+  int32_t s1 = speed1, s2 = speed2;
+  memcpy(body, &s1, 4);
+  memcpy(body + 4, &s2, 4);
+  memcpy(body + 8, &ec, 4);
+  sendFrame(FRAME_SAMPLE, body, sizeof(body));
+}
+
 // ---------------- 日志缓冲 ----------------
 String msgBuffer[16];
 volatile int msgHead = 0, msgTail = 0;
@@ -67,7 +127,11 @@ void logToBuffer(const String &msg) {
 }
 void flushLogs() {
   while (msgTail != msgHead) {
+#if BINARY_TELEMETRY
+    sendFrame(FRAME_TEXT, msgBuffer[msgTail].c_str(), msgBuffer[msgTail].length());
+#else
     Serial.println(msgBuffer[msgTail]);
+#endif
     msgTail = (msgTail + 1) % 16;
   }
 }
@@ -96,6 +160,10 @@ void stopTitration() {
   m1.setSpeed(0);
   m2.setSpeed(0);
   logToBuffer("Titration stop");
+#if BINARY_TELEMETRY
+  flushLogs();
+  sendFrame(FRAME_STOP, nullptr, 0);
+#endif
 }
 
 
@@ -186,7 +254,12 @@ void loop() {
   static unsigned long lastPrint = 0;
   if (millis() - lastPrint >= 500) {
     lastPrint = millis();
+#if BINARY_TELEMETRY
+    flushLogs();  // 保持与日志消息的先后顺序
+    sendSample((long)m1.speed(), (long)m2.speed(), lastEC);
+#else
     logToBuffer("m1=" + String(m1.speed()) + ", m2=" + String(m2.speed()) + ", c=" + String(lastEC));
+#endif
   }
 
   flushLogs();
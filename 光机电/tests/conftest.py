@@ -0,0 +1,35 @@
+"""
+测试公共配置：将 src 加入导入路径；Qt 相关测试使用无界面平台
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'src')
+sys.path.insert(0, os.path.abspath(SRC_DIR))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+
+@pytest.fixture(scope='session')
+def qapp():
+    """整个测试会话共用一个 QApplication"""
+    from PyQt5 import QtWidgets
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    yield app
+
+
+def process_events(app, ms: int = 100):
+    """处理事件循环 ms 毫秒（等待定时器/跨线程信号）"""
+    end = time.monotonic() + ms / 1000
+    while time.monotonic() < end:
+        app.processEvents()
+        time.sleep(0.002)
+
+
+@pytest.fixture
+def pump(qapp):
+    """返回处理事件循环的函数：pump(ms)"""
+    return lambda ms=100: process_events(qapp, ms)
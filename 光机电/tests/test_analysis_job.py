@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from analysis_unit.analysis_job import AnalysisJob
+from analysis_unit.sample_store import SampleStore
+
+
+def _store_with_curve(n=400):
+    rng = np.random.default_rng(0)
+    props = np.linspace(0.0, 1.0, n)
+    conds = np.where(props < 0.6, 300 - 400 * props, 200 * props - 60) + rng.normal(0, 1, n)
+    store = SampleStore()
+    store.extend(np.arange(n) * 0.1, props, conds, props * 3000, np.ones(n))
+    return store
+
+
+def _run(job):
+    results, errors = [], []
+    job.signals.finished.connect(results.append)
+    job.signals.failed.connect(lambda job_id, error: errors.append(error))
+    job.run()
+    assert not errors
+    return results[0]
+
+
+def test_job_fits_the_selected_snapshot_without_refiltering(qapp):
+    store = _store_with_curve()
+    pmin, pmax = 0.2, 0.9
+    selected = store.select('prop', pmin, pmax, ('time', 'prop', 'cond'))
+    mask = (store.prop >= pmin) & (store.prop <= pmax)
+    np.testing.assert_array_equal(selected['prop'], store.prop[mask])
+
+    job = AnalysisJob(1, selected['time'], selected['prop'], selected['cond'],
+                      (pmin, pmax), hcl_conc=0.2)
+    result = _run(job)
+    np.testing.assert_array_equal(result.x, selected['prop'])
+    np.testing.assert_array_equal(result.times, selected['time'])
+    assert result.prop_range == (pmin, pmax)
+    assert result.result['V_eq'] == pytest.approx(0.6, abs=0.01)
+
+
+def test_too_few_points_fail(qapp):
+    errors = []
+    job = AnalysisJob(2, np.arange(3.0), np.arange(3.0), np.arange(3.0), (0, 1), hcl_conc=0.2)
+    job.signals.failed.connect(lambda job_id, error: errors.append((job_id, error)))
+    job.run()
+    assert errors and errors[0][0] == 2
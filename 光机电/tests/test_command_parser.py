@@ -0,0 +1,76 @@
+import pytest
+
+from serial_unit.command_parser import DIALECT_LEGACY, DIALECT_MAIN, CommandParser
+from serial_unit.parser_bench import check_parity, load_corpus, to_legacy
+
+# 快速路径容易出错的行：格式切换、空白、符号、小数、多余字段与非数据行
+EDGE_LINES = [
+    'm1=16.00, m2=0.00, c=2384.00',
+    'm1=-5, m2=+7, c=.5',
+    'm1=16, m2=0, c=12.5 extra',
+    'm1=16,m2=0,c=1',
+    '  m1=1, m2=2, c=3.0  ',
+    'OK f',
+    'Titration start: max=3000, inc_ms=100',
+    '1,2,3.5',
+    '1, 2, 3.5',
+    '1,2,abc',
+    '1,2',
+    '1,2,3,4',
+    'c,1.5',
+    '1.0,2,3',
+    'm1=3, m2=4, c=5',
+    'titration STOP',
+    '',
+    '   ',
+    'garbage',
+]
+
+
+@pytest.fixture(scope='module')
+def corpus():
+    return load_corpus()
+
+
+def _parse_all(lines, fast_path):
+    parser = CommandParser(fast_path=fast_path)
+    return [parser.parse_arduino_data(line) for line in lines], parser
+
+
+def test_corpus_is_loaded_without_comments(corpus):
+    assert len(corpus) > 1000
+    assert not any(line.startswith('#') for line in corpus)
+
+
+@pytest.mark.parametrize('legacy', [False, True], ids=['main', 'legacy'])
+def test_fast_path_matches_full_parse_on_corpus(corpus, legacy):
+    lines = to_legacy(corpus) if legacy else corpus
+    assert check_parity(lines) == 0
+
+    full, _ = _parse_all(lines, fast_path=False)
+    fast, parser = _parse_all(lines, fast_path=True)
+    assert fast == full
+    assert parser.dialect == (DIALECT_LEGACY if legacy else DIALECT_MAIN)
+    # 快速路径确实生效：只有消息行回退到完整识别
+    data_lines = sum(1 for r in full if r and r['type'] in ('data', 'legacy_data'))
+    assert parser.fast_misses <= len(lines) - data_lines
+
+
+@pytest.mark.parametrize('first', ['m1=1, m2=2, c=3', '1,2,3'], ids=['main', 'legacy'])
+def test_fast_path_matches_full_parse_on_edge_lines(first):
+    lines = [first] + EDGE_LINES + EDGE_LINES[::-1]
+    full, _ = _parse_all(lines, fast_path=False)
+    fast, _ = _parse_all(lines, fast_path=True)
+    assert fast == full
+
+
+def test_message_lines_do_not_change_the_lock():
+    parser = CommandParser()
+    parser.parse_arduino_data('1,2,3')
+    assert parser.dialect == DIALECT_LEGACY
+    assert parser.parse_arduino_data('OK t') == {'type': 'unknown', 'raw': 'OK t'}
+    assert parser.dialect == DIALECT_LEGACY
+    parser.parse_arduino_data('m1=1, m2=2, c=3')
+    assert parser.dialect == DIALECT_MAIN
+    parser.reset()
+    assert parser.dialect is None and parser.fast_misses == 0
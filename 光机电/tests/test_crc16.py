@@ -0,0 +1,66 @@
+import os
+
+import pytest
+
+from serial_unit.crc16 import CRC16_TABLE, crc16_modbus
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir, '01')
+
+
+@pytest.fixture
+def scripts(monkeypatch):
+    """导入 01 目录下的 CRC / modbus_rtu 脚本（两边各自独立运行，不互相导入）"""
+    if not os.path.isdir(SCRIPTS_DIR):
+        pytest.skip("缺少 01 目录")
+    monkeypatch.syspath_prepend(SCRIPTS_DIR)
+    import CRC
+    import modbus_rtu
+    return CRC, modbus_rtu
+
+
+def test_table_matches_the_script_copy(scripts):
+    CRC, _ = scripts
+    assert CRC16_TABLE == CRC.CRC16_TABLE
+    assert CRC.check_shared_table() is True
+
+
+def test_table_matches_bitwise_crc(scripts):
+    CRC, _ = scripts
+    for data in (b'', b'\x00', b'123456789', bytes(range(256)), b'\x0a\x06\x00\x01\x00\x01'):
+        assert crc16_modbus(data).to_bytes(2, 'little') == CRC.crc16_bitwise(data)
+    # CRC-16/Modbus 标准校验值
+    assert crc16_modbus(b'123456789') == 0x4B37
+
+
+def test_pump_frames_match_the_documented_commands(scripts):
+    _, modbus_rtu = scripts
+    client = modbus_rtu.ModbusRTUClient(None)
+    # 注射泵说明书中的反转 / 正转指令
+    assert client.frame_write_register(0x0A, 0x0001, 0x0001) == bytes.fromhex('0A 06 00 01 00 01 18 B1')
+    assert client.frame_write_register(0x0A, 0x0000, 0x0001) == bytes.fromhex('0A 06 00 00 00 01 49 71')
+
+
+class _FakeSerial:
+    def __init__(self, reply):
+        self.reply = reply
+        self.written = []
+
+    def write(self, data):
+        self.written.append(bytes(data))
+
+    def read(self, size):
+        return self.reply[:size]
+
+
+def test_modbus_send_validates_the_reply(scripts):
+    CRC, modbus_rtu = scripts
+    frame = bytes.fromhex('0A 06 00 01 00 01 18 B1')
+    # 写单个寄存器的正常响应是原帧回显
+    client = modbus_rtu.ModbusRTUClient(_FakeSerial(frame))
+    assert client.send(frame) == frame
+    assert client.ser.written == [frame]
+
+    for reply in (b'', frame[:6], CRC.append_crc(b'\x0a\x86\x02')):
+        client = modbus_rtu.ModbusRTUClient(_FakeSerial(reply))
+        with pytest.raises(modbus_rtu.ModbusError):
+            client.send(frame)
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from analysis_unit.decimation import MinMaxDecimator, minmax_decimate
+
+
+def _reference_minmax(y, bucket_size):
+    """逐桶计算最小/最大值（参照实现）"""
+    mins, maxs = [], []
+    for start in range(0, len(y), bucket_size):
+        seg = y[start:start + bucket_size]
+        mins.append(seg.min())
+        maxs.append(seg.max())
+    return np.array(mins), np.array(maxs)
+
+
+@pytest.mark.parametrize('chunk', [1, 7, 1000, 50000])
+def test_incremental_matches_reference(chunk):
+    rng = np.random.default_rng(1)
+    y = rng.normal(size=50000).cumsum()
+    dec = MinMaxDecimator(200)
+    for end in range(chunk, len(y) + chunk, chunk):
+        dec.update(y[:end])
+
+    assert 200 < len(dec._min_idx) <= 400
+    ref_min, ref_max = _reference_minmax(y, dec.bucket_size)
+    np.testing.assert_array_equal(y[dec._min_idx], ref_min)
+    np.testing.assert_array_equal(y[dec._max_idx], ref_max)
+
+
+def test_points_keep_extremes_and_order():
+    rng = np.random.default_rng(2)
+    x = np.arange(20000, dtype=float)
+    y = rng.normal(size=20000)
+    dec = MinMaxDecimator(100)
+    xd, yd = dec.points(x, y)
+    assert np.all(np.diff(xd) >= 0)
+    assert yd.min() == y.min() and yd.max() == y.max()
+
+
+def test_short_data_is_returned_unchanged():
+    x = np.arange(50, dtype=float)
+    y = np.sin(x)
+    dec = MinMaxDecimator(100)
+    xd, yd = dec.points(x, y)
+    assert xd is x and yd is y
+    assert minmax_decimate(x, y, 100)[0] is x
+
+
+def test_stepwise_widening_rebuilds():
+    """窗口分多步放大（每步不足 2 倍）时，累计变化仍会触发重建"""
+    y = np.random.default_rng(3).random(200000)
+    dec = MinMaxDecimator(100)
+    dec.update(y)
+    coarse = dec.bucket_size
+    target = 100
+    while target < 1600:
+        target = min(1600, int(target * 1.5))
+        dec.set_target(target, y)
+    assert dec.bucket_size < coarse
+    assert len(dec._min_idx) > 1600 / MinMaxDecimator.REBUILD_RATIO
+
+
+def test_small_change_keeps_buckets():
+    y = np.random.default_rng(4).random(100000)
+    dec = MinMaxDecimator(500)
+    dec.update(y)
+    before = dec.bucket_size
+    dec.set_target(600, y)
+    assert dec.bucket_size == before
+    dec.set_target(400, y)
+    dec.update(y)
+    assert len(dec._min_idx) <= 2 * 400
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from analysis_unit.linear_fit import fit_linear, fit_from_sums
+
+sklearn = pytest.importorskip('sklearn')
+from sklearn.linear_model import LinearRegression  # noqa: E402
+from sklearn.metrics import r2_score  # noqa: E402
+
+
+def _sklearn_fit(x, y):
+    X = np.asarray(x, dtype=float).reshape(-1, 1)
+    model = LinearRegression().fit(X, y)
+    return model.coef_[0], model.intercept_, r2_score(y, model.predict(X))
+
+
+def _assert_parity(x, y):
+    fit = fit_linear(x, y)
+    slope, intercept, r2 = _sklearn_fit(x, y)
+    scale = max(1.0, float(np.max(np.abs(y))))
+    assert fit['slope'] == pytest.approx(slope, rel=1e-9, abs=1e-9 * scale)
+    assert fit['intercept'] == pytest.approx(intercept, rel=1e-9, abs=1e-9 * scale)
+    assert fit['r2'] == pytest.approx(r2, rel=1e-9, abs=1e-9)
+
+
+@pytest.mark.parametrize('seed', range(50))
+def test_random_lines_match_sklearn(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(2, 500))
+    x = rng.uniform(-5, 5, n) * 10.0 ** rng.integers(-3, 4)
+    y = rng.normal() * 100 * x + rng.normal() * 1000 + rng.normal(0, rng.uniform(0, 50), n)
+    _assert_parity(x, y)
+
+
+def test_titration_like_data_matches_sklearn():
+    rng = np.random.default_rng(0)
+    x = np.sort(rng.uniform(0.0, 1.0, 200))
+    y = -150.0 * x + 250.0 + rng.normal(0.0, 2.0, 200)
+    _assert_parity(x, y)
+
+
+def test_large_offset_is_stable():
+    # 时间戳量级的 x：中心化后不应丢失精度
+    x = 1.7e9 + np.arange(100, dtype=float)
+    y = 0.5 * (x - 1.7e9) + 3.0
+    fit = fit_linear(x, y)
+    assert fit['slope'] == pytest.approx(0.5, rel=1e-9)
+    assert fit['r2'] == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize('x, y', [
+    ([1.0, 2.0], [3.0, 5.0]),                      # 两点
+    ([2.0, 2.0, 2.0], [1.0, 2.0, 6.0]),            # x 全部相同
+    ([0.0, 1.0, 2.0, 3.0], [4.0, 4.0, 4.0, 4.0]),  # y 为常数（完全拟合）
+    ([5.0, 5.0], [7.0, 7.0]),                      # x、y 均为常数
+    ([0.0, 0.0, 1.0, 1.0], [0.0, 2.0, 0.0, 2.0]),  # 斜率为 0，r2 为 0
+])
+def test_degenerate_inputs_match_sklearn(x, y):
+    _assert_parity(np.array(x), np.array(y))
+
+
+def test_fit_from_sums_matches_fit_linear_elementwise():
+    rng = np.random.default_rng(7)
+    x = rng.uniform(0, 1, 50)
+    y = 3 * x + rng.normal(0, 0.1, 50)
+    ends = np.arange(2, 51)
+    sums = [np.cumsum(v)[ends - 1] for v in (x, y, x * x, x * y, y * y)]
+    fits = fit_from_sums(ends, *sums)
+    for i, end in enumerate(ends):
+        expected = fit_linear(x[:end], y[:end])
+        assert fits['slope'][i] == pytest.approx(expected['slope'], rel=1e-7, abs=1e-9)
+        assert fits['rss'][i] == pytest.approx(expected['rss'], rel=1e-6, abs=1e-9)
+
+
+def test_invalid_inputs_raise():
+    with pytest.raises(ValueError):
+        fit_linear([1.0], [1.0])
+    with pytest.raises(ValueError):
+        fit_linear([1.0, 2.0], [1.0])
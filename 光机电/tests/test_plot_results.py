@@ -0,0 +1,31 @@
+import numpy as np
+import pyqtgraph as pg
+
+from analysis_unit.analysis import analyze_titration_from_curve
+from analysis_unit.plot_results import TitrationPlotter
+
+
+def _curve(n=200, v_eq=0.6):
+    props = np.linspace(0.0, 1.0, n)
+    conds = np.where(props < v_eq, 300 - 400 * props, 200 * props - 60)
+    return np.arange(n) * 0.5, props, conds
+
+
+def test_items_are_pooled_and_hidden_on_clear(qapp):
+    widget = pg.PlotWidget()
+    plotter = TitrationPlotter(widget)
+    times, props, conds = _curve()
+    result = analyze_titration_from_curve(x=props, y=conds, hcl_conc=0.1, write_file=False)
+
+    plotter.plot_analysis_results(result, conds, times, props)
+    items = list(plotter.fit_items)
+    assert items and all(item.isVisible() for item in items)
+
+    # 再次分析复用同一批项目
+    plotter.plot_analysis_results(result, conds, times, props)
+    assert plotter.fit_items == items
+    assert all(item.scene() is widget.scene() for item in items)
+
+    plotter.clear_fit_items()
+    assert not any(item.isVisible() for item in items)
+    assert plotter.fit_items == items
@@ -0,0 +1,32 @@
+from main import PlotRenderScheduler
+
+
+def test_requests_are_coalesced_to_the_frame_rate(qapp, pump):
+    renders = []
+    scheduler = PlotRenderScheduler(lambda: renders.append(1), max_fps=10)
+    for _ in range(50):
+        scheduler.mark_dirty()
+    pump(50)
+    assert scheduler.render_count == len(renders) == 1
+    assert scheduler.skipped_count == 49
+
+    # 距上次重绘不足 1/max_fps 秒时延后执行
+    scheduler.mark_dirty()
+    pump(30)
+    assert len(renders) == 1
+    pump(150)
+    assert len(renders) == 2
+
+
+def test_flush_renders_pending_request_immediately(qapp, pump):
+    renders = []
+    scheduler = PlotRenderScheduler(lambda: renders.append(1), max_fps=1)
+    scheduler.flush()
+    assert renders == []
+    scheduler.mark_dirty()
+    pump(20)
+    scheduler.mark_dirty()
+    scheduler.flush()
+    assert len(renders) == 2
+    pump(50)
+    assert len(renders) == 2
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from analysis_unit.analysis import (
+    SPLIT_RSS, _SPLIT_CHI2_95, _find_optimal_split, analyze_titration_from_curve,
+)
+
+
+def _segment_rss(x, y):
+    """逐段最小二乘的残差平方和（暴力参照）"""
+    if np.ptp(x) == 0:
+        return float(np.sum((y - y.mean()) ** 2))
+    coef = np.polyfit(x, y, 1)
+    return float(np.sum((y - np.polyval(coef, x)) ** 2))
+
+
+def _brute_force(x, y, min_points=3):
+    n = len(x)
+    ks = np.arange(min_points, n - min_points + 1)
+    rss = np.array([_segment_rss(x[:k], y[:k]) + _segment_rss(x[k:], y[k:]) for k in ks])
+    return ks, rss
+
+
+def _v_shape(rng, n, v_eq, offset=0.0, noise=2.0):
+    """两段直线在 v_eq 处相交的 V 形曲线"""
+    u = np.sort(rng.uniform(0.0, 1.0, n))
+    y_eq = 300 - 400 * v_eq
+    y = np.where(u < v_eq, 300 - 400 * u, y_eq + 200 * (u - v_eq))
+    return u + offset, y + rng.normal(0.0, noise, n)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_split_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(8, 120))
+    x, y = _v_shape(rng, n, rng.uniform(0.3, 0.7), offset=rng.choice([0.0, 1e3]))
+    ks, rss = _brute_force(x, y)
+
+    result = _find_optimal_split(x, y)
+    assert result['split_idx'] == ks[np.argmin(rss)]
+    assert result['rss'] == pytest.approx(rss.min(), rel=1e-6, abs=1e-6)
+
+
+def test_confidence_interval_matches_brute_force_and_contains_the_estimate():
+    rng = np.random.default_rng(42)
+    x, y = _v_shape(rng, 200, 0.55)
+    ks, rss = _brute_force(x, y)
+    accepted = ks[len(x) * np.log(rss / rss.min()) <= _SPLIT_CHI2_95]
+
+    v_eq = []
+    for k in accepted:
+        a1, b1 = np.polyfit(x[:k], y[:k], 1)
+        a2, b2 = np.polyfit(x[k:], y[k:], 1)
+        v_eq.append((b2 - b1) / (a1 - a2))
+
+    result = _find_optimal_split(x, y)
+    assert result['V_eq_lower'] == pytest.approx(min(v_eq), abs=1e-6)
+    assert result['V_eq_upper'] == pytest.approx(max(v_eq), abs=1e-6)
+    k = result['split_idx']
+    a1, b1 = np.polyfit(x[:k], y[:k], 1)
+    a2, b2 = np.polyfit(x[k:], y[k:], 1)
+    assert result['V_eq_lower'] - 1e-9 <= (b2 - b1) / (a1 - a2) <= result['V_eq_upper'] + 1e-9
+    assert result['V_eq_upper'] - result['V_eq_lower'] < 0.05
+    assert result['V_eq_lower'] - 0.01 < 0.55 < result['V_eq_upper'] + 0.01
+
+
+def test_exact_data_and_constant_segments():
+    x = np.linspace(0.0, 1.0, 41)
+    y = np.where(x < 0.5, 1.0 - x, x)
+    ks, rss = _brute_force(x, y)
+    result = _find_optimal_split(x, y)
+    assert result['rss'] == pytest.approx(0.0, abs=1e-12)
+    assert rss[ks == result['split_idx']][0] == pytest.approx(0.0, abs=1e-12)
+
+    # 一段为常数：交点仍然有限
+    y = np.where(x < 0.5, 5.0, 10 * x)
+    result = _find_optimal_split(x, y)
+    assert result['V_eq_lower'] == pytest.approx(0.5, abs=1e-9)
+
+
+def test_analysis_uses_the_rss_split():
+    rng = np.random.default_rng(7)
+    x, y = _v_shape(rng, 150, 0.6)
+    result = analyze_titration_from_curve(
+        x=x[::-1], y=y[::-1], hcl_conc=0.1, split_method=SPLIT_RSS, write_file=False
+    )
+    assert result['V_eq'] == pytest.approx(0.6, abs=0.02)
+    assert result['V_eq_lower'] <= result['V_eq'] <= result['V_eq_upper']
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from analysis_unit.io_worker import BackgroundWriter
+from analysis_unit.raw_io import RAW_COLUMNS, RAW_DTYPE, load_raw
+from analysis_unit.run_file import RunWriter, export_run_text, is_run_file, read_run
+
+
+def _records(n, start=0.0):
+    out = np.empty(n, dtype=RAW_DTYPE)
+    t = start + np.arange(n) * 0.05
+    out['time_s'] = t
+    out['conductivity'] = 300 - t
+    out['motor1_proportion'] = np.linspace(0.0, 1.0, n)
+    out['motor1_speed'] = out['motor1_proportion'] * 3000
+    out['motor2_speed'] = 1500.0
+    return out
+
+
+def _assert_records_equal(actual, expected):
+    for name in RAW_COLUMNS:
+        np.testing.assert_array_equal(actual[name], expected[name])
+
+
+@pytest.mark.parametrize('mmap', [True, False])
+def test_rows_and_blocks_round_trip_in_order(tmp_path, mmap):
+    path = str(tmp_path / 'run.ttrun')
+    first = _records(3)
+    block = _records(50, start=1.0)
+    last = _records(2, start=5.0)
+
+    with RunWriter(path, metadata={'max_speed': 3000, 'port': 'COM3'}) as writer:
+        for row in first:
+            writer.append_row(*row)
+        writer.append_block(block)
+        writer.append_block(np.column_stack([last[name] for name in RAW_COLUMNS]))
+    assert writer.records_written == 55
+
+    assert is_run_file(path)
+    metadata, records = read_run(path, mmap=mmap)
+    assert metadata['max_speed'] == 3000 and metadata['port'] == 'COM3'
+    assert metadata['columns'] == list(RAW_COLUMNS)
+    _assert_records_equal(records, np.concatenate([first, block, last]))
+    _assert_records_equal(load_raw(path), records)
+
+
+def test_flush_writes_buffered_rows_without_further_appends(tmp_path):
+    path = str(tmp_path / 'run.ttrun')
+    writer = RunWriter(path, flush_interval=3600)
+    writer.append_row(0.0, 300.0, 0.1, 300.0, 1500.0)
+    assert len(read_run(path)[1]) == 0
+
+    writer.flush()
+    records = read_run(path, mmap=False)[1]
+    assert len(records) == 1 and records['conductivity'][0] == 300.0
+    writer.close()
+
+
+def test_background_writer_and_truncated_tail(tmp_path):
+    path = str(tmp_path / 'run.ttrun')
+    io_writer = BackgroundWriter()
+    data = _records(20)
+    writer = RunWriter(path, io_writer=io_writer)
+    writer.append_block(data)
+    writer.close()
+    io_writer.shutdown()
+
+    # 末尾不完整的记录（写入中途崩溃）在读取时忽略
+    with open(path, 'ab') as f:
+        f.write(b'\x00' * 7)
+    _assert_records_equal(read_run(path, mmap=False)[1], data)
+
+
+def test_export_text_matches_records(tmp_path):
+    path = str(tmp_path / 'run.ttrun')
+    data = _records(10)
+    with RunWriter(path) as writer:
+        writer.append_block(data)
+    txt = export_run_text(path)
+    loaded = load_raw(txt)
+    for name in RAW_COLUMNS:
+        np.testing.assert_allclose(loaded[name], data[name], atol=1e-4)
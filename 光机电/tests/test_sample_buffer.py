@@ -0,0 +1,54 @@
+import numpy as np
+
+from serial_unit.sample_buffer import SampleRingBuffer, SAMPLE_DTYPE
+
+
+def test_push_drain_preserves_order_across_wraparound():
+    ring = SampleRingBuffer(capacity=8)
+    expected = []
+    for round_ in range(5):
+        for i in range(6):
+            value = round_ * 10 + i
+            assert ring.push(float(value), value, -value, value / 2)
+            expected.append(value)
+        block = ring.drain()
+        assert block.dtype == SAMPLE_DTYPE
+        np.testing.assert_array_equal(block['motor1'], expected[-6:])
+    assert len(ring) == 0
+
+
+def test_full_buffer_drops_new_samples_and_counts_them():
+    ring = SampleRingBuffer(capacity=4)
+    results = [ring.push(float(i), i, 0, 0.0) for i in range(6)]
+    assert results == [True] * 4 + [False] * 2
+    assert ring.dropped_count == 2
+    np.testing.assert_array_equal(ring.drain()['motor1'], [0, 1, 2, 3])
+
+
+def test_markers_split_blocks_in_order():
+    ring = SampleRingBuffer(capacity=16)
+    for i in range(3):
+        ring.push(float(i), i, 0, 0.0)
+    ring.push_marker('stop')
+    for i in range(3, 5):
+        ring.push(float(i), i, 0, 0.0)
+
+    events = ring.drain_events()
+    assert len(events) == 3
+    np.testing.assert_array_equal(events[0]['motor1'], [0, 1, 2])
+    assert events[1] == 'stop'
+    np.testing.assert_array_equal(events[2]['motor1'], [3, 4])
+    assert ring.drain_events() == []
+
+
+def test_marker_at_start_and_clear():
+    ring = SampleRingBuffer(capacity=16)
+    ring.push_marker('stop')
+    ring.push(0.0, 1, 2, 3.0)
+    events = ring.drain_events()
+    assert events[0] == 'stop' and len(events[1]) == 1
+
+    ring.push(0.0, 1, 2, 3.0)
+    ring.push_marker('stop')
+    ring.clear()
+    assert ring.drain_events() == []
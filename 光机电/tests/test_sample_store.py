@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+
+from analysis_unit.sample_store import SampleStore
+
+
+def _random_columns(rng, n):
+    return [rng.normal(0.0, 100.0, n) for _ in SampleStore.COLUMNS]
+
+
+def test_extrema_match_numpy_across_appends_extends_and_growth():
+    rng = np.random.default_rng(0)
+    store = SampleStore(initial_capacity=16)
+    assert store.extrema('cond') is None
+
+    for step in range(60):
+        if step % 3 == 0:
+            store.append(*(float(c[0]) for c in _random_columns(rng, 1)))
+        else:
+            store.extend(*_random_columns(rng, int(rng.integers(0, 50))))
+        for name in SampleStore.COLUMNS:
+            values = store.column(name)
+            assert store.extrema(name) == (values.min(), values.max())
+    assert store.capacity >= len(store) > 16
+
+
+def test_extrema_ignore_nan_in_both_write_paths():
+    appended, extended = SampleStore(), SampleStore()
+    conds = [5.0, np.nan, 7.0, -1.0]
+    for c in conds:
+        appended.append(0.0, 0.0, c, 0.0, 0.0)
+    extended.extend(np.zeros(4), np.zeros(4), conds, np.zeros(4), np.zeros(4))
+    assert appended.extrema('cond') == extended.extrema('cond') == (-1.0, 7.0)
+
+    only_nan = SampleStore()
+    only_nan.extend([0.0], [0.0], [np.nan], [0.0], [0.0])
+    assert only_nan.extrema('cond') is None
+    assert only_nan.extrema('time') == (0.0, 0.0)
+
+
+def test_clear_resets_extrema_and_keeps_capacity():
+    store = SampleStore(initial_capacity=16)
+    store.extend(*[np.arange(100.0)] * 5)
+    capacity, version = store.capacity, store.version
+    store.clear()
+    assert len(store) == 0 and store.capacity == capacity and store.version > version
+    assert store.extrema('time') is None
+    store.append(-3.0, 0.0, 0.0, 0.0, 0.0)
+    assert store.extrema('time') == (-3.0, -3.0)
+
+
+def test_columns_are_read_only_views():
+    store = SampleStore()
+    store.extend(*[np.arange(10.0)] * 5)
+    view = store.time
+    with pytest.raises(ValueError):
+        view[0] = 1.0
+    with pytest.raises(ValueError):
+        store.extend([1.0], [1.0], [1.0], [1.0], [])
+
+
+def _mask_reference(values, lo, hi):
+    return (values >= lo) & (values <= hi)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_select_range_matches_mask_on_monotonic_column(seed):
+    rng = np.random.default_rng(seed)
+    store = SampleStore(initial_capacity=16)
+    # 单调不减且含重复值（电机速度占比在同一档位会重复）
+    props = np.round(np.cumsum(rng.integers(0, 3, 300)) / 300.0, 3)
+    store.extend(np.arange(300.0), props, rng.normal(size=300), props, props)
+    assert store.is_monotonic('prop')
+
+    values = store.prop
+    for lo, hi in [(0.1, 0.5), (-1.0, 2.0), (0.5, 0.1), (values[10], values[10]),
+                   (values[-1], values[-1] + 1), (-2.0, -1.0)]:
+        rows = store.select_range('prop', lo, hi)
+        assert isinstance(rows, slice)
+        np.testing.assert_array_equal(values[rows], values[_mask_reference(values, lo, hi)])
+
+
+def test_select_range_falls_back_to_mask_when_not_monotonic():
+    store = SampleStore()
+    store.extend(np.arange(5.0), [0.1, 0.3, 0.2, 0.4, 0.3], np.zeros(5), np.zeros(5), np.zeros(5))
+    assert not store.is_monotonic('prop')
+    rows = store.select_range('prop', 0.2, 0.3)
+    np.testing.assert_array_equal(rows, [False, True, True, False, True])
+
+    # 单个乱序点追加后同样退回掩码
+    store = SampleStore()
+    for t in (0.0, 1.0, 0.5, 2.0):
+        store.append(t, 0.0, 0.0, 0.0, 0.0)
+    assert not store.is_monotonic('time')
+    assert not isinstance(store.select_range('time', 0.0, 1.0), slice)
+
+
+def test_select_returns_copies_of_the_selected_rows():
+    store = SampleStore()
+    props = np.linspace(0.0, 1.0, 11)
+    store.extend(np.arange(11.0), props, props * 10, props, props)
+    selected = store.select('prop', 0.25, 0.75, ('time', 'cond'))
+    assert set(selected) == {'time', 'cond'}
+    np.testing.assert_array_equal(selected['time'], [3.0, 4.0, 5.0, 6.0, 7.0])
+
+    store.clear()
+    store.extend(np.zeros(11), props, np.zeros(11), props, props)
+    np.testing.assert_array_equal(selected['cond'], props[3:8] * 10)
@@ -0,0 +1,138 @@
+import os
+import pty
+import tty
+
+import pytest
+
+from serial_unit import SerialController, READER_MODE_NOTIFIER
+
+pytestmark = pytest.mark.skipif(os.name != 'posix', reason="需要 POSIX 伪终端")
+
+
+@pytest.fixture
+def pty_pair():
+    master, slave = pty.openpty()
+    tty.setraw(slave)
+    yield master, os.ttyname(slave)
+    for fd in (master, slave):
+        try:
+            os.close(fd)
+        except OSError:
+            pass
+
+
+def _controller(qapp, port_name, **kwargs):
+    controller = SerialController(**kwargs)
+    logs, samples = [], []
+    controller.log_message.connect(logs.append)
+    controller.data_received.connect(samples.append)
+    assert controller.connect_port(port_name)
+    return controller, logs, samples
+
+
+def test_notifier_ignores_spurious_wakeup(qapp, pump, pty_pair):
+    master, port_name = pty_pair
+    controller, logs, samples = _controller(qapp, port_name, reader_mode=READER_MODE_NOTIFIER)
+    try:
+        # 没有数据的唤醒（偶发或提前的通知）不应断开连接
+        controller._on_serial_readable()
+        assert controller.is_connected()
+
+        os.write(master, b"m1=10, m2=20, c=1.500\n")
+        pump(200)
+        assert samples and samples[-1]['conductivity'] == 1.5
+        assert controller._empty_reads == 0
+    finally:
+        controller.disconnect_port()
+
+
+def test_notifier_disconnects_after_repeated_empty_reads(qapp, pty_pair):
+    _, port_name = pty_pair
+    controller, logs, _ = _controller(qapp, port_name, reader_mode=READER_MODE_NOTIFIER)
+    for _ in range(SerialController.NOTIFIER_MAX_EMPTY_READS - 1):
+        controller._on_serial_readable()
+    assert controller.is_connected()
+    controller._on_serial_readable()
+    assert not controller.is_connected()
+    assert "串口设备已断开" in logs
+
+
+def test_notifier_disconnects_on_read_error(qapp, pump, pty_pair):
+    master, port_name = pty_pair
+    controller, logs, _ = _controller(qapp, port_name, reader_mode=READER_MODE_NOTIFIER)
+    os.close(master)
+    pump(300)
+    assert not controller.is_connected()
+    assert any(line.startswith("串口读取错误") for line in logs)
+
+
+def test_notifier_keeps_connection_on_processing_error(qapp, pump, pty_pair, monkeypatch):
+    master, port_name = pty_pair
+    controller, logs, _ = _controller(qapp, port_name, reader_mode=READER_MODE_NOTIFIER)
+    try:
+        def broken_parse(line):
+            raise ValueError("bad line")
+        monkeypatch.setattr(controller.parser, 'parse_arduino_data', broken_parse)
+        # pty 的数据异步到达从端，由通知器在可读时触发读取
+        os.write(master, b"m1=1, m2=2, c=3.0\n")
+        pump(200)
+        assert controller.is_connected()
+        assert any(line.startswith("串口数据处理错误") for line in logs)
+    finally:
+        controller.disconnect_port()
+
+
+def test_thread_mode_keeps_stop_order_and_logs(qapp, pump, pty_pair):
+    from serial_unit import READER_MODE_THREAD
+    master, port_name = pty_pair
+    controller, logs, events = _controller(qapp, port_name, reader_mode=READER_MODE_THREAD)
+    try:
+        os.write(master, b"OK t\n" + b"".join(b"m1=%d, m2=5, c=1.5\n" % i for i in range(5))
+                 + b"Titration stop\nm1=9, m2=9, c=2.0\n")
+        pump(300)
+        kinds = [event.get('type', 'sample') for event in events]
+        assert kinds == ['sample'] * 5 + ['titration_stop', 'sample']
+        assert "Arduino: OK t" in logs
+        assert "m1=9, m2=9, EC=2.000" in logs
+    finally:
+        controller.disconnect_port()
+    # 读取线程维护的电机速度在停止后交回控制器
+    assert (controller.last_motor1_speed, controller.last_motor2_speed) == (9, 9)
+
+
+def test_thread_mode_disconnects_on_read_error(qapp, pump, pty_pair):
+    from serial_unit import READER_MODE_THREAD
+    _, port_name = pty_pair
+    controller, logs, _ = _controller(qapp, port_name, reader_mode=READER_MODE_THREAD)
+    controller.serial_port.close()
+    pump(300)
+    assert controller._reader_thread is None
+    assert not controller.is_connected()
+    assert any(line.startswith("串口读取错误") for line in logs)
+
+
+@pytest.mark.parametrize('batch', [False, True])
+def test_timer_mode_batched_and_per_sample_agree(qapp, pump, pty_pair, batch):
+    from serial_unit import READER_MODE_TIMER
+    master, port_name = pty_pair
+    controller, logs, events = _controller(
+        qapp, port_name, reader_mode=READER_MODE_TIMER, batch_signals=batch)
+    blocks = []
+    controller.data_block_received.connect(blocks.append)
+    try:
+        os.write(master, b"m1=1, m2=2, c=3.0\nm1=4, m2=5, c=6.0\n")
+        pump(200)
+    finally:
+        controller.disconnect_port()
+
+    if batch:
+        assert not events
+        samples = [(int(s['motor1']), int(s['motor2']), float(s['conductivity']))
+                   for block in blocks for s in block]
+    else:
+        assert not blocks
+        samples = [(e['motor1'], e['motor2'], e['conductivity']) for e in events]
+    assert samples == [(1, 2, 3.0), (4, 5, 6.0)]
+    # 两种方式都记录原始行和数据行
+    assert "Arduino: m1=4, m2=5, c=6.0" in logs
+    assert "m1=4, m2=5, EC=6.000" in logs
@@ -0,0 +1,98 @@
+import os
+
+import pytest
+
+from serial_unit.telemetry import (
+    FRAME_DELIMITER, TelemetryDecoder, TelemetryEncoder, cobs_decode, cobs_encode,
+)
+
+
+def _samples(n):
+    return [(i % 3000, 3000 - i % 3000, 1000.0 + (i % 500) * 0.25) for i in range(n)]
+
+
+def _encode(samples):
+    encoder = TelemetryEncoder()
+    frames = [encoder.encode_sample(m1, m2, c, device_ms=i * 500)
+              for i, (m1, m2, c) in enumerate(samples)]
+    return encoder, frames
+
+
+@pytest.mark.parametrize('data', [
+    b'', b'\x00', b'\x00\x00', b'\x11\x22\x00\x33', b'\x01' * 253, b'\x01' * 254,
+    b'\x01' * 255, b'\x01' * 254 + b'\x00', bytes(range(256)) * 3,
+])
+def test_cobs_round_trip(data):
+    encoded = cobs_encode(data)
+    assert 0 not in encoded
+    assert cobs_decode(encoded) == data
+
+
+def test_cobs_random_round_trip():
+    for size in range(0, 600, 37):
+        data = os.urandom(size)
+        assert cobs_decode(cobs_encode(data)) == data
+
+
+@pytest.mark.parametrize('bad', [b'\x00', b'\x05\x01', b'\x02\x00\x05'])
+def test_cobs_rejects_invalid_data(bad):
+    with pytest.raises(ValueError):
+        cobs_decode(bad)
+
+
+@pytest.mark.parametrize('split', [1, 7, 23, None], ids=['byte', 'odd', 'mid', 'whole'])
+def test_round_trip_with_arbitrary_splits(split):
+    samples = _samples(500)
+    encoder, frames = _encode(samples)
+    stream = b''.join(frames) + encoder.encode_text('OK t') + encoder.encode_stop()
+
+    decoder = TelemetryDecoder()
+    step = split or len(stream)
+    decoded = []
+    for i in range(0, len(stream), step):
+        decoded += decoder.feed(stream[i:i + step])
+
+    assert [(d['motor1'], d['motor2'], d['conductivity']) for d in decoded[:-2]] == samples
+    assert [d['device_ms'] for d in decoded[:-2]] == [i * 500 for i in range(len(samples))]
+    assert decoded[-2] == {'type': 'text', 'raw': 'OK t', 'seq': 500, 'device_ms': 0}
+    assert decoded[-1]['type'] == 'stop'
+    stats = decoder.stats()
+    assert stats['frames_decoded'] == len(samples) + 2
+    assert stats['sequence_gaps'] == stats['crc_errors'] == stats['framing_errors'] == 0
+    assert stats['buffered_bytes'] == 0
+
+
+@pytest.mark.parametrize('batched', [False, True], ids=['per-frame', 'numpy-batch'])
+def test_lost_and_corrupt_frames_are_counted(batched):
+    _, frames = _encode(_samples(40))
+    corrupt = bytearray(frames[3])
+    corrupt[5] ^= 0x40
+    stream = frames[0] + frames[1] + frames[4] + bytes(corrupt) + frames[5] + frames[9]
+    if batched:
+        # 足够多的采样帧时走 NumPy 批量解码
+        stream += b''.join(frames[10:40])
+
+    decoder = TelemetryDecoder()
+    decoded = decoder.feed(stream)
+    expected = [0, 1, 4, 5, 9] + (list(range(10, 40)) if batched else [])
+    assert [d['seq'] for d in decoded] == expected
+    assert decoder.lost_frames == 2 + 3 and decoder.sequence_gaps == 2
+    assert decoder.crc_errors + decoder.framing_errors == 1
+
+
+def test_sequence_wraps_around():
+    encoder = TelemetryEncoder(seq=0xFFFE)
+    stream = b''.join(encoder.encode_sample(1, 2, 3.0) for _ in range(4))
+    decoder = TelemetryDecoder()
+    assert [d['seq'] for d in decoder.feed(stream)] == [0xFFFE, 0xFFFF, 0, 1]
+    assert decoder.sequence_gaps == 0
+
+
+def test_oversized_frame_is_discarded_until_the_next_delimiter():
+    encoder = TelemetryEncoder()
+    decoder = TelemetryDecoder(max_frame_length=64)
+    assert decoder.feed(b'\x01' * 100) == []
+    assert decoder.framing_errors == 1
+    assert decoder.feed(b'\x01' * 10 + FRAME_DELIMITER) == []
+    decoded = decoder.feed(encoder.encode_sample(5, 6, 7.5))
+    assert [(d['motor1'], d['motor2'], d['conductivity']) for d in decoded] == [(5, 6, 7.5)]
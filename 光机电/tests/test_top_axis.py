@@ -0,0 +1,57 @@
+import numpy as np
+
+from analysis_unit.sample_store import SampleStore
+from analysis_unit.time_index import TimeProportionIndex
+from ui import ProportionTopAxis
+
+
+def _axis_on_store(qapp, n=100):
+    store = SampleStore()
+    t = np.arange(n, dtype=float)
+    store.extend(t, t / 200.0, np.zeros(n), t * 10, np.zeros(n))
+    axis = ProportionTopAxis(orientation='top')
+    axis.set_index(TimeProportionIndex.from_store(store))
+    return axis, store
+
+
+def test_labels_interpolate_and_clamp(qapp):
+    axis, _ = _axis_on_store(qapp)
+    assert axis.tickStrings([0.0, 10.0, 55.5, 1e9], 1, 1) == ['0.000', '0.050', '0.278', '0.495']
+    assert axis.tickStrings([-5.0], 1, 1) == ['0.000']
+
+
+def test_appending_keeps_cached_labels_inside_the_range(qapp):
+    axis, store = _axis_on_store(qapp)
+    inside = [10.0, 20.0, 30.0]
+    first = axis.tickStrings(inside, 1, 1)
+    assert axis.tickStrings([50.0, 150.0], 1, 1) == ['0.250', '0.495']
+    store.append(100.0, 0.5, 0.0, 1000.0, 0.0)
+    store.append(101.0, 0.505, 0.0, 1010.0, 0.0)
+
+    assert axis.tickStrings(inside, 1, 1) is first
+    # 超出原时间范围的刻度随新数据更新
+    assert axis.tickStrings([50.0, 150.0], 1, 1) == ['0.250', '0.505']
+    assert axis.tickStrings([100.0, 1e9], 1, 1) == ['0.500', '0.505']
+
+
+def test_unordered_data_and_empty_store(qapp):
+    store = SampleStore()
+    axis = ProportionTopAxis(orientation='top')
+    axis.set_index(TimeProportionIndex.from_store(store))
+    assert axis.tickStrings([1.0, 2.0], 1, 1) == ['', '']
+
+    store.extend([0.0, 10.0], [0.0, 1.0], [0, 0], [0, 0], [0, 0])
+    assert axis.tickStrings([5.0], 1, 1) == ['0.500']
+    # 插入中间的乱序点改变中间段
+    store.append(5.0, 0.2, 0.0, 0.0, 0.0)
+    assert axis.tickStrings([5.0], 1, 1) == ['0.200']
+
+
+def test_callback_mapping(qapp):
+    times, props = [2.0, 0.0, 1.0], [0.4, 0.0, 0.2]
+    axis = ProportionTopAxis(orientation='top')
+    axis.set_mapping(lambda: times, lambda: props)
+    assert axis.tickStrings([0.5, 1.5], 1, 1) == ['0.100', '0.300']
+    times.append(3.0)
+    props.append(0.9)
+    assert axis.tickStrings([2.5], 1, 1) == ['0.650']